@@ -49,14 +49,14 @@ let s:gui07        = "#37322d"
 let g:base16_gui07 = "#37322d"
 let s:gui08        = "#d84739"
 let g:base16_gui08 = "#d84739"
-let s:gui09        = "#a4672a"
-let g:base16_gui09 = "#a4672a"
+let s:gui09        = "#a86a2c"
+let g:base16_gui09 = "#a86a2c"
 let s:gui0A        = "#7f7a42"
 let g:base16_gui0A = "#7f7a42"
-let s:gui0B        = "#4e8757"
-let g:base16_gui0B = "#4e8757"
-let s:gui0C        = "#4e8757"
-let g:base16_gui0C = "#4e8757"
+let s:gui0B        = "#508a59"
+let g:base16_gui0B = "#508a59"
+let s:gui0C        = "#508a59"
+let g:base16_gui0C = "#508a59"
 let s:gui0D        = "#4f7dd5"
 let g:base16_gui0D = "#4f7dd5"
 let s:gui0E        = "#4f7dd5"
@@ -105,19 +105,19 @@ let g:base16_cterm0F = "14"
 if has("nvim")
   let g:terminal_color_0 =  "#fbf4ee"
   let g:terminal_color_1 =  "#d84739"
-  let g:terminal_color_2 =  "#4e8757"
+  let g:terminal_color_2 =  "#508a59"
   let g:terminal_color_3 =  "#7f7a42"
   let g:terminal_color_4 =  "#4f7dd5"
   let g:terminal_color_5 =  "#4f7dd5"
-  let g:terminal_color_6 =  "#4e8757"
+  let g:terminal_color_6 =  "#508a59"
   let g:terminal_color_7 =  "#524c47"
   let g:terminal_color_8 =  "#c9c3bd"
   let g:terminal_color_9 =  "#d84739"
-  let g:terminal_color_10 = "#4e8757"
+  let g:terminal_color_10 = "#508a59"
   let g:terminal_color_11 = "#7f7a42"
   let g:terminal_color_12 = "#4f7dd5"
   let g:terminal_color_13 = "#4f7dd5"
-  let g:terminal_color_14 = "#4e8757"
+  let g:terminal_color_14 = "#508a59"
   let g:terminal_color_15 = "#37322d"
   let g:terminal_color_background = g:terminal_color_0
   let g:terminal_color_foreground = g:terminal_color_5
@@ -131,19 +131,19 @@ elseif has("terminal")
   let g:terminal_ansi_colors = [
     \ "#fbf4ee",
     \ "#d84739",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#7f7a42",
     \ "#4f7dd5",
     \ "#4f7dd5",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#524c47",
     \ "#c9c3bd",
     \ "#d84739",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#7f7a42",
     \ "#4f7dd5",
     \ "#4f7dd5",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#37322d",
     \ ]
 endif
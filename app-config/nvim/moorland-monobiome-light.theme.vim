@@ -49,14 +49,14 @@ let s:gui07        = "#373134"
 let g:base16_gui07 = "#373134"
 let s:gui08        = "#d84739"
 let g:base16_gui08 = "#d84739"
-let s:gui09        = "#a4672a"
-let g:base16_gui09 = "#a4672a"
+let s:gui09        = "#a86a2c"
+let g:base16_gui09 = "#a86a2c"
 let s:gui0A        = "#7f7a42"
 let g:base16_gui0A = "#7f7a42"
-let s:gui0B        = "#4e8757"
-let g:base16_gui0B = "#4e8757"
-let s:gui0C        = "#4e8757"
-let g:base16_gui0C = "#4e8757"
+let s:gui0B        = "#508a59"
+let g:base16_gui0B = "#508a59"
+let s:gui0C        = "#508a59"
+let g:base16_gui0C = "#508a59"
 let s:gui0D        = "#4d7ad1"
 let g:base16_gui0D = "#4d7ad1"
 let s:gui0E        = "#4d7ad1"
@@ -105,19 +105,19 @@ let g:base16_cterm0F = "14"
 if has("nvim")
   let g:terminal_color_0 =  "#fbf2f6"
   let g:terminal_color_1 =  "#d84739"
-  let g:terminal_color_2 =  "#4e8757"
+  let g:terminal_color_2 =  "#508a59"
   let g:terminal_color_3 =  "#7f7a42"
   let g:terminal_color_4 =  "#4d7ad1"
   let g:terminal_color_5 =  "#4d7ad1"
-  let g:terminal_color_6 =  "#4e8757"
+  let g:terminal_color_6 =  "#508a59"
   let g:terminal_color_7 =  "#524b4e"
   let g:terminal_color_8 =  "#cac1c5"
   let g:terminal_color_9 =  "#d84739"
-  let g:terminal_color_10 = "#4e8757"
+  let g:terminal_color_10 = "#508a59"
   let g:terminal_color_11 = "#7f7a42"
   let g:terminal_color_12 = "#4d7ad1"
   let g:terminal_color_13 = "#4d7ad1"
-  let g:terminal_color_14 = "#4e8757"
+  let g:terminal_color_14 = "#508a59"
   let g:terminal_color_15 = "#373134"
   let g:terminal_color_background = g:terminal_color_0
   let g:terminal_color_foreground = g:terminal_color_5
@@ -131,19 +131,19 @@ elseif has("terminal")
   let g:terminal_ansi_colors = [
     \ "#fbf2f6",
     \ "#d84739",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#7f7a42",
     \ "#4d7ad1",
     \ "#4d7ad1",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#524b4e",
     \ "#cac1c5",
     \ "#d84739",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#7f7a42",
     \ "#4d7ad1",
     \ "#4d7ad1",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#373134",
     \ ]
 endif
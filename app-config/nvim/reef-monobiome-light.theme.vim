@@ -49,14 +49,14 @@ let s:gui07        = "#2d3535"
 let g:base16_gui07 = "#2d3535"
 let s:gui08        = "#db4b3d"
 let g:base16_gui08 = "#db4b3d"
-let s:gui09        = "#a4672a"
-let g:base16_gui09 = "#a4672a"
+let s:gui09        = "#a86a2c"
+let g:base16_gui09 = "#a86a2c"
 let s:gui0A        = "#7f7a42"
 let g:base16_gui0A = "#7f7a42"
-let s:gui0B        = "#4e8757"
-let g:base16_gui0B = "#4e8757"
-let s:gui0C        = "#4e8757"
-let g:base16_gui0C = "#4e8757"
+let s:gui0B        = "#508a59"
+let g:base16_gui0B = "#508a59"
+let s:gui0C        = "#508a59"
+let g:base16_gui0C = "#508a59"
 let s:gui0D        = "#4d7ad1"
 let g:base16_gui0D = "#4d7ad1"
 let s:gui0E        = "#4d7ad1"
@@ -105,19 +105,19 @@ let g:base16_cterm0F = "14"
 if has("nvim")
   let g:terminal_color_0 =  "#edf7f9"
   let g:terminal_color_1 =  "#db4b3d"
-  let g:terminal_color_2 =  "#4e8757"
+  let g:terminal_color_2 =  "#508a59"
   let g:terminal_color_3 =  "#7f7a42"
   let g:terminal_color_4 =  "#4d7ad1"
   let g:terminal_color_5 =  "#4d7ad1"
-  let g:terminal_color_6 =  "#4e8757"
+  let g:terminal_color_6 =  "#508a59"
   let g:terminal_color_7 =  "#464f50"
   let g:terminal_color_8 =  "#bcc6c7"
   let g:terminal_color_9 =  "#db4b3d"
-  let g:terminal_color_10 = "#4e8757"
+  let g:terminal_color_10 = "#508a59"
   let g:terminal_color_11 = "#7f7a42"
   let g:terminal_color_12 = "#4d7ad1"
   let g:terminal_color_13 = "#4d7ad1"
-  let g:terminal_color_14 = "#4e8757"
+  let g:terminal_color_14 = "#508a59"
   let g:terminal_color_15 = "#2d3535"
   let g:terminal_color_background = g:terminal_color_0
   let g:terminal_color_foreground = g:terminal_color_5
@@ -131,19 +131,19 @@ elseif has("terminal")
   let g:terminal_ansi_colors = [
     \ "#edf7f9",
     \ "#db4b3d",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#7f7a42",
     \ "#4d7ad1",
     \ "#4d7ad1",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#464f50",
     \ "#bcc6c7",
     \ "#db4b3d",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#7f7a42",
     \ "#4d7ad1",
     \ "#4d7ad1",
-    \ "#4e8757",
+    \ "#508a59",
     \ "#2d3535",
     \ ]
 endif
@@ -49,8 +49,8 @@ let s:gui07        = "#34332d"
 let g:base16_gui07 = "#34332d"
 let s:gui08        = "#db4b3d"
 let g:base16_gui08 = "#db4b3d"
-let s:gui09        = "#a4672a"
-let g:base16_gui09 = "#a4672a"
+let s:gui09        = "#a86a2c"
+let g:base16_gui09 = "#a86a2c"
 let s:gui0A        = "#7f7a42"
 let g:base16_gui0A = "#7f7a42"
 let s:gui0B        = "#4e8757"
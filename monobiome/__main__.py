@@ -1,4 +1,7 @@
+from pathlib import Path
+
 from monobiome.cli import create_parser, configure_logging
+from monobiome.profiling import profiled
 
 
 def main() -> None:
@@ -9,10 +12,14 @@ def main() -> None:
     if hasattr(args, "log_level") and args.log_level is not None:
         configure_logging(args.log_level)
 
-    if "func" in args:
-        args.func(args, parser)
-    else:
+    if "func" not in args:
         parser.print_help()
+    elif args.profile or args.profile_output:
+        dump_file = Path(args.profile_output) if args.profile_output else None
+        with profiled(dump_file):
+            args.func(args, parser)
+    else:
+        args.func(args, parser)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,451 @@
+import io
+import math
+import asyncio
+import multiprocessing as mp
+from typing import Any
+from pathlib import Path
+from collections import deque
+from collections.abc import Iterator, Generator
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.util import Finalize
+
+import numpy as np
+import kaleido
+import imageio_ffmpeg
+import plotly.graph_objects as go
+from PIL import Image
+from plotly.basedatatypes import BaseTraceType
+
+from monobiome.util import (
+    hex_from_rgb8,
+    oklab_from_oklch,
+    srgb_from_linear,
+    linear_srgb_from_oklab,
+)
+from monobiome.gamut import gamut_mesh, grid_faces, GAMUT_RESOLUTION
+from monobiome.scheme import solve_accent_levels
+from monobiome.palette import compute_oklch_array, compute_swatch_table
+from monobiome.constants import (
+    h_map,
+    monotone_h_map,
+    lightness_index,
+)
+from monobiome.profiling import stage
+
+# frame size, count, and duration (ms) of the README animations: one full
+# orbit of the camera
+FRAME_SIZE = (800, 600)
+N_FRAMES = 120
+FRAME_DURATION = 30
+
+# polar grid steps of contrast spheres
+SPHERE_RESOLUTION = 48
+
+# per-frame palettes keep GIF frames streamable: nothing waits on the full
+# sequence, as a single global palette would
+GIF_FILTER = (
+    "split[a][b];"
+    "[a]palettegen=stats_mode=single:reserve_transparent=0[p];"
+    "[b][p]paletteuse=new=1"
+)
+
+# shared with worker processes; see `render_animations()`
+_render_state: dict[str, Any] = {}
+
+
+def sphere_mesh(
+    center: np.ndarray,
+    radius: float,
+    resolution: int = SPHERE_RESOLUTION,
+) -> tuple[np.ndarray, np.ndarray, list[str], np.ndarray]:
+    """
+    Sphere of `radius` around an OKLab `center`, clipped to the sRGB gamut.
+
+    Returns: `(N, 3)` plotted vertices (see `gamut.gamut_mesh()`), `(F, 3)`
+        faces lying wholly in gamut, `N` vertex colors, and `(E, 2)` edges
+        crossing the gamut boundary
+    """
+
+    thetas = np.linspace(0, np.pi, resolution)
+    phis = np.linspace(0, 2 * np.pi, 2 * resolution, endpoint=False)
+    TT, PP = np.meshgrid(thetas, phis)
+
+    lab = center + radius * np.stack(
+        [np.cos(TT), np.sin(TT) * np.cos(PP), np.sin(TT) * np.sin(PP)],
+        axis=-1,
+    ).reshape(-1, 3)
+
+    rgb = linear_srgb_from_oklab(lab)
+    inside = np.all((rgb >= -1e-6) & (rgb <= 1 + 1e-6), axis=-1)
+    rgb8 = np.round(srgb_from_linear(np.clip(rgb, 0, 1)) * 255)
+    colors = [hex_from_rgb8(c) for c in rgb8.astype(np.uint8)]
+
+    faces = grid_faces(len(phis), len(thetas), wrap=True)
+    edges = faces[:, [[0, 1], [1, 2], [0, 2]]].reshape(-1, 2)
+    crossing = edges[inside[edges[:, 0]] != inside[edges[:, 1]]]
+
+    return (
+        lab[:, [1, 2, 0]],
+        faces[inside[faces].all(axis=-1)],
+        colors,
+        np.unique(np.sort(crossing, axis=-1), axis=0),
+    )
+
+def _mesh_trace(
+    vertices: np.ndarray,
+    faces: np.ndarray,
+    colors: list[str],
+    opacity: float,
+) -> go.Mesh3d:
+    return go.Mesh3d(
+        x=vertices[:, 0],
+        y=vertices[:, 1],
+        z=vertices[:, 2],
+        i=faces[:, 0],
+        j=faces[:, 1],
+        k=faces[:, 2],
+        vertexcolor=colors,
+        opacity=opacity,
+        flatshading=True,
+        lighting={"vertexnormalsepsilon": 0, "facenormalsepsilon": 0},
+        hoverinfo="skip",
+    )
+
+def _point_trace(
+    lch: np.ndarray,
+    colors: list[str],
+    size: float,
+    mode: str = "markers",
+) -> go.Scatter3d:
+    _l, _a, _b = oklab_from_oklch(lch).T
+
+    return go.Scatter3d(
+        x=_a,
+        y=_b,
+        z=_l,
+        mode=mode,
+        marker={
+            "size": size,
+            "color": colors,
+            "line": {"width": 1, "color": "black"},
+        },
+        line={"width": 2, "color": "black"},
+        showlegend=False,
+        hoverinfo="skip",
+    )
+
+def scene_figure(
+    traces: list[BaseTraceType],
+    size: tuple[int, int] = FRAME_SIZE,
+    mesh_resolution: int = GAMUT_RESOLUTION,
+) -> go.Figure:
+    """
+    Figure of `traces` inside the translucent sRGB gamut surface.
+
+    Axes are fixed to the gamut's extent at equal scale, so they hold still
+    as the camera moves between frames.
+    """
+
+    vertices, faces, vertex_colors, _ = gamut_mesh(mesh_resolution)
+    colors = [hex_from_rgb8(c) for c in vertex_colors]
+    lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+    span = hi - lo
+
+    axis = {"backgroundcolor": "rgb(230, 230, 230)", "showbackground": True}
+    scene = {
+        f"{name}axis": {
+            "title": title,
+            "range": [lo[i].item(), hi[i].item()],
+            "autorange": False,
+            **axis,
+        }
+        for i, (name, title) in enumerate(zip("xyz", "abl", strict=True))
+    }
+
+    fig = go.Figure([_mesh_trace(vertices, faces, colors, 0.15), *traces])
+    fig.update_layout(
+        width=size[0],
+        height=size[1],
+        margin={"l": 0, "r": 0, "t": 0, "b": 0},
+        scene={
+            **scene,
+            "aspectmode": "manual",
+            "aspectratio": dict(
+                zip("xyz", (span / span.max()).tolist(), strict=True)
+            ),
+        },
+    )
+
+    return fig
+
+def trajectory_figure(
+    resolution: float = 1,
+    size: tuple[int, int] = FRAME_SIZE,
+) -> go.Figure:
+    """
+    Every palette curve, as a trajectory of its swatches through the gamut.
+    """
+
+    oklch_array = compute_oklch_array(resolution)
+    swatch_table = compute_swatch_table("hex", resolution)
+
+    traces = [
+        _point_trace(oklch_array[hi], swatch_table[hi], 3, "lines+markers")
+        for hi in range(len(h_map))
+    ]
+
+    return scene_figure(traces, size)
+
+def sphere_figure(
+    biome: str,
+    l_base: float,
+    distance: float,
+    resolution: float = 1,
+    size: tuple[int, int] = FRAME_SIZE,
+) -> go.Figure:
+    """
+    The OKLCH contrast sphere of a `distance` around the `biome` swatch at
+    `l_base`, with the accent swatches a scheme selects on its surface (see
+    `solve_accent_levels()`).
+
+    Raises: `ValueError` if the biome can't meet the distance at `l_base`
+    """
+
+    accent_levels = solve_accent_levels(
+        biome, [l_base], distance, "oklch", resolution
+    )[l_base]
+
+    oklch_array = compute_oklch_array(resolution)
+    swatch_table = compute_swatch_table("hex", resolution)
+
+    mi = list(monotone_h_map).index(biome)
+    li = lightness_index(l_base, resolution)
+    center = oklch_array[mi, li]
+
+    accent_idx = [
+        (len(monotone_h_map) + ai, lightness_index(accent_L, resolution))
+        for ai, accent_L in enumerate(accent_levels.values())
+    ]
+    accent_lch = np.array([oklch_array[idx] for idx in accent_idx])
+    accent_colors = [swatch_table[hi][li] for hi, li in accent_idx]
+
+    vertices, faces, colors, crossing = sphere_mesh(
+        oklab_from_oklch(center), distance
+    )
+    # boundary segments, separated by gaps
+    boundary = np.concatenate(
+        [vertices[crossing], np.full((len(crossing), 1, 3), np.nan)],
+        axis=1,
+    ).reshape(-1, 3)
+
+    traces = [
+        _mesh_trace(vertices, faces, colors, 0.9),
+        go.Scatter3d(
+            x=boundary[:, 0],
+            y=boundary[:, 1],
+            z=boundary[:, 2],
+            mode="lines",
+            line={"width": 3, "color": "black"},
+            showlegend=False,
+            hoverinfo="skip",
+        ),
+        _point_trace(center[None], [swatch_table[mi][li]], 8),
+        _point_trace(accent_lch, accent_colors, 6),
+    ]
+
+    return scene_figure(traces, size)
+
+def orbit_camera(
+    t: float,
+    elevation: float = 20,
+    distance: float = 2.0,
+) -> dict[str, Any]:
+    """
+    Scene camera at fraction `t` of a full turn around the lightness axis,
+    `elevation` degrees above the `(a, b)` plane.
+    """
+
+    azimuth = 2 * math.pi * t
+    e = math.radians(elevation)
+
+    return {
+        "projection": {"type": "perspective"},
+        "center": {"x": 0, "y": 0, "z": 0},
+        "up": {"x": 0, "y": 0, "z": 1},
+        "eye": {
+            "x": distance * math.cos(e) * math.cos(azimuth),
+            "y": distance * math.cos(e) * math.sin(azimuth),
+            "z": distance * math.sin(e),
+        },
+    }
+
+def _set_render_state(state: dict[str, Any]) -> None:
+    _render_state.clear()
+    _render_state.update(state)
+
+def _open_browser() -> None:
+    # a browser resident for the life of the process, serving all of its
+    # frames; closed as a pool worker exits (which skips `atexit`)
+    loop = asyncio.new_event_loop()
+    browser = kaleido.Kaleido(n=1)
+    loop.run_until_complete(browser.open())
+
+    _render_state["loop"] = loop
+    _render_state["browser"] = browser
+    if mp.parent_process() is not None:
+        Finalize(None, _close_browser, exitpriority=10)
+
+def _close_browser() -> None:
+    loop = _render_state.pop("loop", None)
+    browser = _render_state.pop("browser", None)
+    if browser is not None:
+        loop.run_until_complete(browser.close())
+        loop.close()
+
+def render_frame(task: tuple[int, int]) -> np.ndarray:
+    """
+    Render frame `fi` of animation `ai` from the render state.
+
+    Returns: `(height, width, 3)` RGB array
+    """
+
+    if "browser" not in _render_state:
+        _open_browser()
+
+    ai, fi = task
+    fig = _render_state["figures"][ai]
+    width, height = _render_state["size"]
+
+    layout = {
+        **fig["layout"],
+        "scene": {
+            **fig["layout"]["scene"],
+            "camera": orbit_camera(fi / _render_state["n_frames"]),
+        },
+    }
+    png = _render_state["loop"].run_until_complete(
+        _render_state["browser"].calc_fig(
+            {"data": fig["data"], "layout": layout},
+            opts={"format": "png", "width": width, "height": height},
+        )
+    )
+
+    return np.asarray(Image.open(io.BytesIO(png)).convert("RGB"))
+
+def _ordered_map(
+    executor: ProcessPoolExecutor,
+    tasks: list[tuple[int, int]],
+    window: int,
+) -> Iterator[np.ndarray]:
+    """
+    Render `tasks` across `executor`, yielding frames in task order with at
+    most `window` frames in flight (or finished, awaiting their turn).
+    """
+
+    pending = deque()
+    for task in tasks:
+        pending.append(executor.submit(render_frame, task))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+def open_writer(
+    path: Path,
+    size: tuple[int, int],
+    duration: float,
+) -> Generator[None, np.ndarray, None]:
+    """
+    Streaming ffmpeg writer for `path`, as a GIF or, for other suffixes, a
+    video in the format ffmpeg infers (e.g., MP4). Send it RGB frames.
+    """
+
+    params: dict[str, Any] = {}
+    if path.suffix == ".gif":
+        params = {
+            "codec": "gif",
+            "pix_fmt_out": "pal8",
+            "output_params": ["-filter_complex", GIF_FILTER, "-loop", "0"],
+        }
+
+    writer = imageio_ffmpeg.write_frames(
+        str(path),
+        size,
+        fps=1000 / duration,
+        macro_block_size=1,
+        ffmpeg_log_level="error",
+        **params,
+    )
+    writer.send(None)
+
+    return writer
+
+def render_animations(
+    animations: list[tuple[go.Figure, Path]],
+    n_frames: int = N_FRAMES,
+    duration: float = FRAME_DURATION,
+    jobs: int = 1,
+) -> None:
+    """
+    Render each figure in `animations` as a camera orbit of `n_frames`
+    frames, `duration` ms apart, written to its path (see `open_writer()`).
+    Frames are the figures' size.
+
+    Figures are built once (gamut mesh included); each frame only moves the
+    camera. With `jobs > 1`, frames are rendered across a process pool, each
+    worker holding every figure and a resident browser. Frames stream into
+    the writers in order as they finish, with at most a couple per worker
+    in flight, so memory stays flat however many frames are rendered. Work
+    spans animations, so the pool stays busy through a set of them.
+    """
+
+    figures = [fig.to_dict() for fig, _ in animations]
+    sizes = {(fig.layout.width, fig.layout.height) for fig, _ in animations}
+    if len(sizes) != 1:
+        raise ValueError("Animated figures must share a frame size")
+    size = sizes.pop()
+
+    state = {"figures": figures, "size": size, "n_frames": n_frames}
+    tasks = [
+        (ai, fi) for ai in range(len(animations)) for fi in range(n_frames)
+    ]
+
+    mp_context = None
+    if "fork" in mp.get_all_start_methods():
+        mp_context = mp.get_context("fork")
+
+    executor = None
+    if jobs > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=mp_context,
+            initializer=_set_render_state,
+            initargs=(state,),
+        )
+        frames = _ordered_map(executor, tasks, 2 * jobs)
+    else:
+        _set_render_state(state)
+        frames = map(render_frame, tasks)
+
+    writer = None
+    try:
+        with stage("frame render"):
+            for (ai, fi), frame in zip(tasks, frames, strict=True):
+                path = animations[ai][1]
+                if fi == 0:
+                    writer = open_writer(path, size, duration)
+
+                writer.send(frame)
+
+                if fi == n_frames - 1:
+                    writer.close()
+                    writer = None
+                    print(f"Wrote {n_frames} frames to {path}")
+    finally:
+        if writer is not None:
+            writer.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        else:
+            _close_browser()
@@ -0,0 +1,496 @@
+import io
+import json
+import shutil
+import hashlib
+import tomllib
+import zipfile
+import itertools
+import multiprocessing as mp
+from typing import Any
+from pathlib import Path
+from contextlib import suppress
+from concurrent.futures import ProcessPoolExecutor
+
+from monobiome import constants
+from monobiome.cache import cache_key
+from monobiome.scheme import solve, compute_swatch_features
+from monobiome.palette import compute_swatch_table
+from monobiome.template import (
+    fill_template,
+    load_template,
+    compile_template,
+)
+from monobiome.constants import lightness_grid_index
+
+# file suffix of Firefox manifest templates; see `firefox_xpi()`
+FIREFOX_MANIFEST_SUFFIX = "-manifest.json"
+
+# build manifest file, kept in the output directory; see `load_manifest()`
+MANIFEST_NAME = ".build-manifest.json"
+
+
+def scheme_matrix(
+    biomes: list[str],
+    modes: list[str],
+    mode_l_bases: dict[str, list[float]],
+    distances: list[float],
+) -> list[dict[str, Any]]:
+    """
+    Expand a theme matrix into the scheme settings for each variant.
+
+    Lightness bases are given per mode (e.g., `{"dark": [22], "light": [92]}`)
+    since a useful base for one mode rarely suits the other. Each variant gets
+    a file `stem`: `<biome>-monobiome-<mode>`, suffixed with `-l<L>` and/or
+    `-d<distance>` only when the matrix varies along those axes.
+    """
+
+    variants = []
+    for biome, mode in itertools.product(biomes, modes):
+        l_bases = mode_l_bases[mode]
+
+        for l_base, distance in itertools.product(l_bases, distances):
+            stem = f"{biome}-monobiome-{mode}"
+            if len(l_bases) > 1:
+                stem += f"-l{l_base}"
+            if len(distances) > 1:
+                stem += f"-d{distance}"
+
+            variants.append({
+                "stem": stem,
+                "biome": biome,
+                "mode": mode,
+                "l_base": l_base,
+                "distance": distance,
+            })
+
+    return variants
+
+def fill_scheme(
+    scheme_text: str,
+    palette_dict: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Resolve a scheme's palette references into a concrete scheme dict.
+    """
+
+    return tomllib.loads(
+        fill_template(compile_template(scheme_text), palette_dict)
+    )
+
+def variant_scheme(
+    variant: dict[str, Any],
+    scheme_args: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Solve the scheme for a matrix variant (see `scheme_matrix()`) as a
+    concrete scheme dict, with colors from the hex palette.
+    """
+
+    return solve(
+        variant["mode"],
+        variant["biome"],
+        scheme_args["metric"],
+        variant["distance"],
+        variant["l_base"],
+        scheme_args["l_step"],
+        scheme_args["fg_gap"],
+        scheme_args["grey_gap"],
+        scheme_args["term_fg_gap"],
+        resolution=scheme_args["resolution"],
+    ).colors("hex")
+
+def variant_output(output_dir: Path, subpath: Path, stem: str) -> Path:
+    """
+    Output file for the template at `subpath` filled with variant `stem`,
+    i.e., `<output_dir>/<app>/<stem>.<file>`.
+    """
+
+    return Path(output_dir, subpath.parent, f"{stem}.{subpath.name}")
+
+def firefox_xpi(manifest: Path) -> Path | None:
+    """
+    XPI theme archive for a filled Firefox manifest.
+
+    Manifest templates come in `dark`, `light` and `auto` kinds, each of
+    which is laid out against the *dark* scheme's colors. A filled manifest
+    `<biome>-monobiome-dark<variant>.<kind>-manifest.json` is packaged as
+    `<biome>-monobiome-<kind><variant>.xpi` (just
+    `<biome>-monobiome<variant>.xpi` for `auto`). Manifests filled from light
+    schemes aren't packaged, giving `None`.
+    """
+
+    stem, kind = manifest.name.removesuffix(
+        FIREFOX_MANIFEST_SUFFIX
+    ).rsplit(".", 1)
+    biome, mb, mode_variant = stem.split("-", 2)
+    mode, _, variant = mode_variant.partition("-")
+
+    if mode != "dark":
+        return None
+
+    kind_tag = "" if kind == "auto" else f"-{kind}"
+    variant_tag = f"-{variant}" if variant else ""
+
+    return manifest.with_name(f"{biome}-{mb}{kind_tag}{variant_tag}.xpi")
+
+def xpi_bytes(manifest_text: str) -> bytes:
+    """
+    Package a filled Firefox manifest as an XPI archive.
+    """
+
+    # pin entry metadata so unchanged manifests give identical bytes
+    info = zipfile.ZipInfo("manifest.json")
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o644 << 16
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr(info, manifest_text)
+
+    return buffer.getvalue()
+
+def output_target(output_dir: Path, subpath: Path, stem: str) -> Path | None:
+    """
+    File written for the template at `subpath` filled with variant `stem`:
+    the filled template itself (see `variant_output()`), or for Firefox
+    manifests, its XPI (see `firefox_xpi()`).
+    """
+
+    output = variant_output(output_dir, subpath, stem)
+    if (
+        subpath.parent == Path("firefox")
+        and subpath.name.endswith(FIREFOX_MANIFEST_SUFFIX)
+    ):
+        return firefox_xpi(output)
+
+    return output
+
+def output_bytes(target: Path, filled: str) -> bytes:
+    """
+    Content of output `target` (see `output_target()`) for a filled template.
+    """
+
+    if target.suffix == ".xpi":
+        return xpi_bytes(filled)
+
+    return filled.encode()
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    Write `data` to `path`, unless the file already holds exactly those bytes
+    (leaving it, and its mtime, untouched).
+
+    Returns: whether the file was written
+    """
+
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    path.write_bytes(data)
+
+    return True
+
+def build_digest(scheme_args: dict[str, Any]) -> str:
+    """
+    Digest of the inputs shared by every output of a build: the parameters
+    file, palette source and versions (see `cache_key()`), which determine
+    the palette, and the scheme settings.
+    """
+
+    h = hashlib.sha256()
+    h.update(cache_key(constants.parameters_bytes).encode())
+    h.update(json.dumps(scheme_args, sort_keys=True).encode())
+
+    return h.hexdigest()
+
+def output_digest(
+    build_key: str,
+    variant: dict[str, Any],
+    template_digest: str,
+) -> str:
+    """
+    Digest of all inputs to a single output: the shared build inputs (see
+    `build_digest()`), the variant's scheme settings, and the template.
+    """
+
+    h = hashlib.sha256()
+    h.update(build_key.encode())
+    h.update(json.dumps(variant, sort_keys=True).encode())
+    h.update(template_digest.encode())
+
+    return h.hexdigest()
+
+def load_manifest(output_dir: Path) -> dict[str, dict[str, str]]:
+    """
+    Read the build manifest of `output_dir`, mapping output paths (relative
+    to `output_dir`) to the digests of their inputs and content:
+
+    {
+        "kitty/alpine-monobiome-dark.active.theme": {
+            "inputs": "9f2c...",
+            "content": "41d8...",
+        },
+        ...
+    }
+
+    A missing or unreadable manifest reads as empty, i.e., a full build.
+    """
+
+    try:
+        return json.loads(Path(output_dir, MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(
+    output_dir: Path,
+    manifest: dict[str, dict[str, str]],
+) -> None:
+    manifest_text = json.dumps(manifest, indent=4, sort_keys=True)
+    write_if_changed(Path(output_dir, MANIFEST_NAME), manifest_text.encode())
+
+def prune_outputs(
+    output_dir: Path,
+    manifest: dict[str, dict[str, str]],
+    produced: set[str],
+) -> list[Path]:
+    """
+    Drop manifest entries for outputs not in `produced` (paths relative to
+    `output_dir`) and delete their files, e.g., those of templates, biomes or
+    modes no longer built. Files the manifest doesn't record are left alone.
+
+    Returns: list of deleted files
+    """
+
+    removed = []
+    for name in sorted(manifest.keys() - produced):
+        del manifest[name]
+
+        path = Path(output_dir, name)
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            continue
+        removed.append(path)
+
+        # clear out app directories left empty
+        with suppress(OSError):
+            path.parent.rmdir()
+
+    return removed
+
+# render state shared by worker processes; set once per process (inherited
+# under fork, sent once per worker otherwise) rather than sent with each task
+_render_state: dict[str, Any] = {}
+
+
+def _set_render_state(state: dict[str, Any]) -> None:
+    _render_state.update(state)
+
+def render_variants(
+    tasks: list[dict[str, Any]],
+) -> list[tuple[Path, str, str, bool]]:
+    """
+    Generate the scheme for each task's variant and render its pending
+    outputs, using the shared render state. Tasks are given as
+
+    {
+        "variant": { "stem": ..., "biome": ..., ... },
+        "outputs": [ (template subpath, output target, input digest), ... ],
+    }
+
+    Returns: list of `(target, input digest, content digest, written)` for
+        every rendered output
+    """
+
+    templates = _render_state["templates"]
+    scheme_args = _render_state["scheme_args"]
+
+    records = []
+    for task in tasks:
+        concrete_scheme = variant_scheme(task["variant"], scheme_args)
+
+        for subpath, target, inputs in task["outputs"]:
+            data = output_bytes(
+                target,
+                fill_template(templates[subpath], concrete_scheme),
+            )
+            written = write_if_changed(target, data)
+            records.append((target, inputs, content_digest(data), written))
+
+    return records
+
+def build(
+    template_dir: Path,
+    output_dir: Path,
+    biomes: list[str],
+    modes: list[str],
+    mode_l_bases: dict[str, list[float]],
+    distances: list[float],
+    metric: str = "oklch",
+    l_step: int = 5,
+    fg_gap: int = 50,
+    grey_gap: int = 30,
+    term_fg_gap: int = 65,
+    resolution: float = 1,
+    jobs: int = 1,
+    prune: bool = False,
+) -> list[Path]:
+    """
+    Render every template under `template_dir` for every scheme in a theme
+    matrix, writing to the mirrored tree under `output_dir`.
+
+    Templates at `<app>/<file>` are written to `<app>/<stem>.<file>`, with
+    Firefox manifests packaged as XPIs (see `output_target()`).
+
+    Builds are incremental. A manifest in `output_dir` records the digests
+    of each output's inputs (parameters, scheme settings, and template) and
+    content. Outputs whose inputs are unchanged, and whose files still match
+    the recorded content, are skipped; variants with nothing to render don't
+    have their schemes solved (nor is the palette computed if nothing is).
+    Rendered outputs are only written if their bytes differ from the file on
+    disk, so file mtimes only move when content does. With `prune`, recorded
+    outputs this matrix and template tree no longer produce are deleted (see
+    `prune_outputs()`); use it when building the full matrix for a tree.
+
+    The palette swatch table, swatch features, and compiled templates are
+    loaded once and shared across the full matrix. With `jobs > 1`, variants
+    are split into chunks rendered across a process pool. Shared state is
+    prepared in this process first: under the `fork` start method workers
+    inherit it (including the warmed palette and swatch feature caches)
+    without any pickling, and otherwise it's sent once per worker at startup.
+
+    Returns: list of written files
+
+    Raises: `ValueError` if a lightness base is not on the lightness grid, or
+        a scheme can't meet its distance constraints
+    """
+
+    # check bases up front, before anything is pruned or written
+    for l_bases in mode_l_bases.values():
+        for l_base in l_bases:
+            lightness_grid_index(l_base, resolution)
+
+    variants = scheme_matrix(biomes, modes, mode_l_bases, distances)
+    scheme_args = {
+        "metric": metric,
+        "l_step": l_step,
+        "fg_gap": fg_gap,
+        "grey_gap": grey_gap,
+        "term_fg_gap": term_fg_gap,
+        "resolution": resolution,
+    }
+    sources = {
+        path.relative_to(template_dir): path
+        for path in sorted(template_dir.rglob("*"))
+        if path.is_file()
+    }
+    template_digests = {
+        subpath: content_digest(path.read_bytes())
+        for subpath, path in sources.items()
+    }
+
+    build_key = build_digest(scheme_args)
+    manifest = load_manifest(output_dir)
+
+    tasks = []
+    produced = set()
+    for variant in variants:
+        pending = []
+        for subpath in sources:
+            target = output_target(output_dir, subpath, variant["stem"])
+            if target is None:
+                continue
+
+            name = target.relative_to(output_dir).as_posix()
+            produced.add(name)
+
+            inputs = output_digest(
+                build_key, variant, template_digests[subpath]
+            )
+            entry = manifest.get(name)
+            if (
+                entry is not None
+                and entry["inputs"] == inputs
+                and target.is_file()
+                and content_digest(target.read_bytes()) == entry["content"]
+            ):
+                continue
+
+            pending.append((subpath, target, inputs))
+
+        if pending:
+            tasks.append({"variant": variant, "outputs": pending})
+
+    if prune:
+        removed = prune_outputs(output_dir, manifest, produced)
+        if removed:
+            print(f"Removed {len(removed)} stale files from {output_dir}")
+
+    if not tasks:
+        if prune:
+            save_manifest(output_dir, manifest)
+        return []
+
+    used_subpaths = {
+        subpath for task in tasks for subpath, _, _ in task["outputs"]
+    }
+    _set_render_state({
+        "templates": {
+            subpath: load_template(sources[subpath])
+            for subpath in used_subpaths
+        },
+        "scheme_args": scheme_args,
+    })
+
+    if jobs > 1 and len(tasks) > 1:
+        # warm the caches workers would otherwise each rebuild
+        compute_swatch_table("hex", resolution)
+        compute_swatch_features(metric, resolution)
+
+        # a few chunks per worker evens out uneven variant costs
+        n_chunks = min(len(tasks), 4 * jobs)
+        chunks = [tasks[i::n_chunks] for i in range(n_chunks)]
+
+        mp_context = None
+        if "fork" in mp.get_all_start_methods():
+            mp_context = mp.get_context("fork")
+
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            mp_context=mp_context,
+            initializer=_set_render_state,
+            initargs=(_render_state,),
+        ) as executor:
+            records = [
+                record
+                for chunk_records in executor.map(render_variants, chunks)
+                for record in chunk_records
+            ]
+    else:
+        records = render_variants(tasks)
+
+    written = []
+    for target, inputs, digest, was_written in records:
+        manifest[target.relative_to(output_dir).as_posix()] = {
+            "inputs": inputs,
+            "content": digest,
+        }
+        if was_written:
+            written.append(target)
+    save_manifest(output_dir, manifest)
+
+    return written
+
+def clean_output(output_dir: Path) -> None:
+    """
+    Remove the contents of a build output directory.
+    """
+
+    if output_dir.is_dir():
+        shutil.rmtree(output_dir)
@@ -0,0 +1,157 @@
+import os
+import json
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from functools import cache
+from collections.abc import Callable
+from importlib.metadata import version
+
+import numpy as np
+
+from monobiome.profiling import stage
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# bump when the layout of stored entries changes
+CACHE_FORMAT = 2
+
+# modules whose code computes the stored arrays. Their source is part of the
+# cache key, so changes to how entries are computed invalidate them without
+# a `CACHE_FORMAT` bump
+SOURCE_MODULES = ("constants", "curve", "gamut", "palette", "util")
+
+
+def cache_root() -> Path:
+    """
+    Base cache directory, `$XDG_CACHE_HOME/monobiome` (falling back to
+    `~/.cache/monobiome`).
+    """
+
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+
+    return Path(xdg_cache, "monobiome")
+
+@cache
+def source_digest() -> str:
+    """
+    Hash the source of `SOURCE_MODULES`.
+    """
+
+    h = hashlib.sha256()
+    for name in SOURCE_MODULES:
+        h.update(name.encode())
+        h.update(Path(__file__).with_name(f"{name}.py").read_bytes())
+
+    return h.hexdigest()
+
+def cache_key(parameters_bytes: bytes) -> str:
+    """
+    Hash the inputs that determine every derived palette array: the raw
+    parameters file, the source of the modules computing the arrays (see
+    `source_digest()`), the monobiome version, and the coloraide version
+    (whose conversion matrices the gamut solver uses).
+    """
+
+    h = hashlib.sha256()
+    h.update(parameters_bytes)
+    h.update(f"source={source_digest()}".encode())
+    h.update(f"monobiome={version('monobiome')}".encode())
+    h.update(f"coloraide={version('coloraide')}".encode())
+    h.update(f"format={CACHE_FORMAT}".encode())
+
+    return h.hexdigest()
+
+def _array_digest(arr: np.ndarray) -> str:
+    h = hashlib.sha256()
+    h.update(f"{arr.dtype.str}{arr.shape}".encode())
+    h.update(np.ascontiguousarray(arr).tobytes())
+
+    return h.hexdigest()
+
+def load_arrays(entry_dir: Path) -> dict[str, np.ndarray] | None:
+    """
+    Load a stored entry as memory-mapped arrays.
+
+    Each array's digest is checked against the entry's `meta.json`. Returns
+    `None` if the entry is missing, incomplete, or fails verification.
+    """
+
+    meta_file = entry_dir / "meta.json"
+    if not meta_file.is_file():
+        return None
+
+    try:
+        meta = json.loads(meta_file.read_text())
+        arrays = {}
+        for name, digest in meta["digests"].items():
+            arr = np.load(entry_dir / f"{name}.npy", mmap_mode="r")
+            if _array_digest(arr) != digest:
+                raise ValueError(f"digest mismatch for array '{name}'")
+            arrays[name] = arr
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Discarding corrupt cache entry {entry_dir}: {e}")
+        return None
+
+    return arrays
+
+def save_arrays(entry_dir: Path, arrays: dict[str, np.ndarray]) -> None:
+    """
+    Write arrays as a cache entry.
+
+    Files are staged in a sibling directory and moved into place with a single
+    rename, so readers never observe a partially written entry.
+    """
+
+    entry_dir.parent.mkdir(parents=True, exist_ok=True)
+    stage_dir = entry_dir.with_name(f".{entry_dir.name}-{os.getpid()}")
+    shutil.rmtree(stage_dir, ignore_errors=True)
+    stage_dir.mkdir()
+
+    digests = {}
+    for name, arr in arrays.items():
+        arr = np.asarray(arr)
+        np.save(stage_dir / f"{name}.npy", arr, allow_pickle=False)
+        digests[name] = _array_digest(arr)
+
+    meta = {"format": CACHE_FORMAT, "digests": digests}
+    (stage_dir / "meta.json").write_text(json.dumps(meta, indent=4))
+
+    # clear a previously rejected entry before moving the new one in place
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    try:
+        stage_dir.rename(entry_dir)
+    except OSError:
+        # another process landed the same entry first
+        shutil.rmtree(stage_dir, ignore_errors=True)
+
+def cached_arrays(
+    key: str,
+    name: str,
+    build: Callable[[], dict[str, np.ndarray]],
+) -> dict[str, np.ndarray]:
+    """
+    Load entry `name` under cache `key`, or build and store it.
+
+    Cache failures are never fatal: unreadable entries are rebuilt, and if the
+    cache directory can't be written the freshly built arrays are returned
+    as-is.
+    """
+
+    entry_dir = cache_root() / key[:32] / name
+
+    with stage("cache load"):
+        arrays = load_arrays(entry_dir)
+    if arrays is not None:
+        logger.debug(f"Loaded cache entry {entry_dir}")
+        return arrays
+
+    arrays = build()
+    try:
+        save_arrays(entry_dir, arrays)
+        logger.debug(f"Wrote cache entry {entry_dir}")
+    except OSError as e:
+        logger.warning(f"Unable to write cache entry {entry_dir}: {e}")
+
+    return arrays
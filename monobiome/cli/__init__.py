@@ -1,16 +1,26 @@
+import sys
 import logging
 from argparse import ArgumentParser
 
-from monobiome.cli import fill, scheme, palette
+from monobiome.cli import fill, build, serve, scheme, animate, palette
 
 logger: logging.Logger = logging.getLogger(__name__)
 
 def configure_logging(log_level: int) -> None:
     """
-    Configure logger's logging level.
+    Set the logging level for the whole `monobiome` package, with records
+    written to stderr.
     """
 
-    logger.setLevel(log_level)
+    package_logger = logging.getLogger("monobiome")
+    package_logger.setLevel(log_level)
+
+    if not package_logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(
+            logging.Formatter("%(levelname)s %(name)s: %(message)s")
+        )
+        package_logger.addHandler(handler)
 
 def create_parser() -> ArgumentParser:
     parser = ArgumentParser(
@@ -23,11 +33,25 @@ def create_parser() -> ArgumentParser:
         choices=[10, 20, 30, 40, 50],
         help="Log level: 10=DEBUG, 20=INFO, 30=WARNING, 40=ERROR, 50=CRITICAL",
     )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print a per-stage timing breakdown to stderr",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=str,
+        metavar="PSTATS",
+        help="write cProfile stats to a file (implies --profile)",
+    )
 
     subparsers = parser.add_subparsers(help="subcommand help")
 
     fill.register_parser(subparsers)
     scheme.register_parser(subparsers)
     palette.register_parser(subparsers)
+    build.register_parser(subparsers)
+    serve.register_parser(subparsers)
+    animate.register_parser(subparsers)
 
     return parser
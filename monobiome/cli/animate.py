@@ -0,0 +1,154 @@
+from pathlib import Path
+from argparse import Namespace, ArgumentParser
+
+from monobiome.util import _SubparserType
+from monobiome.constants import (
+    monotone_h_map,
+    lightness_value,
+    lightness_resolution,
+)
+
+# default output paths, formatted with `{biome}`, `{l_base}` and `{d}` (the
+# distance in hundredths)
+DEFAULT_OUTPUTS = {
+    "trajectories": "trajectories.gif",
+    "sphere": "mb_b{l_base}_d{d}.gif",
+}
+
+
+def register_parser(subparsers: _SubparserType) -> None:
+    parser = subparsers.add_parser(
+        "animate",
+        help="render rotating 3D views of the palette in OKLCH"
+    )
+
+    parser.add_argument(
+        "kind",
+        type=str,
+        choices=list(DEFAULT_OUTPUTS),
+        help=(
+            "palette trajectories, or the contrast sphere around a biome "
+            "base with its selected accents"
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help=(
+            "output file (.gif, or a video like .mp4); may contain {biome}, "
+            "{l_base} and {d}, the distance in hundredths (default: "
+            "trajectories.gif, mb_b{l_base}_d{d}.gif)"
+        ),
+    )
+    parser.add_argument(
+        "-b",
+        "--biome",
+        type=str,
+        default="alpine",
+        choices=list(monotone_h_map.keys()),
+        metavar="BIOME",
+        help="biome at the sphere center (default: alpine)",
+    )
+    parser.add_argument(
+        "-l",
+        "--l-base",
+        type=lightness_value,
+        default=20,
+        help="lightness of the sphere center (default: 20)",
+    )
+    parser.add_argument(
+        "-d",
+        "--distances",
+        type=float,
+        nargs="+",
+        default=[0.40],
+        help="sphere radii, one animation each (default: 0.40)",
+    )
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=lightness_resolution,
+        default=1,
+        help="lightness grid step, e.g., 0.5, 0.25, 0.1 (default: 1)",
+    )
+    parser.add_argument(
+        "-n",
+        "--frames",
+        type=int,
+        default=120,
+        help="frames per full orbit (default: 120)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=30,
+        help="frame duration in milliseconds (default: 30)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes to render with (default: 1)",
+    )
+
+    parser.set_defaults(func=handle_animate)
+
+
+def handle_animate(args: Namespace, parser: ArgumentParser) -> None:
+    # plotly and kaleido are only loaded when rendering
+    from monobiome.animate import (
+        sphere_figure,
+        render_animations,
+        trajectory_figure,
+    )
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.frames < 1:
+        parser.error("--frames must be at least 1")
+
+    output = args.output or DEFAULT_OUTPUTS[args.kind]
+    several = args.kind == "sphere" and len(args.distances) > 1
+    if several and "{d}" not in output:
+        parser.error("--output must contain {d} for several distances")
+
+    def output_path(distance: float) -> Path:
+        return Path(output.format(
+            biome=args.biome,
+            l_base=args.l_base,
+            d=round(distance * 100),
+        ))
+
+    try:
+        if args.kind == "trajectories":
+            animations = [
+                (trajectory_figure(args.resolution), output_path(0))
+            ]
+        else:
+            animations = [
+                (
+                    sphere_figure(
+                        args.biome,
+                        args.l_base,
+                        distance,
+                        args.resolution,
+                    ),
+                    output_path(distance),
+                )
+                for distance in args.distances
+            ]
+    except ValueError as e:
+        parser.error(str(e))
+        return
+
+    for _, path in animations:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    render_animations(
+        animations,
+        n_frames=args.frames,
+        duration=args.duration,
+        jobs=args.jobs,
+    )
@@ -0,0 +1,172 @@
+from pathlib import Path
+from argparse import Namespace, ArgumentParser
+from contextlib import suppress
+
+from monobiome.util import _SubparserType
+from monobiome.build import build, clean_output
+from monobiome.watch import watch
+from monobiome.metric import metric_kernel_map
+from monobiome.constants import (
+    monotone_h_map,
+    lightness_value,
+    lightness_resolution,
+)
+
+
+def register_parser(subparsers: _SubparserType) -> None:
+    parser = subparsers.add_parser(
+        "build",
+        help="render app templates for a matrix of schemes"
+    )
+
+    parser.add_argument(
+        "-t",
+        "--templates",
+        type=str,
+        default="templates",
+        help="template directory (default: templates)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="app-config",
+        help="output directory (default: app-config)",
+    )
+    parser.add_argument(
+        "-b",
+        "--biomes",
+        type=str,
+        nargs="+",
+        default=list(monotone_h_map.keys()),
+        choices=list(monotone_h_map.keys()),
+        metavar="BIOME",
+        help="biomes to build (default: all)",
+    )
+    parser.add_argument(
+        "--modes",
+        type=str,
+        nargs="+",
+        default=["light", "dark"],
+        choices=["dark", "light"],
+        metavar="MODE",
+        help="scheme modes to build (default: light dark)",
+    )
+    parser.add_argument(
+        "--dark-l",
+        type=lightness_value,
+        nargs="+",
+        default=[22],
+        help="base lightness levels for dark schemes (default: 22)",
+    )
+    parser.add_argument(
+        "--light-l",
+        type=lightness_value,
+        nargs="+",
+        default=[92],
+        help="base lightness levels for light schemes (default: 92)",
+    )
+    parser.add_argument(
+        "-m",
+        "--metric",
+        type=str,
+        default="oklch",
+        choices=list(metric_kernel_map),
+        help="metric to use for measuring swatch distances"
+    )
+    parser.add_argument(
+        "-d",
+        "--distances",
+        type=float,
+        nargs="+",
+        default=[0.40],
+        help="distance thresholds for specified metric (default: 0.40)",
+    )
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=lightness_resolution,
+        default=1,
+        help="lightness grid step, e.g., 0.5, 0.25, 0.1 (default: 1)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="number of worker processes to render with (default: 1)",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="remove the output directory before building",
+    )
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help=(
+            "delete previously built outputs this matrix no longer produces "
+            "(implied when building every biome and mode)"
+        ),
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help=(
+            "after building, watch the parameters file and templates, "
+            "re-rendering only affected outputs on change"
+        ),
+    )
+
+    parser.set_defaults(func=handle_build)
+
+
+def handle_build(args: Namespace, parser: ArgumentParser) -> None:
+    template_dir = Path(args.templates)
+    output_dir = Path(args.output)
+
+    if not template_dir.is_dir():
+        parser.error(f"template directory not found: {template_dir}")
+
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    if args.clean:
+        clean_output(output_dir)
+
+    matrix_args = (
+        template_dir,
+        output_dir,
+        args.biomes,
+        args.modes,
+        {"dark": args.dark_l, "light": args.light_l},
+        args.distances,
+    )
+    # a build of every biome and mode covers the whole output tree, so
+    # anything else it recorded is stale
+    full_matrix = (
+        set(args.biomes) == set(monotone_h_map)
+        and set(args.modes) == {"dark", "light"}
+    )
+    try:
+        written = build(
+            *matrix_args,
+            metric=args.metric,
+            resolution=args.resolution,
+            jobs=args.jobs,
+            prune=args.prune or full_matrix,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+        return
+
+    print(f"Wrote {len(written)} files to {output_dir}")
+
+    if args.watch:
+        with suppress(KeyboardInterrupt):
+            watch(
+                *matrix_args,
+                metric=args.metric,
+                resolution=args.resolution,
+            )
@@ -3,10 +3,11 @@ import tomllib
 from pathlib import Path
 from argparse import Namespace, ArgumentParser
 
-from symconf.template import Template, TOMLTemplate
-
 from monobiome.util import _SubparserType
-from monobiome.palette import generate_palette
+from monobiome.build import fill_scheme
+from monobiome.palette import compute_palette_dict
+from monobiome.template import fill_template, compile_template
+from monobiome.constants import lightness_resolution
 
 
 def register_parser(subparsers: _SubparserType) -> None:
@@ -37,6 +38,16 @@ def register_parser(subparsers: _SubparserType) -> None:
         type=str,
         help="output file to write filled template",
     )
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=lightness_resolution,
+        default=1,
+        help=(
+            "lightness grid step of the default palette, e.g., 0.5, 0.25 "
+            "(default: 1)"
+        ),
+    )
 
     parser.set_defaults(func=handle_fill)
 
@@ -64,12 +75,16 @@ def handle_fill(args: Namespace, parser: ArgumentParser) -> None:
         except OSError as e:
             parser.error(f"cannot read palette file: {e}")
             return
+        palette_dict = tomllib.loads(palette_toml)
     else:
-        palette_toml = generate_palette("hex", "toml")
+        # same structure as a parsed hex palette file, without the round trip
+        palette_dict = compute_palette_dict("hex", args.resolution)
 
-    palette_dict = tomllib.loads(palette_toml)
-    concrete_scheme = TOMLTemplate(scheme).fill_dict(palette_dict)
-    filled_template = Template(template_content).fill(concrete_scheme)
+    concrete_scheme = fill_scheme(scheme.read_text(), palette_dict)
+    filled_template = fill_template(
+        compile_template(template_content),
+        concrete_scheme,
+    )
 
     if output is None:
         print(filled_template)
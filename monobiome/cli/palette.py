@@ -3,6 +3,7 @@ from argparse import Namespace, ArgumentParser
 
 from monobiome.util import _SubparserType
 from monobiome.palette import generate_palette
+from monobiome.constants import lightness_resolution
 
 
 def register_parser(subparsers: _SubparserType) -> None:
@@ -33,6 +34,13 @@ def register_parser(subparsers: _SubparserType) -> None:
         type=str,
         help="output file to write palette content",
     )
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=lightness_resolution,
+        default=1,
+        help="lightness grid step, e.g., 0.5, 0.25, 0.1 (default: 1)",
+    )
 
     parser.set_defaults(func=handle_palette)
 
@@ -42,7 +50,7 @@ def handle_palette(args: Namespace, parser: ArgumentParser) -> None:
     file_format = args.format
     output = args.output
 
-    palette_text = generate_palette(notation, file_format)
+    palette_text = generate_palette(notation, file_format, args.resolution)
 
     if output is None:
         print(palette_text)
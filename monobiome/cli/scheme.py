@@ -2,8 +2,18 @@ from pathlib import Path
 from argparse import Namespace, ArgumentParser
 
 from monobiome.util import _SubparserType
-from monobiome.scheme import generate_scheme
-from monobiome.constants import monotone_h_map
+from monobiome.metric import metric_kernel_map
+from monobiome.scheme import (
+    vim_color_map,
+    full_color_map,
+    term_color_map,
+    generate_scheme,
+)
+from monobiome.constants import (
+    monotone_h_map,
+    lightness_value,
+    lightness_resolution,
+)
 
 
 def register_parser(subparsers: _SubparserType) -> None:
@@ -29,7 +39,7 @@ def register_parser(subparsers: _SubparserType) -> None:
         "--metric",
         type=str,
         default="oklch",
-        choices=["wcag", "oklch", "lightness"],
+        choices=list(metric_kernel_map),
         help="metric to use for measuring swatch distances"
     )
 
@@ -47,6 +57,13 @@ def register_parser(subparsers: _SubparserType) -> None:
         type=str,
         help="output file to write scheme content",
     )
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=lightness_resolution,
+        default=1,
+        help="lightness grid step, e.g., 0.5, 0.25, 0.1 (default: 1)",
+    )
 
     # these params remain rooted in lightness; no need to accommodate metric
     # given these are monotone adjustments. You *could* consider rooting these
@@ -56,13 +73,13 @@ def register_parser(subparsers: _SubparserType) -> None:
     parser.add_argument(
         "-l",
         "--l-base",
-        type=int,
+        type=lightness_value,
         default=20,
         help="minimum lightness level (default: 20)",
     )
     parser.add_argument(
         "--l-step",
-        type=int,
+        type=lightness_value,
         default=5,
         help="lightness step size (default: 5)",
     )
@@ -70,19 +87,19 @@ def register_parser(subparsers: _SubparserType) -> None:
     # gaps
     parser.add_argument(
         "--fg-gap",
-        type=int,
+        type=lightness_value,
         default=50,
         help="foreground lightness gap (default: 50)",
     )
     parser.add_argument(
         "--grey-gap",
-        type=int,
+        type=lightness_value,
         default=30,
         help="grey lightness gap (default: 30)",
     )
     parser.add_argument(
         "--term-fg-gap",
-        type=int,
+        type=lightness_value,
         default=65,
         help="terminal foreground lightness gap (default: 60)",
     )
@@ -103,50 +120,25 @@ def handle_scheme(args: Namespace, parser: ArgumentParser) -> None:
     grey_gap = args.grey_gap
     term_fg_gap = args.term_fg_gap
 
-    full_color_map = {
-        "red": "red",
-        "orange": "orange",
-        "yellow": "yellow",
-        "green": "green",
-        "cyan": "cyan",
-        "blue": "blue",
-        "violet": "violet",
-        "magenta": "magenta",
-    }
-    term_color_map = {
-        "red": "red",
-        "yellow": "yellow",
-        "green": "green",
-        "cyan": "blue",
-        "blue": "blue",
-        "magenta": "orange",
-    }
-    vim_color_map = {
-        "red": "red",
-        "orange": "orange",
-        "yellow": "yellow",
-        "green": "green",
-        "cyan": "green",
-        "blue": "blue",
-        "violet": "blue",
-        "magenta": "red",
-    }
-    # vim_color_map = full_color_map
-
-    scheme_text = generate_scheme(
-        mode,
-        biome,
-        metric,
-        distance,
-        l_base,
-        l_step,
-        fg_gap,
-        grey_gap,
-        term_fg_gap,
-        full_color_map,
-        term_color_map,
-        vim_color_map,
-    )
+    try:
+        scheme_text = generate_scheme(
+            mode,
+            biome,
+            metric,
+            distance,
+            l_base,
+            l_step,
+            fg_gap,
+            grey_gap,
+            term_fg_gap,
+            full_color_map,
+            term_color_map,
+            vim_color_map,
+            args.resolution,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+        return
 
     if output is None:
         print(scheme_text)
@@ -0,0 +1,73 @@
+import asyncio
+from pathlib import Path
+from argparse import Namespace, ArgumentParser
+from contextlib import suppress
+
+from monobiome.util import _SubparserType
+from monobiome.serve import (
+    warm,
+    serve,
+    load_templates,
+    served_resolution,
+)
+
+
+def register_parser(subparsers: _SubparserType) -> None:
+    parser = subparsers.add_parser(
+        "serve",
+        help="serve palettes, schemes and filled templates over HTTP"
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="address to listen on (default: 127.0.0.1)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="port to listen on (default: 8080)",
+    )
+    parser.add_argument(
+        "-s",
+        "--socket",
+        type=str,
+        help="Unix socket path to listen on (instead of host and port)",
+    )
+    parser.add_argument(
+        "-t",
+        "--templates",
+        type=str,
+        help="template directory to keep resident for /fill/<template>",
+    )
+    parser.add_argument(
+        "-r",
+        "--resolution",
+        type=served_resolution,
+        default=1,
+        help="lightness grid step to warm at startup (default: 1)",
+    )
+
+    parser.set_defaults(func=handle_serve)
+
+
+def handle_serve(args: Namespace, parser: ArgumentParser) -> None:
+    socket_path = Path(args.socket) if args.socket else None
+
+    if args.templates is not None:
+        template_dir = Path(args.templates)
+        if not template_dir.is_dir():
+            parser.error(f"template directory not found: {template_dir}")
+        load_templates(template_dir)
+
+    warm(args.resolution)
+
+    if socket_path is None:
+        print(f"Serving on http://{args.host}:{args.port}")
+    else:
+        print(f"Serving on {socket_path}")
+
+    with suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.host, args.port, socket_path))
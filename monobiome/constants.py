@@ -1,15 +1,22 @@
+import math
 import tomllib
+from typing import Any
+from functools import cache
 from importlib.resources import files
 
 import numpy as np
 
+from monobiome.cache import cache_key, cached_arrays
 from monobiome.curve import (
-    l_maxC_h,
     bezier_y_at_x,
+    l_maxC_h_array,
 )
+from monobiome.profiling import stage
 
 parameters_file = files("monobiome.data") / "parameters.toml"
-parameters = tomllib.load(parameters_file.open("rb"))
+with stage("parameter load"):
+    parameters_bytes = parameters_file.read_bytes()
+    parameters = tomllib.loads(parameters_bytes.decode())
 
 L_min: int = parameters.get("L_min", 10)
 L_max: int = parameters.get("L_max", 98)
@@ -27,115 +34,387 @@ h_C_offsets = parameters.get("h_C_offsets", {})
 monotone_h_map = parameters.get("monotone_h_map", {})
 accent_h_map = parameters.get("accent_h_map", {})
 h_map = {**monotone_h_map, **accent_h_map}
+h_array = np.array(list(h_map.values()), dtype=float)
 
-"""
-Compute chroma maxima at provided lightness levels across hues.
 
-A map with max chroma values for each hue across lightness space
+def lightness_value(L: str | float) -> int | float:
+    """
+    Normalize a lightness level, as an `int` if whole (so `20.0` formats as
+    `20`) and a float rounded to 6 decimals otherwise.
+    """
 
-{
-   "red": [ Cmax@L=10, Cmax@L=11, Cmax@L=12, ... ],
-   "orange": [ Cmax@L=10, Cmax@L=11, Cmax@L=12, ... ],
-   ...
-}
-"""
-Lspace_Cmax_Hmap = {
-    h_str: [l_maxC_h(_L, _h) for _L in L_space]
-    for h_str, _h in h_map.items()
-}
+    L = float(L)
+    if not math.isfinite(L):
+        raise ValueError(f"Lightness must be finite, got {L}")
+
+    L = round(L, 6)
+
+    return int(L) if L.is_integer() else L
+
+def _grid_steps(resolution: float) -> int:
+    # grid steps per unit lightness
+    steps = 1 / resolution if resolution > 0 else 0
+    if not 1 <= steps <= 1000 or abs(steps - round(steps)) > 1e-6:
+        raise ValueError(
+            f"Lightness resolution must evenly divide 1, got {resolution}"
+        )
+
+    return round(steps)
+
+def lightness_resolution(resolution: str | float) -> int | float:
+    """
+    Validate a lightness grid resolution, which must evenly divide 1.
+    """
+
+    resolution = lightness_value(resolution)
+    _grid_steps(resolution)
+
+    return resolution
 
+@cache
+def lightness_grid(resolution: float = 1) -> list[int | float]:
+    """
+    Lightness levels from `L_min` to `L_max` in steps of `resolution`.
 
-"""
-Set QBR curves, *unbounded* chroma curves for all hues
+    `resolution` must evenly divide 1 (e.g., 0.5, 0.25, 0.1), so every grid
+    includes the whole-number levels; `lightness_grid(1) == L_points`.
+    """
 
-1. Raw bezier chroma values for each hue across the lightness space
+    steps = _grid_steps(resolution)
 
-   Lpoints_Cqbr_Hmap = {
-      "red": [ Bezier@L=10, Bezier@L=11, Bezier@L=12, ... ],
-      ...
-   }
+    return [
+        lightness_value(i / steps)
+        for i in range(L_min*steps, L_max*steps + 1)
+    ]
+
+def lightness_index(L: float, resolution: float = 1) -> int:
+    """
+    Index of the grid level nearest to `L` in `lightness_grid(resolution)`,
+    or -1 if `L` falls outside the grid.
+    """
+
+    steps = _grid_steps(resolution)
+    li = round(L * steps) - L_min*steps
+
+    return li if 0 <= li <= (L_max - L_min)*steps else -1
+
+def lightness_grid_index(L: float, resolution: float = 1) -> int:
+    """
+    Index of `L` in `lightness_grid(resolution)`. Unlike `lightness_index()`,
+    `L` must be a grid level itself; it isn't rounded to the nearest one.
 
-2. Three bezier control points for each hue's chroma curve
+    Raises: `ValueError` if `L` is not a level of the grid
+    """
 
-   QBR_ctrl_Hmap = {
-      "red": np.array([
-          [ x1, y1 ],
-          [ x2, y2 ],
-          [ x3, y3 ]
-       ]),
-      ...
-   }
-"""
-Lpoints_Cqbr_Hmap = {}
-QBR_ctrl_Hmap = {}
+    steps = _grid_steps(resolution)
+    li = lightness_index(L, resolution)
+    if li < 0 or lightness_value(li/steps + L_min) != lightness_value(L):
+        raise ValueError(
+            f"Lightness {lightness_value(L)} is not on the lightness grid "
+            f"(L{L_min}-L{L_max} in steps of {resolution})"
+        )
 
-for h_str, _h in monotone_h_map.items():
-    Lpoints_Cqbr_Hmap[h_str] = np.array(
-        [monotone_C_map[h_str]]*len(L_points)
+    return li
+
+def accent_parameters() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The loaded accent curve parameters, `(h_weights, h_L_offsets,
+    h_C_offsets)`, as arrays ordered as in `accent_h_map` (with defaults of
+    1, 0 and 0 for unlisted accents).
+    """
+
+    return (
+        np.array([h_weights.get(h_str, 1) for h_str in accent_h_map], float),
+        np.array([h_L_offsets.get(h_str, 0) for h_str in accent_h_map], float),
+        np.array([h_C_offsets.get(h_str, 0) for h_str in accent_h_map], float),
     )
-    
-for h_str, _h in accent_h_map.items():
-    Lspace_Cmax = Lspace_Cmax_Hmap[h_str]
-    
-    # get L value of max chroma; will be a bezier control
-    L_Cmax_idx = np.argmax(Lspace_Cmax)
-    L_Cmax = L_space[L_Cmax_idx]
-
-    # offset control point by any preset x-shift
-    L_Cmax += h_L_offsets[h_str]
-
-    # and get max C at the L offset
-    Cmax = l_maxC_h(L_Cmax, _h)
-
-    # set 3 control points; shift by any global linear offest
-    C_offset = h_C_offsets.get(h_str, 0)
-    
-    p_0 = np.array([0, 0])
-    p_Cmax = np.array([L_Cmax, Cmax + C_offset])
-    p_100 = np.array([100, 0])
-    
-    B_L_points = bezier_y_at_x(
-        p_0, p_Cmax, p_100,
-        h_weights.get(h_str, 1),
-        L_points
+
+@cache
+def gamut_bounds(resolution: float = 1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gamut max chroma per hue (rows as in `h_map`) across `L_space` and
+    across the lightness grid. Independent of the accent curve parameters,
+    so solved once for any number of candidate parameter sets.
+    """
+
+    L_grid = np.asarray(lightness_grid(resolution))
+
+    with stage("gamut solve"):
+        Lspace_Cmax = l_maxC_h_array(L_space[None, :], h_array[:, None])
+        Lpoints_Cmax = l_maxC_h_array(L_grid[None, :], h_array[:, None])
+
+    return Lspace_Cmax, Lpoints_Cmax
+
+def solve_accent_curves(
+    weights: np.ndarray,
+    L_offsets: np.ndarray,
+    C_offsets: np.ndarray,
+    resolution: float = 1,
+) -> dict[str, np.ndarray]:
+    """
+    Solve the chroma curves for a batch of accent parameter sets.
+
+    Parameters are given as arrays of shape `(..., A)`, with accents ordered
+    as in `accent_h_map` (see `accent_parameters()`); e.g., `(K, A)` for K
+    candidate `h_weights`, `h_L_offsets` and `h_C_offsets` settings. Arrays
+    broadcast against each other, so candidates varying only one parameter
+    can share the others. Every candidate is solved at once with array
+    operations: accent peaks, Bezier curves, gamut clamping and
+    non-intersection. Monotone curves are taken from the loaded parameters.
+
+    Returns a map of arrays with leading batch shape `(...)`, with hue rows
+    ordered as in `h_map`:
+
+    - `Lpoints_Cqbr`: raw (unbounded) Bezier chroma, shape `(..., H, |grid|)`
+    - `QBR_ctrl`: Bezier control points per accent, shape `(..., A, 3, 2)`
+    - `Lpoints_Cstar`: gamut-bounded, non-intersecting chroma, shape
+      `(..., H, |grid|)`
+    - `Cstar_order`: hue row indices ordered by max (bounded) chroma
+    - `Cstar_order_max`: the max chroma of each hue in that order
+    """
+
+    weights, L_offsets, C_offsets = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (weights, L_offsets, C_offsets))
     )
-    Lpoints_Cqbr_Hmap[h_str] = B_L_points
-    QBR_ctrl_Hmap[h_str] = np.vstack([p_0, p_Cmax, p_100])
+    batch_shape = weights.shape[:-1]
 
+    L_grid = np.asarray(lightness_grid(resolution))
+    Lspace_Cmax, Lpoints_Cmax = gamut_bounds(resolution)
+    n_M = len(monotone_h_map)
 
-"""
-Bezier chroma values, but bounded to attainable gamut colors (bezier fit
-can produce invalid chroma values)
+    # get L value of max chroma for each accent; will be a bezier control.
+    # Offset control points by any preset x-shift, then solve all max Cs at
+    # once
+    L_Cmax = L_space[np.argmax(Lspace_Cmax[n_M:], axis=-1)] + L_offsets
+    with stage("gamut solve"):
+        Cmax = l_maxC_h_array(L_Cmax, h_array[n_M:])
 
-h_L_points_Cstar = {
-   "red": [ bounded-bezier@L=10, bounded-bezier@L=11, ... ],
-   ...
-}
-"""
-Lpoints_Cstar_Hmap = {}
+    # set 3 control points per accent; shift by any global linear offest
+    p_0 = np.zeros((*weights.shape, 2))
+    p_Cmax = np.stack([L_Cmax, Cmax + C_offsets], axis=-1)
+    p_100 = np.broadcast_to([100.0, 0.0], p_Cmax.shape)
+    QBR_ctrl = np.stack([p_0, p_Cmax, p_100], axis=-2)
 
-for h_str, L_points_C in Lpoints_Cqbr_Hmap.items():
-    _h = h_map[h_str]
+    # evaluate all accent curves in one batch, below the (constant) monotones
+    monotone_C = np.array([monotone_C_map[h_str] for h_str in monotone_h_map])
+    Lpoints_Cqbr = np.concatenate(
+        [
+            np.broadcast_to(
+                monotone_C[:, None],
+                (*batch_shape, n_M, len(L_grid)),
+            ),
+            bezier_y_at_x(p_0, p_Cmax, p_100, weights, L_grid),
+        ],
+        axis=-2,
+    )
 
-    Lpoints_Cstar_Hmap[h_str] = [
-        max(0, min(_C, l_maxC_h(_L, _h)))
-        for _L, _C in zip(L_points, L_points_C, strict=True)
-    ]
+    # bezier fit can produce invalid chroma values; bound to gamut
+    with stage("C* clamp"):
+        Lpoints_Cstar = np.clip(Lpoints_Cqbr, 0, Lpoints_Cmax)
+
+        # strictly enforce curve bounds s.t. there are no intersections
+        # order is determined by the max attained chroma; each curve is
+        # capped by the (already capped) curve just outside of it
+        Cstar_max = Lpoints_Cstar.max(axis=-1)
+        Cstar_order = np.argsort(-Cstar_max, axis=-1, kind="stable")
+        nested = np.minimum.accumulate(
+            np.take_along_axis(Lpoints_Cstar, Cstar_order[..., None], -2),
+            axis=-2,
+        )
+        np.put_along_axis(Lpoints_Cstar, Cstar_order[..., None], nested, -2)
+
+    return {
+        "Lpoints_Cqbr": Lpoints_Cqbr,
+        "QBR_ctrl": QBR_ctrl,
+        "Lpoints_Cstar": Lpoints_Cstar,
+        "Cstar_order": Cstar_order,
+        "Cstar_order_max": np.take_along_axis(Cstar_max, Cstar_order, -1),
+    }
+
+def solve_curves(resolution: float = 1) -> dict[str, np.ndarray]:
+    """
+    Solve all derived chroma curves from the loaded parameters, across the
+    lightness grid at the given `resolution` (`L_points` by default).
+
+    Returns a map of arrays, with hue rows ordered as in `h_map` (accent rows
+    for `QBR_ctrl` ordered as in `accent_h_map`):
+
+    - `Lspace_Cmax`: gamut max chroma across `L_space`, shape `(H, |L_space|)`
+    - `Lpoints_Cqbr`: raw (unbounded) Bezier chroma across the grid
+    - `QBR_ctrl`: Bezier control points per accent, shape `(A, 3, 2)`
+    - `Lpoints_Cstar`: gamut-bounded, non-intersecting chroma across the grid
+    - `Cstar_order`: hue row indices ordered by max (bounded) chroma
+    - `Cstar_order_max`: the max chroma of each hue in that order
+    """
+
+    Lspace_Cmax, _ = gamut_bounds(resolution)
+
+    return {
+        "Lspace_Cmax": Lspace_Cmax,
+        **solve_accent_curves(*accent_parameters(), resolution),
+    }
 
+@cache
+def compute_curves(resolution: float = 1) -> dict[str, np.ndarray]:
+    """
+    Derived chroma curves (see `solve_curves()`), loaded from the on-disk
+    cache when parameters and versions match a previous run.
+    """
 
-# strictly enforce curve bounds s.t. there are no intersections
-# order is determined by the max attained chromap
-max_Cstar_Horder = [
-    (h_str, max(Lpoints_Cstar))
-    for h_str, Lpoints_Cstar in Lpoints_Cstar_Hmap.items()
-]
-max_Cstar_Horder = sorted(max_Cstar_Horder, key=lambda t: t[1], reverse=True)
+    return cached_arrays(
+        cache_key(parameters_bytes),
+        "curves" if resolution == 1 else f"curves-r{resolution}",
+        lambda: solve_curves(resolution),
+    )
+
+def cstar_at(
+    L: float | np.ndarray,
+    rows: int | np.ndarray,
+    resolution: float = 1,
+) -> np.ndarray:
+    """
+    Gamut-bounded, non-intersecting chroma of hue `rows` (indices into
+    `h_map`) at arbitrary lightness `L`, broadcast against each other.
+
+    Evaluates the continuous curves that `compute_curves(resolution)` samples
+    (and agrees with on the grid): each hue's Bezier (or constant monotone)
+    chroma is clipped to the gamut and capped by the curves outside it in
+    `Cstar_order`. Only those outer curves are solved for each point.
+    """
+
+    curves = compute_curves(resolution)
+    L, rows = np.broadcast_arrays(
+        np.asarray(L, dtype=float),
+        np.asarray(rows, dtype=np.intp),
+    )
+    n_M = len(monotone_h_map)
+
+    # pair each point with its own hue and every hue nested outside it
+    rank = np.argsort(curves["Cstar_order"])
+    pi, hi = np.nonzero(rank[None, :] <= rank[rows.ravel(), None])
+    x = L.ravel()[pi]
+
+    C = np.empty(len(x))
+    monotone = hi < n_M
+    monotone_C = np.array([monotone_C_map[h_str] for h_str in monotone_h_map])
+    C[monotone] = monotone_C[hi[monotone]]
+
+    ai = hi[~monotone] - n_M
+    weights, _, _ = accent_parameters()
+    ctrl = curves["QBR_ctrl"][ai]
+    C[~monotone] = bezier_y_at_x(
+        ctrl[:, 0], ctrl[:, 1], ctrl[:, 2], weights[ai], x[~monotone, None]
+    )[:, 0]
+
+    C = np.clip(C, 0, l_maxC_h_array(x, h_array[hi]))
+    starts = np.flatnonzero(np.diff(pi, prepend=-1))
+
+    return np.minimum.reduceat(C, starts).reshape(L.shape)
+
+@cache
+def compute_cmax_map() -> dict[str, list[float]]:
+    """
+    Compute chroma maxima at provided lightness levels across hues.
+
+    A map with max chroma values for each hue across lightness space
+
+    {
+       "red": [ Cmax@L=10, Cmax@L=11, Cmax@L=12, ... ],
+       "orange": [ Cmax@L=10, Cmax@L=11, Cmax@L=12, ... ],
+       ...
+    }
+    """
+
+    Lspace_Cmax = compute_curves()["Lspace_Cmax"]
+
+    return dict(zip(h_map, Lspace_Cmax.tolist(), strict=True))
+
+@cache
+def compute_qbr_map() -> tuple[dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """
+    Set QBR curves, *unbounded* chroma curves for all hues
+
+    Returns:
+        1. Raw bezier chroma values for each hue across the lightness space
+
+           Lpoints_Cqbr_Hmap = {
+              "red": [ Bezier@L=10, Bezier@L=11, Bezier@L=12, ... ],
+              ...
+           }
 
-for i in range(len(max_Cstar_Horder)-1):
-    outer_h, _ = max_Cstar_Horder[i]
-    inner_h, _ = max_Cstar_Horder[i+1]
+        2. Three bezier control points for each hue's chroma curve
 
-    Lpoints_Cstar_Hmap[inner_h] = [
-        min(inner_c, Lpoints_Cstar_Hmap[outer_h][ci])
-        for ci, inner_c in enumerate(Lpoints_Cstar_Hmap[inner_h])
+           QBR_ctrl_Hmap = {
+              "red": np.array([
+                  [ x1, y1 ],
+                  [ x2, y2 ],
+                  [ x3, y3 ]
+               ]),
+              ...
+           }
+    """
+
+    curves = compute_curves()
+    Lpoints_Cqbr_Hmap = dict(
+        zip(h_map, np.array(curves["Lpoints_Cqbr"]), strict=True)
+    )
+    QBR_ctrl_Hmap = dict(
+        zip(accent_h_map, np.array(curves["QBR_ctrl"]), strict=True)
+    )
+
+    return Lpoints_Cqbr_Hmap, QBR_ctrl_Hmap
+
+@cache
+def compute_cstar_map() -> tuple[
+    dict[str, list[float]],
+    list[tuple[str, float]],
+]:
+    """
+    Bezier chroma values, but bounded to attainable gamut colors (bezier fit
+    can produce invalid chroma values)
+
+    Returns:
+        1. Bounded chroma curves, non-intersecting across hues
+
+           Lpoints_Cstar_Hmap = {
+              "red": [ bounded-bezier@L=10, bounded-bezier@L=11, ... ],
+              ...
+           }
+
+        2. Hues ordered by their max attained chroma, as `(h_str, max C*)`
+           pairs (the nesting order used to enforce non-intersection)
+    """
+
+    curves = compute_curves()
+    h_names = list(h_map)
+
+    Lpoints_Cstar_Hmap = dict(
+        zip(h_names, curves["Lpoints_Cstar"].tolist(), strict=True)
+    )
+    max_Cstar_Horder = [
+        (h_names[hi], Cmax)
+        for hi, Cmax in zip(
+            curves["Cstar_order"].tolist(),
+            curves["Cstar_order_max"].tolist(),
+            strict=True,
+        )
     ]
+
+    return Lpoints_Cstar_Hmap, max_Cstar_Horder
+
+
+# derived curves are computed on first attribute access (and memoized), so
+# importing this module only pays for reading the parameters file
+_lazy_attr_map = {
+    "Lspace_Cmax_Hmap": lambda: compute_cmax_map(),
+    "Lpoints_Cqbr_Hmap": lambda: compute_qbr_map()[0],
+    "QBR_ctrl_Hmap": lambda: compute_qbr_map()[1],
+    "Lpoints_Cstar_Hmap": lambda: compute_cstar_map()[0],
+    "max_Cstar_Horder": lambda: compute_cstar_map()[1],
+}
+
+def __getattr__(name: str) -> dict[str, Any] | list[tuple[str, float]]:
+    if name in _lazy_attr_map:
+        return _lazy_attr_map[name]()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,12 @@
 from functools import cache
 
 import numpy as np
-from coloraide import Color
+
+from monobiome.util import (
+    oklab_from_oklch,
+    srgb_from_linear,
+    linear_srgb_from_oklab,
+)
 
 
 def quad_bezier_rational(
@@ -25,53 +30,195 @@ def quad_bezier_rational(
     
     return num / den
     
+def _qbr_coords(P: np.ndarray, axis: int) -> np.ndarray:
+    # one coordinate of a batch of control points, with a trailing axis to
+    # broadcast against evaluation points
+    return np.asarray(P, dtype=float)[..., axis, None]
+
+def bezier_t_at_x(
+    P0: np.ndarray,
+    P1: np.ndarray,
+    P2: np.ndarray,
+    w: float | np.ndarray,
+    x: float | np.ndarray,
+) -> np.ndarray:
+    """
+    Solve for the parameter `t` at which a quadratic rational Bezier curve
+    reaches the given `x` values.
+
+    Setting `x(t) = x` and clearing the denominator leaves a quadratic in `t`
+    (in Bernstein form, with coefficients `x0 - x`, `w*(x1 - x)`, `x2 - x`),
+    solved in closed form. Assumes the curve is monotone in `x` (as when `x0
+    < x1 < x2` and `w > 0`), so there's a single root in `[0, 1]`. Inputs
+    outside the curve's `x` extent are clamped to its endpoints.
+
+    Control points have shape `(..., 2)` and `w` shape `(...)`, for a batch of
+    curves; `x` broadcasts against `(..., n)`.
+    """
+
+    x0, x1, x2 = (_qbr_coords(P, 0) for P in (P0, P1, P2))
+    w = np.asarray(w, dtype=float)[..., None]
+    x = np.clip(x, np.minimum(x0, x2), np.maximum(x0, x2))
+
+    a0, a1, a2 = x0 - x, w*(x1 - x), x2 - x
+    A = a0 - 2*a1 + a2
+    B = 2*(a1 - a0)
+    C = a0
+
+    # numerically stable roots q/A and C/q, preferring C/q (the root that
+    # remains finite as the quadratic degenerates to a linear one)
+    disc = np.sqrt(np.maximum(B**2 - 4*A*C, 0))
+    q = -0.5*(B + np.copysign(disc, B))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_q = C / q
+        t_A = q / A
+
+    tol = 1e-9
+    t = np.where((t_q >= -tol) & (t_q <= 1 + tol), t_q, t_A)
+
+    return np.clip(np.nan_to_num(t), 0, 1)
+
 def bezier_y_at_x(
-    P0: float,
-    P1: float,
-    P2: float,
-    w: float,
-    x: float,
-    n: int = 400,
+    P0: np.ndarray,
+    P1: np.ndarray,
+    P2: np.ndarray,
+    w: float | np.ndarray,
+    x: float | np.ndarray,
 ) -> np.ndarray:
     """
-    For the provided QBR parameters, provide the curve value at the given
-    input.
+    For the provided QBR parameters, provide the (exact) curve value at the
+    given inputs.
+
+    Supports batches of curves: control points of shape `(..., 2)` and `w` of
+    shape `(...)` give results of shape `(..., n)` for `x` broadcasting
+    against `(..., n)`. See `bezier_t_at_x()` for assumptions on the curve.
     """
 
-    t = np.linspace(0, 1, n)
-    B = quad_bezier_rational(P0, P1, P2, w, t)
-    x_vals, y_vals = B[:, 0], B[:, 1]
-    
-    return np.interp(x, x_vals, y_vals)
+    t = bezier_t_at_x(P0, P1, P2, w, x)
+    y0, y1, y2 = (_qbr_coords(P, 1) for P in (P0, P1, P2))
+    w = np.asarray(w, dtype=float)[..., None]
+
+    num = (1-t)**2*y0 + 2*w*(1-t)*t*y1 + t**2*y2
+    den = (1-t)**2 + 2*w*(1-t)*t + t**2
+
+    return num / den
+
+def bezier_dydx_at_x(
+    P0: np.ndarray,
+    P1: np.ndarray,
+    P2: np.ndarray,
+    w: float | np.ndarray,
+    x: float | np.ndarray,
+) -> np.ndarray:
+    """
+    Slope `dy/dx` of a QBR curve at the given inputs, with the same batching
+    as `bezier_y_at_x()`.
+
+    Computed as `y'(t) / x'(t)`, where the shared denominator's derivative
+    cancels down to `N_y' D - N_y D'` over `N_x' D - N_x D'`.
+    """
+
+    t = bezier_t_at_x(P0, P1, P2, w, x)
+    w = np.asarray(w, dtype=float)[..., None]
+
+    den = (1-t)**2 + 2*w*(1-t)*t + t**2
+    d_den = -2*(1-t) + 2*w*(1 - 2*t) + 2*t
+
+    def num_terms(axis: int) -> tuple[np.ndarray, np.ndarray]:
+        c0, c1, c2 = (_qbr_coords(P, axis) for P in (P0, P1, P2))
+        num = (1-t)**2*c0 + 2*w*(1-t)*t*c1 + t**2*c2
+        d_num = -2*(1-t)*c0 + 2*w*(1 - 2*t)*c1 + 2*t*c2
+
+        return num, d_num
+
+    x_num, x_d_num = num_terms(0)
+    y_num, y_d_num = num_terms(1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (
+            (y_d_num*den - y_num*d_den) / (x_d_num*den - x_num*d_den)
+        )
+
+def l_maxC_h_array(
+    L: np.ndarray,
+    h: np.ndarray,
+    eps: float = 1e-6,
+    tol: float = 1e-9
+) -> np.ndarray:
+    """
+    Vectorized search for max attainable sRGB chroma across (L, h) pairs.
+
+    `L` and `h` are broadcast against each other, so a full grid can be
+    solved in one call with `L[None, :]` and `h[:, None]`. Every pair follows
+    the same bracket-and-bisect schedule as a scalar search (start at 0.1,
+    double until out of gamut, then bisect down to `eps`), but the in-gamut
+    checks are evaluated as array operations over the whole batch rather than
+    through per-probe `Color` conversions.
+
+    Parameters:
+        L: lightness values (0-100)
+        h: hue values (degrees)
+        eps: width of the final chroma bracket
+        tol: gamut tolerance on the sRGB channels
+
+    Returns:
+        Array of max in-gamut chroma values with the broadcast shape of `L`
+        and `h`
+    """
+
+    L, h = np.broadcast_arrays(
+        np.asarray(L, dtype=float),
+        np.asarray(h, dtype=float),
+    )
+    L = L / 100
+
+    def chroma_in_gamut(_c: np.ndarray) -> np.ndarray:
+        lab = oklab_from_oklch(np.stack([L, _c, h], axis=-1))
+        rgb = srgb_from_linear(linear_srgb_from_oklab(lab))
+        return np.all((rgb >= -tol) & (rgb <= 1 + tol), axis=-1)
+
+    lo = np.zeros(L.shape)
+    hi = np.full(L.shape, 0.1)
+
+    growing = chroma_in_gamut(hi)
+    while growing.any():
+        hi = np.where(growing, hi * 2, hi)
+        growing &= chroma_in_gamut(hi)
+
+    active = hi - lo > eps
+    while active.any():
+        m = (lo + hi) / 2
+        inside = chroma_in_gamut(m)
+        lo = np.where(active & inside, m, lo)
+        hi = np.where(active & ~inside, m, hi)
+        active = hi - lo > eps
+
+    return lo
 
 @cache
 def l_maxC_h(
     _l: float,
     _h: float,
-    space: str = 'srgb',
+    space: str = "srgb",
     eps: float = 1e-6,
     tol: float = 1e-9
 ) -> float:
     """
-    Binary search for max attainable OKLCH chroma at fixed lightness and hue.
+    Max attainable sRGB OKLCH chroma at fixed lightness and hue.
+
+    Scalar convenience wrapper around `l_maxC_h_array()`; prefer the array
+    form when solving more than a handful of points.
 
     Parameters:
         _l: lightness
         _h: hue
+        space: gamut to bound chroma by; only "srgb" is supported
 
     Returns:
         Max in-gamut chroma at provided lightness and hue
     """
 
-    def chroma_in_gamut(_c: float) -> bool:
-        color = Color('oklch', [_l/100, _c, _h])
-        return color.convert(space).in_gamut(tolerance=tol)
+    if space != "srgb":
+        raise ValueError(f"Unsupported gamut space '{space}'")
 
-    lo, hi = 0.0, 0.1
-    while chroma_in_gamut(hi):
-        hi *= 2
-    while hi - lo > eps:
-        m = (lo + hi) / 2
-        lo, hi = (m, hi) if chroma_in_gamut(m) else (lo, m)
-
-    return lo
+    return float(l_maxC_h_array(_l, _h, eps=eps, tol=tol))
@@ -0,0 +1,95 @@
+from functools import cache
+
+import numpy as np
+
+from monobiome.util import (
+    srgb_from_hsl,
+    linear_from_srgb,
+    oklab_from_linear_srgb,
+)
+from monobiome.cache import cache_key, cached_arrays
+from monobiome.profiling import stage
+
+# default grid steps (per hue turn and per lightness ramp) of the sRGB gamut
+# surface
+GAMUT_RESOLUTION = 48
+
+
+def grid_faces(rows: int, cols: int, wrap: bool = False) -> np.ndarray:
+    """
+    Triangles over a row-major `rows x cols` grid of vertices, two per cell.
+    With `wrap`, the last row is also joined to the first.
+
+    Returns: `(F, 3)` array of vertex indices
+    """
+
+    r = np.arange(rows if wrap else rows - 1)[:, None]
+    c = np.arange(cols - 1)[None, :]
+    k = (r * cols + c).ravel()
+    k_next = (((r + 1) % rows) * cols + c).ravel()
+
+    return np.concatenate([
+        np.stack([k, k + 1, k_next], axis=-1),
+        np.stack([k + 1, k_next + 1, k_next], axis=-1),
+    ])
+
+def render_gamut_mesh(resolution: int) -> dict[str, np.ndarray]:
+    """
+    Build the sRGB gamut surface mesh; see `gamut_mesh()`.
+
+    The surface is the fully saturated HSL cylinder (the faces of the RGB
+    cube), sampled over a grid of hues and lightnesses and converted to OKLab
+    as one array.
+    """
+
+    hues = np.linspace(0, 360, max(7, (resolution // 6) * 6 + 1))
+    lightnesses = np.linspace(1, 0, max(3, (resolution // 2) * 2 + 1))
+    HH, LL = np.meshgrid(hues, lightnesses, indexing="ij")
+
+    with stage("gamut mesh"):
+        hsl = np.stack([HH, np.ones_like(HH), LL], axis=-1).reshape(-1, 3)
+        rgb = np.clip(srgb_from_hsl(hsl), 0, 1)
+        lab = oklab_from_linear_srgb(linear_from_srgb(rgb))
+
+        faces = grid_faces(len(hues), len(lightnesses))
+        face_rgb = rgb[faces].mean(axis=1)
+
+    # 8-bit colors round half up, as coloraide's hex strings do
+    def rgb8(rgb: np.ndarray) -> np.ndarray:
+        return np.floor(rgb * 255 + 0.5).astype(np.uint8)
+
+    return {
+        "vertices": lab[:, [1, 2, 0]],
+        "faces": faces,
+        "vertex_colors": rgb8(rgb),
+        "face_colors": rgb8(face_rgb),
+    }
+
+@cache
+def gamut_mesh(
+    resolution: int = GAMUT_RESOLUTION,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Surface of the sRGB gamut in OKLab, as plotted: `(a, b, L)` coordinates,
+    i.e., OKLCH chroma and hue in the plane with lightness up.
+
+    Read from the on-disk cache when available. The mesh depends only on
+    `resolution` (and the versions in the cache key), not on the palette
+    parameters.
+
+    Returns: `(N, 3)` vertices, `(F, 3)` faces, and 8-bit sRGB vertex and
+        face colors, `(N, 3)` and `(F, 3)`
+    """
+
+    mesh = cached_arrays(
+        cache_key(b""),
+        f"gamut-mesh-r{resolution}",
+        lambda: render_gamut_mesh(resolution),
+    )
+
+    return (
+        mesh["vertices"],
+        mesh["faces"],
+        mesh["vertex_colors"],
+        mesh["face_colors"],
+    )
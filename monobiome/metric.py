@@ -0,0 +1,109 @@
+from collections.abc import Callable
+
+import numpy as np
+from coloraide import Color
+
+from monobiome.util import xyz_from_oklab, oklab_from_oklch
+
+# a metric kernel is a pair of array functions:
+#
+# 1. `features(lch)`: map an `(..., 3)` array of OKLCH coordinates (lightness
+#    on `[0, 1]`) to an `(..., F)` array of per-swatch features
+# 2. `distance(x, y)`: map broadcastable `(..., F)` feature arrays to the
+#    `(...)` array of distances between them
+#
+# features are computed once per swatch, so the pairwise work of a metric is
+# only the (vectorized) distance
+MetricKernel = tuple[
+    Callable[[np.ndarray], np.ndarray],
+    Callable[[np.ndarray, np.ndarray], np.ndarray],
+]
+
+
+def oklab_features(lch: np.ndarray) -> np.ndarray:
+    return oklab_from_oklch(lch)
+
+def oklab_distance(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Euclidean distance in OKLab; matches `util.oklch_distance()`.
+    """
+
+    diff = x - y
+
+    return (diff[..., 1]**2 + diff[..., 2]**2 + diff[..., 0]**2)**0.5
+
+def luminance_features(lch: np.ndarray) -> np.ndarray:
+    """
+    Relative luminance (XYZ D65 `Y`), clamped at 0 as in coloraide's WCAG 2.1
+    contrast.
+    """
+
+    xyz = xyz_from_oklab(oklab_from_oklch(lch))
+
+    return np.maximum(xyz[..., 1:2], 0)
+
+def wcag_contrast_ratio(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    WCAG 2.1 contrast ratio between luminances; matches
+    `util.wcag_contrast()`.
+    """
+
+    x, y = x[..., 0], y[..., 0]
+
+    return (np.maximum(x, y) + 0.05) / (np.minimum(x, y) + 0.05)
+
+def lightness_features(lch: np.ndarray) -> np.ndarray:
+    return np.asarray(lch, dtype=float)[..., :1]
+
+def lightness_difference(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Absolute (percent) lightness difference; matches
+    `util.lightness_distance()`.
+    """
+
+    return np.abs(x[..., 0] - y[..., 0]) * 100
+
+def pairwise_kernel(metric: Callable[[Color, Color], float]) -> MetricKernel:
+    """
+    Wrap a `Color` pair function as a metric kernel.
+
+    Features are `Color` objects and distances are evaluated pair by pair, so
+    this is only as fast as `metric` itself. Useful for trying out a metric
+    (e.g., `lambda x, y: x.delta_e(y, method="2000")`) before writing an
+    array version.
+    """
+
+    metric_ufunc = np.frompyfunc(metric, 2, 1)
+
+    def features(lch: np.ndarray) -> np.ndarray:
+        lch = np.asarray(lch, dtype=float)
+        colors = np.empty((*lch.shape[:-1], 1), dtype=object)
+        for idx in np.ndindex(lch.shape[:-1]):
+            colors[(*idx, 0)] = Color("oklch", lch[idx].tolist())
+
+        return colors
+
+    def distance(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        return metric_ufunc(x[..., 0], y[..., 0]).astype(float)
+
+    return features, distance
+
+metric_kernel_map: dict[str, MetricKernel] = {
+    "oklch": (oklab_features, oklab_distance),
+    "wcag": (luminance_features, wcag_contrast_ratio),
+    "lightness": (lightness_features, lightness_difference),
+}
+
+def register_metric(
+    name: str,
+    features: Callable[[np.ndarray], np.ndarray],
+    distance: Callable[[np.ndarray, np.ndarray], np.ndarray],
+) -> None:
+    """
+    Register a metric kernel under `name`, making it available to scheme
+    generation (and the CLI's `--metric` option, if registered before the
+    parser is created). Distances are memoized by metric name, so register
+    before first use.
+    """
+
+    metric_kernel_map[name] = (features, distance)
@@ -3,57 +3,183 @@ from typing import Any
 from functools import cache
 from importlib.metadata import version
 
-from coloraide import Color
+import numpy as np
 
+from monobiome import constants
 from monobiome.util import (
     hex_from_rgb8,
-    srgb8_from_color,
+    srgb8_from_oklch,
 )
+from monobiome.cache import cache_key, cached_arrays
 from monobiome.constants import (
     h_map,
-    L_points,
-    Lpoints_Cstar_Hmap,
+    h_array,
+    compute_curves,
+    lightness_grid,
 )
+from monobiome.profiling import stage
 
 
+def lightness_key(L: int | float) -> str:
+    """
+    Palette file key for a lightness level: `l20` for whole levels, and
+    `l20_25` for fractional ones (a "." would read as a nested TOML table).
+    """
+
+    return f"l{L}".replace(".", "_")
+
+def render_hlc_array(notation: str, resolution: float = 1) -> np.ndarray:
+    """
+    Render every palette swatch as a color string in the given notation.
+
+    Returns: `(H, L)` string array, with hue rows in `h_map` order and columns
+        across `lightness_grid(resolution)`
+    """
+
+    if notation not in ("hex", "oklch"):
+        raise ValueError(f"Unsupported color notation '{notation}'")
+
+    L_grid = lightness_grid(resolution)
+    Lpoints_Cstar = np.asarray(compute_curves(resolution)["Lpoints_Cstar"])
+    H, L = Lpoints_Cstar.shape
+    lch = np.stack(
+        [
+            np.broadcast_to(np.asarray(L_grid) / 100, (H, L)),
+            Lpoints_Cstar,
+            np.broadcast_to(h_array[:, None], (H, L)),
+        ],
+        axis=-1,
+    )
+
+    with stage("palette render"):
+        if notation == "hex":
+            hlc_rows = [
+                [hex_from_rgb8(rgb8) for rgb8 in lc_row]
+                for lc_row in srgb8_from_oklch(lch)
+            ]
+        else:
+            # enough decimals to round-trip the grid's lightness levels
+            l_digits = max(1, len(f"{resolution:g}".partition(".")[2]))
+            hlc_rows = [
+                [
+                    f"oklch({ol*100:.{l_digits}f}% {oc:.4f} {oh:.1f})"
+                    for ol, oc, oh in lc_row
+                ]
+                for lc_row in lch.tolist()
+            ]
+
+    return np.array(hlc_rows)
+
 @cache
-def compute_hlc_map(notation: str) -> dict[str, Any]:
-    hlc_map = {}
-
-    for h_str, Lpoints_Cstar in Lpoints_Cstar_Hmap.items():
-        _h = h_map[h_str]
-        hlc_map[h_str] = {}
-        
-        for _l, _c in zip(L_points, Lpoints_Cstar, strict=True):
-            oklch = Color('oklch', [_l/100, _c, _h])
-
-            if notation == "hex":
-                rgb8 = srgb8_from_color(oklch)
-                c_str = hex_from_rgb8(rgb8)
-            elif notation == "oklch":
-                ol, oc, oh = oklch.convert('oklch').coords()
-                c_str = f"oklch({ol*100:.1f}% {oc:.4f} {oh:.1f})"
-            
-            hlc_map[h_str][_l] = c_str
+def compute_hlc_map(notation: str, resolution: float = 1) -> dict[str, Any]:
+    """
+    Palette color strings by hue name and lightness, read from the on-disk
+    cache when available.
+
+    {
+        "alpine": { 10: "#030303", 11: "#040404", ... },
+        ...
+    }
+
+    Lightness keys are the levels of `lightness_grid(resolution)`, e.g.,
+    `10, 10.25, 10.5, ...` for `resolution=0.25`.
+    """
+
+    if notation not in ("hex", "oklch"):
+        raise ValueError(f"Unsupported color notation '{notation}'")
+
+    entry_name = f"hlc-{notation}"
+    if resolution != 1:
+        entry_name += f"-r{resolution}"
+
+    hlc_array = cached_arrays(
+        cache_key(constants.parameters_bytes),
+        entry_name,
+        lambda: {"colors": render_hlc_array(notation, resolution)},
+    )["colors"]
+
+    L_grid = lightness_grid(resolution)
+
+    return {
+        h_str: dict(zip(L_grid, lc_row, strict=True))
+        for h_str, lc_row in zip(h_map, hlc_array.tolist(), strict=True)
+    }
+
+@cache
+def compute_swatch_table(
+    notation: str,
+    resolution: float = 1,
+) -> list[list[str]]:
+    """
+    Palette color strings as nested lists, indexed by hue row (in `h_map`
+    order) then level of `lightness_grid(resolution)`.
+    """
+
+    return [
+        list(lc_map.values())
+        for lc_map in compute_hlc_map(notation, resolution).values()
+    ]
+
+@cache
+def compute_palette_dict(
+    notation: str,
+    resolution: float = 1,
+) -> dict[str, Any]:
+    """
+    The palette as a template fill dictionary, matching the structure of a
+    parsed palette file:
+
+    {
+        "version": "1.5.5",
+        "alpine": { "l10": "#030303", "l11": "#040404", ... },
+        ...
+    }
+    """
+
+    palette_dict = {"version": version("monobiome")}
+    for h_str, lc_map in compute_hlc_map(notation, resolution).items():
+        palette_dict[h_str] = {
+            lightness_key(_l): _c for _l, _c in lc_map.items()
+        }
+
+    return palette_dict
+
+@cache
+def compute_oklch_array(resolution: float = 1) -> np.ndarray:
+    """
+    OKLCH coordinates of the palette swatches as an `(H, L, 3)` array, with
+    hue rows in `h_map` order and lightness on coloraide's `[0, 1]` scale.
+
+    Coordinates are read back from the "oklch" notation strings, so they carry
+    the same rounding as the exported palette (and match `Color` objects
+    parsed from it).
+    """
+
+    def parse_oklch(c_str: str) -> tuple[float, float, float]:
+        _l, _c, _h = c_str.removeprefix("oklch(").removesuffix(")").split()
+        return float(_l.removesuffix("%")) * 0.01, float(_c), float(_h)
 
-    return hlc_map
+    return np.array([
+        [parse_oklch(c_str) for c_str in lc_map.values()]
+        for lc_map in compute_hlc_map("oklch", resolution).values()
+    ])
 
 def generate_palette(
     notation: str,
     file_format: str,
+    resolution: float = 1,
 ) -> str:
     mb_version = version("monobiome")
-    hlc_map = compute_hlc_map(notation)
+    hlc_map = compute_hlc_map(notation, resolution)
             
     if file_format == "json":
-        hlc_map["version"] = mb_version
-        return json.dumps(hlc_map, indent=4)
+        return json.dumps({**hlc_map, "version": mb_version}, indent=4)
     else:
         toml_lines = [f"version = \"{mb_version}\"", ""]
         for _h, _lc_map in hlc_map.items():
             toml_lines.append(f"[{_h}]")
             for _l, _c in _lc_map.items():
-                toml_lines.append(f'l{_l} = "{_c}"')
+                toml_lines.append(f'{lightness_key(_l)} = "{_c}"')
             toml_lines.append("")
 
         return "\n".join(toml_lines)
@@ -1,21 +1,26 @@
+from pathlib import Path
 from importlib.metadata import version
 
 import numpy as np
 import matplotlib.pyplot as plt
-from coloraide import Color
+from PIL import Image
 from matplotlib.collections import LineCollection
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 
-from monobiome.util import srgb8_from_color
-from monobiome.palette import compute_hlc_map
+from monobiome import constants
+from monobiome.util import (
+    srgb_from_oklch,
+    oklab_from_oklch,
+    srgb8_from_strings,
+)
+from monobiome.gamut import gamut_mesh, GAMUT_RESOLUTION
+from monobiome.palette import compute_hlc_map, compute_oklch_array
 from monobiome.constants import (
     h_map,
     L_space,
     L_points,
     accent_h_map,
     monotone_h_map,
-    Lspace_Cmax_Hmap,
-    max_Cstar_Horder,
-    Lpoints_Cstar_Hmap,
 )
 
 VERSION = version("monobiome")
@@ -31,6 +36,9 @@ def plot_hue_chroma_bounds() -> tuple[plt.Figure, plt.Axes]:
         figsize=(4, 10)
     )
 
+    Lspace_Cmax_Hmap = constants.Lspace_Cmax_Hmap
+    Lpoints_Cstar_Hmap = constants.Lpoints_Cstar_Hmap
+
     for i, h_str in enumerate(Lpoints_Cstar_Hmap):
         _h = h_map[h_str]
 
@@ -80,25 +88,25 @@ def plot_hue_chroma_star() -> tuple[plt.Figure, plt.Axes]:
     # uncomment to preview just the 5 core term colors
     # colors = set(["red", "orange", "yellow", "green", "blue"])
 
-    for h_str, _ in max_Cstar_Horder:
-        Lpoints_Cstar = Lpoints_Cstar_Hmap[h_str]
+    for h_str, _ in constants.max_Cstar_Horder:
+        Lpoints_Cstar = constants.Lpoints_Cstar_Hmap[h_str]
 
         if h_str not in accent_h_map or h_str not in colors:
             continue
 
         _h = h_map[h_str]
-        h_colors = [
-            Color(
-                'oklch', [_l/100, _c, _h]
-            ).convert("srgb").fit(method="oklch-chroma")
-            for _l, _c in zip(L_points, Lpoints_Cstar, strict=True)
-        ]
+        rgb = srgb_from_oklch(
+            np.column_stack([
+                np.asarray(L_points) / 100,
+                Lpoints_Cstar,
+                np.full(len(L_points), _h),
+            ])
+        )
         
         x = np.asarray(L_points)
         y = np.asarray(Lpoints_Cstar)
         pts = np.column_stack([x, y]).reshape(-1, 1, 2)
         segs = np.concatenate([pts[:-1], pts[1:]], axis=1)
-        rgb = np.asarray(h_colors)
         seg_colors = (rgb[:-1] + rgb[1:]) / 2
         lc = LineCollection(segs, colors=seg_colors, linewidth=3,
                             capstyle="round", joinstyle="round",
@@ -114,35 +122,101 @@ def plot_hue_chroma_star() -> tuple[plt.Figure, plt.Axes]:
 
     return fig, ax
 
+def plot_gamut_trajectories(
+    mesh_resolution: int = GAMUT_RESOLUTION,
+    alpha: float = 0.15,
+) -> tuple[plt.Figure, plt.Axes]:
+    """
+    Palette curves as trajectories through the sRGB gamut surface in OKLab,
+    on a 3D axis to rotate interactively (see `gamut.gamut_mesh()`).
+    """
+
+    vertices, faces, _, face_colors = gamut_mesh(mesh_resolution)
+
+    fig = plt.figure(figsize=(8, 8))
+    ax = fig.add_subplot(projection="3d")
+
+    surface = Poly3DCollection(
+        vertices[faces],
+        facecolors=np.column_stack([
+            face_colors / 255,
+            np.full(len(faces), alpha),
+        ]),
+        linewidths=0,
+    )
+    ax.add_collection3d(surface)
+
+    oklch_array = compute_oklch_array()
+    for h_str, lch in zip(h_map, oklch_array, strict=True):
+        _l, _a, _b = oklab_from_oklch(lch).T
+        ax.plot(_a, _b, _l, color="black", linewidth=0.5)
+        ax.scatter(
+            _a, _b, _l,
+            c=srgb_from_oklch(lch),
+            s=6,
+            depthshade=False,
+            label=h_str,
+        )
+
+    lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+    ax.set(xlim=(lo[0], hi[0]), ylim=(lo[1], hi[1]), zlim=(lo[2], hi[2]))
+    ax.set_box_aspect(hi - lo)
+    ax.set_xlabel("a")
+    ax.set_ylabel("b")
+    ax.set_zlabel("L")
+
+    plt.suptitle(f"Palette trajectories in OKLab (v{VERSION})")
+
+    return fig, ax
+
 def palette_image(
     palette: dict[str, dict[int, str]],
     cell_size: int = 40,
     keys: list[str] | None = None
 ) -> tuple[np.ndarray, list[str], list[list[int]]]:
+    """
+    Rasterize a palette as an `(rows, cols, 3)` uint8 image, with a
+    `cell_size` square per swatch. Rows follow `keys` (all palette hues by
+    default), with swatches ordered by lightness; rows shorter than the
+    longest are padded with (near) black.
+
+    All swatches are converted in one pass (see `srgb8_from_strings()`) into
+    a grid of cells, which is then scaled up to pixels.
+    """
+
     names = list(palette.keys()) if keys is None else keys
-        
-    row_count = len(names)
-    col_counts = [len(palette[n]) for n in names]
-    max_cols = max(col_counts)
-
-    h = row_count * cell_size
-    w = max_cols * cell_size
-    img = np.ones((h, w, 3), int)
-
-    lightness_keys_per_row = []
-
-    for r, name in enumerate(names):
-        shades = palette[name]
-        lkeys = sorted(shades.keys())
-        lightness_keys_per_row.append(lkeys)
-        for c, k in enumerate(lkeys):
-            rgb = srgb8_from_color(shades[k])
-            r0, r1 = r * cell_size, (r + 1) * cell_size
-            c0, c1 = c * cell_size, (c + 1) * cell_size
-            img[r0:r1, c0:c1, :] = rgb
+    lightness_keys_per_row = [sorted(palette[n].keys()) for n in names]
+    col_counts = [len(lkeys) for lkeys in lightness_keys_per_row]
+
+    rgb8 = srgb8_from_strings([
+        palette[n][k]
+        for n, lkeys in zip(names, lightness_keys_per_row, strict=True)
+        for k in lkeys
+    ])
+
+    cells = np.ones((len(names), max(col_counts), 3), np.uint8)
+    rows = np.repeat(np.arange(len(names)), col_counts)
+    cols = np.concatenate([np.arange(n) for n in col_counts])
+    cells[rows, cols] = rgb8
+
+    img = cells.repeat(cell_size, axis=0).repeat(cell_size, axis=1)
 
     return img, names, lightness_keys_per_row
 
+def save_palette_image(
+    palette: dict[str, dict[int, str]],
+    path: Path,
+    cell_size: int = 40,
+    keys: list[str] | None = None,
+) -> None:
+    """
+    Write an unlabeled palette image (see `palette_image()`) straight to a
+    PNG, pixel for pixel, without going through a matplotlib figure.
+    """
+
+    img, _, _ = palette_image(palette, cell_size, keys=keys)
+    Image.fromarray(img).save(path)
+
 def show_palette(
     palette: dict[str, dict[int, str]],
     cell_size: int = 40,
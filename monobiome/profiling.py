@@ -0,0 +1,96 @@
+import sys
+import pstats
+import logging
+import cProfile
+from time import perf_counter
+from pathlib import Path
+from contextlib import contextmanager
+from collections import Counter
+from collections.abc import Iterator
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# cumulative wall time and entry count per stage, and named event counters,
+# in first-seen order
+stage_times: dict[str, float] = {}
+stage_calls: Counter[str] = Counter()
+counters: Counter[str] = Counter()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block as pipeline stage `name`.
+
+    Times accumulate across entries. Stages may nest, in which case the outer
+    stage's time includes the inner's. Also usable as a function decorator.
+    """
+
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = perf_counter() - start
+        stage_times[name] = stage_times.get(name, 0.0) + elapsed
+        stage_calls[name] += 1
+        logger.debug(f"Stage '{name}' took {elapsed*1e3:.3f}ms")
+
+def count(name: str, n: int = 1) -> None:
+    """
+    Increment event counter `name` by `n`.
+    """
+
+    counters[name] += n
+
+def reset() -> None:
+    stage_times.clear()
+    stage_calls.clear()
+    counters.clear()
+
+def stage_report() -> str:
+    """
+    Format the recorded stage times and counters as a table.
+    """
+
+    lines = [f"{'stage':<24} {'calls':>7} {'total (ms)':>12}"]
+    for name, total in stage_times.items():
+        lines.append(f"{name:<24} {stage_calls[name]:>7} {total*1e3:>12.3f}")
+
+    if counters:
+        lines += ["", f"{'counter':<24} {'count':>20}"]
+        for name, n in counters.items():
+            lines.append(f"{name:<24} {n:>20,}")
+
+    return "\n".join(lines)
+
+@contextmanager
+def profiled(dump_file: Path | None = None) -> Iterator[None]:
+    """
+    Profile the enclosed block, printing a per-stage breakdown to stderr on
+    exit. Stages already recorded (e.g., the parameter load at import) are
+    included in the breakdown.
+
+    If `dump_file` is given, the block also runs under `cProfile`, with stats
+    written to `dump_file` for inspection with `pstats` (or tools like
+    snakeviz). Only stages run in this process are recorded, i.e., not those
+    in `build --jobs` workers.
+    """
+
+    profiler = cProfile.Profile() if dump_file else None
+
+    start = perf_counter()
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+        elapsed = perf_counter() - start
+
+        print(stage_report(), file=sys.stderr)
+        print(f"\ntotal: {elapsed*1e3:.3f}ms", file=sys.stderr)
+
+        if profiler:
+            pstats.Stats(profiler).dump_stats(dump_file)
+            print(f"Wrote profile stats to {dump_file}", file=sys.stderr)
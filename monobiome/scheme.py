@@ -1,32 +1,230 @@
+import logging
+from bisect import bisect_left
+from typing import Any
 from functools import cache
-from collections.abc import Callable
+from dataclasses import dataclass
 from importlib.metadata import version
 
+import numpy as np
 from coloraide import Color
 
-from monobiome.util import oklch_distance
-from monobiome.palette import compute_hlc_map
+from monobiome.metric import metric_kernel_map
+from monobiome.palette import (
+    lightness_key,
+    compute_hlc_map,
+    compute_oklch_array,
+    compute_swatch_table,
+)
 from monobiome.constants import (
+    h_map,
+    h_array,
+    cstar_at,
+    L_points,
     accent_h_map,
+    compute_curves,
+    lightness_grid,
     monotone_h_map,
+    lightness_value,
+    lightness_grid_index,
 )
+from monobiome.profiling import count, stage
+
+VERSION = version("monobiome")
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# default scheme role -> palette accent assignments for each scheme section
+full_color_map = {
+    "red": "red",
+    "orange": "orange",
+    "yellow": "yellow",
+    "green": "green",
+    "cyan": "cyan",
+    "blue": "blue",
+    "violet": "violet",
+    "magenta": "magenta",
+}
+term_color_map = {
+    "red": "red",
+    "yellow": "yellow",
+    "green": "green",
+    "cyan": "blue",
+    "blue": "blue",
+    "magenta": "orange",
+}
+vim_color_map = {
+    "red": "red",
+    "orange": "orange",
+    "yellow": "yellow",
+    "green": "green",
+    "cyan": "green",
+    "blue": "blue",
+    "violet": "blue",
+    "magenta": "red",
+}
+# vim_color_map = full_color_map
+
+# distance evaluations per chunk of monotone levels in
+# `solve_accent_intersections()`, bounding its intermediate arrays
+CHUNK_SIZE = 1 << 20
+
+
+@cache
+def compute_color_map() -> dict[str, list[Color]]:
+    """
+    `Color` objects for every palette swatch, parsed from the oklch notation.
+    """
+
+    color_map = {
+        c_name: [Color(c_str) for c_str in c_str_dict.values()]
+        for c_name, c_str_dict in compute_hlc_map("oklch").items()
+    }
+    count("Color objects", sum(map(len, color_map.values())))
+
+    return color_map
 
+@cache
+def compute_swatch_features(
+    metric: str = "oklch",
+    resolution: float = 1,
+) -> np.ndarray:
+    """
+    Per-swatch features for a metric's kernel (see `monobiome.metric`), as an
+    `(H, L, F)` array across `lightness_grid(resolution)`.
+    """
+
+    if metric not in metric_kernel_map:
+        raise ValueError(f"Unknown metric '{metric}'")
+    features, _ = metric_kernel_map[metric]
+
+    return features(compute_oklch_array(resolution))
+
+@cache
+def compute_distance_tensor(metric: str = "oklch") -> np.ndarray:
+    """
+    Distances between every monotone swatch and every accent swatch.
+
+    Computed with the metric's kernel: features are derived once per swatch,
+    and distances in a single broadcast over all (monotone, accent) swatch
+    pairs. Covers the whole-number grid `L_points` only; at finer resolutions
+    the tensor grows with the square of the grid size.
+
+    Returns: array of shape `(M, L, A, L)`, indexed as
+        `[monotone, monotone L, accent, accent L]` in `monotone_h_map` and
+        `accent_h_map` order
+    """
+
+    swatch_features = compute_swatch_features(metric)
+    _, distance = metric_kernel_map[metric]
+
+    n_M = len(monotone_h_map)
+    n_L = len(L_points)
+    count("distance evaluations", n_M * n_L * len(accent_h_map) * n_L)
+
+    with stage("distance tensor"):
+        return distance(
+            swatch_features[:n_M, :, None, None],
+            swatch_features[None, None, n_M:],
+        )
+
+@cache
+def compute_distance_index(
+    metric: str = "oklch"
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sort each monotone swatch's accent levels by distance.
+
+    This is the threshold sweep API over the integer grid (`L_points`): it
+    holds every (monotone, accent) pair, so its cost grows with the square of
+    the grid. Schemes are solved from `solve_accent_levels()` instead, which
+    only computes distances for the requested levels at any resolution.
+
+    Finding the nearest accent at or beyond a threshold then reduces to a
+    binary search on each sorted row, so any number of thresholds can be
+    queried against one index. Sorting is stable, so equidistant levels keep
+    ascending lightness order.
+
+    Returns: `(sorted_dists, order)`, both of shape `(M, L, A, L)`, where
+        `order[m, l, a]` holds accent lightness indices (into `L_points`) in
+        order of increasing distance and `sorted_dists[m, l, a]` holds the
+        matching distances
+    """
+
+    dists = compute_distance_tensor(metric)
+    with stage("distance index"):
+        order = np.argsort(dists, axis=-1, kind="stable")
+        sorted_dists = np.take_along_axis(dists, order, axis=-1)
+
+    return sorted_dists, order.astype(np.int16)
+
+def search_sorted_rows(rows: np.ndarray, v: float) -> np.ndarray:
+    """
+    Row-wise `bisect_left`: index of the first element `>= v` in each sorted
+    row of `rows` (the row length if there is none).
+    """
+
+    n = rows.shape[-1]
+    lo = np.zeros(rows.shape[:-1], dtype=np.intp)
+    hi = np.full(rows.shape[:-1], n, dtype=np.intp)
+
+    while (active := lo < hi).any():
+        mid = (lo + hi) // 2
+        mid_vals = np.take_along_axis(
+            rows, np.minimum(mid, n - 1)[..., None], axis=-1
+        )[..., 0]
+        below = mid_vals < v
+        lo = np.where(active & below, mid + 1, lo)
+        hi = np.where(active & ~below, mid, hi)
+
+    return lo
+
+def query_accent_levels(
+    m_name: str,
+    mL: int,
+    dT: float,
+    metric: str = "oklch",
+) -> dict[str, int]:
+    """
+    Lightness of the nearest accent shade at or beyond `dT` from a single
+    monotone shade, for each accent. Accents with no shade meeting the
+    threshold are omitted.
+
+    Each accent is a single `bisect` against the precomputed distance index,
+    making this cheap enough to sweep thresholds interactively.
+    """
+
+    sorted_dists, order = compute_distance_index(metric)
+    mi = list(monotone_h_map).index(m_name)
+    li = L_points.index(mL)
+
+    accent_levels = {}
+    for ai, a_name in enumerate(accent_h_map):
+        a_dists = sorted_dists[mi, li, ai]
+        oi = bisect_left(a_dists, dT)
+        if oi < len(a_dists):
+            accent_levels[a_name] = L_points[order[mi, li, ai, oi]]
+
+    return accent_levels
 
 @cache
 def compute_dma_map(
     dT: float,
-    metric: Callable | None = None
+    metric: str = "oklch",
 ) -> dict[str, dict]:
     """
     For threshold `dT`, compute the nearest accent shades that exceed that
     threshold for every monotone shade.
 
+    Answered from the distance index: each (monotone, L, accent) row is
+    bisected for `dT` in one vectorized search, with ties resolving to the
+    lowest accent lightness.
+
     Returns: map of minimum constraint satisfying accent colors for monotone
         spectra
 
         {
             "alpine": {
-                "oklch( ... )": {
+                20: {
                     "red": *nearest oklch >= dT from M base*,
                     ...
                 },
@@ -36,161 +234,482 @@ def compute_dma_map(
         }
     """
 
-    if metric is None:
-        metric = oklch_distance
-    
-    oklch_hlc_map = compute_hlc_map("oklch")
-    oklch_color_map = {
-        c_name: [Color(c_str) for c_str in c_str_dict.values()]
-        for c_name, c_str_dict in oklch_hlc_map.items()
-    }
-    
+    sorted_dists, order = compute_distance_index(metric)
+    with stage("distance search"):
+        pos = search_sorted_rows(sorted_dists, dT)
+
+        # make sure the current monotone level has *all* accents; o/w ignore
+        valid = pos < sorted_dists.shape[-1]
+        complete = valid.all(axis=-1)
+        nearest = np.take_along_axis(
+            order, np.where(valid, pos, 0)[..., None], axis=-1
+        )[..., 0]
+
+    oklch_color_map = compute_color_map()
+    accent_colors = [oklch_color_map[a_name] for a_name in accent_h_map]
+
     dT_mL_acol_map = {}
-    for m_name in monotone_h_map:
-        mL_acol_map = {}
-        m_colors = oklch_color_map[m_name]
-        
-        for m_color in m_colors:
-            acol_min_map = {}
-            
-            for a_name in accent_h_map:
-                a_colors = oklch_color_map[a_name]
-                oklch_dists = filter(
-                    lambda d: (d[1] - dT) >= 0,
-                    [
-                        (ac, metric(m_color, ac))
-                        for ac in a_colors
-                    ]
+    for mi, m_name in enumerate(monotone_h_map):
+        dT_mL_acol_map[m_name] = {
+            mL: {
+                a_name: a_colors[ai]
+                for a_name, a_colors, ai in zip(
+                    accent_h_map,
+                    accent_colors,
+                    nearest[mi, li].tolist(),
+                    strict=True,
                 )
-                oklch_dists = list(oklch_dists)
-                if oklch_dists:
-                    min_a_color = min(oklch_dists, key=lambda t: t[1])[0]
-                    acol_min_map[a_name] = min_a_color
-    
-            # make sure the current monotone level has *all* accents; o/w
-            # ignore
-            if len(acol_min_map) < len(accent_h_map):
-                continue
-
-            mL = m_color.coords()[0]
-            mL_acol_map[int(mL*100)] = acol_min_map
-        dT_mL_acol_map[m_name] = mL_acol_map
+            }
+            for li, mL in enumerate(L_points)
+            if complete[mi, li]
+        }
 
     return dT_mL_acol_map
 
-def generate_scheme_groups(
-    mode: str,
-    biome: str,
+def _bracket_crossings(
+    swatch_features: np.ndarray,
+    curve_features: np.ndarray,
+    lis: np.ndarray,
+    dT: float,
     metric: str,
-    distance: float,
-    l_base: int,
-    l_step: int,
-    fg_gap: int,
-    grey_gap: int,
-    term_fg_gap: int,
-    accent_color_map: dict[str, str],
-) -> tuple[list[tuple[str, str]], ...]:
+) -> tuple[np.ndarray, ...]:
+    # grid brackets for `solve_accent_intersections()` at monotone levels
+    # `lis`, each array of shape `(M, |lis|, A)`
+    _, distance_func = metric_kernel_map[metric]
+    n_M = len(monotone_h_map)
+    n_L = swatch_features.shape[1]
+
+    def grid_distances(features: np.ndarray) -> np.ndarray:
+        return distance_func(
+            features[:n_M, lis, None, None],
+            features[None, None, n_M:],
+        )
+
+    swatch_dists = grid_distances(swatch_features)
+    beyond = swatch_dists >= dT
+    found = beyond.any(axis=-1)
+    nearest = np.where(beyond, swatch_dists, np.inf).argmin(axis=-1)
+    del swatch_dists, beyond
+
+    dists = grid_distances(curve_features)
+
+    # interpolated position of the crossing from `level` toward each
+    # neighbor, as a fraction of the step; `inf` where the neighbor doesn't
+    # bracket one
+    def crossing(level: np.ndarray, step: int) -> tuple[np.ndarray, ...]:
+        neighbor = np.clip(level + step, 0, n_L - 1)
+        d_level = np.take_along_axis(dists, level[..., None], -1)[..., 0]
+        d_nb = np.take_along_axis(dists, neighbor[..., None], -1)[..., 0]
+        valid = (neighbor != level) & ((d_level >= dT) != (d_nb >= dT))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = (d_level - dT) / (d_level - d_nb)
+        frac = np.where(valid, frac, np.inf)
+        return frac, level, neighbor, d_level, d_nb
+
+    # bracket at the nearest swatch, or where rounding moved that a level or
+    # more from the crossing, at the unrounded curve's nearest level
+    curve_nearest = np.where(dists >= dT, dists, np.inf).argmin(axis=-1)
+    candidates = [
+        crossing(level, step)
+        for level in (nearest, curve_nearest)
+        for step in (-1, 1)
+    ]
+
+    # fallback brackets rank after any at the nearest swatch
+    frac = np.stack([c[0] for c in candidates])
+    frac[2:] += 1
+    best = frac.argmin(axis=0)
+    bracketed = found & np.isfinite(frac.min(axis=0))
+
+    return (
+        found,
+        nearest,
+        bracketed,
+        *(np.choose(best, [c[i] for c in candidates]) for i in range(1, 5)),
+    )
+
+def solve_accent_intersections(
+    dT: float,
+    metric: str = "oklch",
+    resolution: float = 1,
+    l_levels: list[float] | None = None,
+    tol: float = 1e-9,
+) -> tuple[np.ndarray, np.ndarray]:
     """
-    Parameters:
-        mode: one of ["dark", "light"]
-        biome: biome setting
-        metric: one of ["wcag", "oklch", "lightness"]
+    Lightness at which the sphere of radius `dT` around monotone swatches
+    meets each accent's continuous chroma curve (see `cstar_at()`), along
+    with the nearest grid swatch at or beyond `dT`.
+
+    Spheres are centered at every monotone swatch at `l_levels` (all of
+    `lightness_grid(resolution)` by default). As for `solve_accent_levels()`,
+    distances are only computed from those levels, so requesting a few keeps
+    the cost linear in the grid size; levels are processed in chunks of
+    `CHUNK_SIZE` distance evaluations to bound memory.
+
+    The nearest swatches are chosen as in `compute_dma_map()` and
+    `solve_accent_levels()`, from the palette's (rounded) swatches. Each
+    crossing is bracketed between the nearest swatch's level and a neighbor
+    on the other side of `dT` (the one with the nearer interpolated crossing,
+    if both are), with distances taken along the unrounded curves so that
+    brackets agree with the refinement. Every bracket is then refined at once
+    with Illinois (modified regula falsi) steps, which need only a handful of
+    curve evaluations per pair to reach `tol`.
+
+    Returns: `(L_exact, L_nearest)`, both of shape `(M, |l_levels|, A)` and
+        indexed as `[monotone, monotone level, accent]`. `L_nearest` is NaN
+        where no accent swatch reaches `dT`, and `L_exact` is NaN where no
+        crossing is bracketed
     """
 
-    metric_map = {
-        "wcag": lambda mc,ac: ac.contrast(mc, method='wcag21'),
-        "oklch": oklch_distance,
-        "lightness": lambda mc,ac: abs(mc.coords()[0]-ac.coords()[0])*100,
-    }
-    
-    metric_func = metric_map[metric]
-    dT_mL_acol_map = compute_dma_map(distance, metric=metric_func)
-    Lma_map = {
-        m_name: mL_acol_dict[l_base]
-        for m_name, mL_acol_dict in dT_mL_acol_map.items()
-        if l_base in mL_acol_dict
-    }
-    
-    # the `mL_acol_dict` only includes lightnesses where all accent colors were
-    # within threshold. Coverage here will be partial if, at the `mL`, there is
-    # some monotone base that doesn't have all accents within threshold. This
-    # can happen at the edge, e.g., alpine@L15 has all accents w/in the
-    # distance, but the red accent was too far under tundra@L15, so there's no
-    # entry. This particular case is fairly rare; it's more likely that *all*
-    # monotones are undefined. Either way, both such cases lead to partial
-    # scheme coverage.
-    if len(Lma_map) < len(monotone_h_map):
-        print(f"Warning: partial scheme coverage for {l_base=}@{distance=}")
-    if biome not in Lma_map:
-        print(f"Biome {biome} unable to meet {metric} constraints")
-    accent_colors = Lma_map.get(biome, {})
-    
-    meta_pairs = [
-        ("version", version("monobiome")),
-        ("mode", mode),
-        ("biome", biome),
-        ("metric", metric),
-        ("distance", str(distance)),
-        ("l_base", str(l_base)),
-        ("l_step", str(l_step)),
-        ("fg_gap", str(fg_gap)),
-        ("grey_gap", str(grey_gap)),
-        ("term_fg_gap", str(term_fg_gap)),
-    ]
+    if metric not in metric_kernel_map:
+        raise ValueError(f"Unknown metric '{metric}'")
+    features, distance_func = metric_kernel_map[metric]
+    L_grid = np.asarray(lightness_grid(resolution), dtype=float)
 
-    # note how selection_bg steps up by `l_step`, selection_fg steps down by
-    # `l_step` (from their respective bases)
-    term_pairs = [
-        ("background", f"f{{{{{biome}.l{l_base}}}}}"),
-        ("selection_bg", f"f{{{{{biome}.l{l_base+l_step}}}}}"),
-        ("selection_fg", f"f{{{{{biome}.l{l_base+term_fg_gap-l_step}}}}}"),
-        ("foreground", f"f{{{{{biome}.l{l_base+term_fg_gap}}}}}"),
-        ("cursor", f"f{{{{{biome}.l{l_base+term_fg_gap-l_step}}}}}"),
-        ("cursor_text", f"f{{{{{biome}.l{l_base+l_step}}}}}"),
-    ]
+    if l_levels is None:
+        lis = np.arange(len(L_grid))
+    else:
+        lis = np.array([
+            lightness_grid_index(mL, resolution) for mL in l_levels
+        ])
 
-    monotone_pairs = []
-    monotone_pairs += [
-        (f"bg{i}", f"f{{{{{biome}.l{l_base+i*l_step}}}}}")
-        for i in range(4)
-    ]
-    monotone_pairs += [
-        (f"fg{3-i}", f"f{{{{{biome}.l{fg_gap+l_base+i*l_step}}}}}")
-        for i in range(4)
-    ]
- 
-    accent_pairs = [
-        ("black", f"f{{{{{biome}.l{l_base}}}}}"),
-        ("grey", f"f{{{{{biome}.l{l_base+grey_gap}}}}}"),
-        ("white", f"f{{{{{biome}.l{l_base+term_fg_gap-2*l_step}}}}}"),
-    ]
-    for color_name, mb_accent in accent_color_map.items():
-        aL = int(100*accent_colors[mb_accent].coords()[0])
-        accent_pairs.append(
-            (
-                color_name,
-                f"f{{{{{mb_accent}.l{aL}}}}}"
+    n_M = len(monotone_h_map)
+    n_A = len(accent_h_map)
+    n_L = len(L_grid)
+    count("distance evaluations", 2 * n_M * len(lis) * n_A * n_L)
+
+    swatch_features = compute_swatch_features(metric, resolution)
+    Lpoints_Cstar = compute_curves(resolution)["Lpoints_Cstar"]
+    curve_features = features(np.stack(
+        np.broadcast_arrays(L_grid / 100, Lpoints_Cstar, h_array[:, None]),
+        axis=-1,
+    ))
+
+    chunk = max(1, CHUNK_SIZE // (n_M * n_A * n_L))
+    with stage("distance search"):
+        chunks = [
+            _bracket_crossings(
+                swatch_features,
+                curve_features,
+                lis[start:start + chunk],
+                dT,
+                metric,
             )
+            for start in range(0, len(lis), chunk)
+        ]
+        found, nearest, bracketed, level, neighbor, d_level, d_neighbor = (
+            np.concatenate(arrays, axis=1)
+            for arrays in zip(*chunks, strict=True)
         )
-    
-    return meta_pairs, term_pairs, monotone_pairs, accent_pairs
 
-def generate_scheme(
-    mode: str,
-    biome: str,
+    mi, li, ai = np.nonzero(bracketed)
+    base_features = curve_features[mi, lis[li]]
+    rows = n_M + ai
+
+    def excess(L: np.ndarray, active: np.ndarray) -> np.ndarray:
+        r = rows[active]
+        lch = np.stack(
+            [L / 100, cstar_at(L, r, resolution), h_array[r]], axis=-1
+        )
+        return distance_func(base_features[active], features(lch)) - dT
+
+    with stage("intersection solve"):
+        count("intersection brackets", len(mi))
+        a = L_grid[level[mi, li, ai]]
+        b = L_grid[neighbor[mi, li, ai]]
+        fa = d_level[mi, li, ai] - dT
+        fb = d_neighbor[mi, li, ai] - dT
+
+        active = np.ones(len(a), dtype=bool)
+        while active.any():
+            idx = np.flatnonzero(active)
+            c = (a[idx]*fb[idx] - b[idx]*fa[idx]) / (fb[idx] - fa[idx])
+            fc = excess(c, active)
+
+            # keep the crossing bracketed: `c` replaces `b`, and the old `b`
+            # replaces `a` if the sign changed; otherwise `a` stays and its
+            # value is halved (the Illinois step, against one-sided stalls)
+            flip = fc * fb[idx] < 0
+            a[idx[flip]], fa[idx[flip]] = b[idx[flip]], fb[idx[flip]]
+            fa[idx[~flip]] /= 2
+            b[idx], fb[idx] = c, fc
+
+            active[idx[(np.abs(b[idx] - a[idx]) < tol) | (fc == 0)]] = False
+
+    L_exact = np.full(bracketed.shape, np.nan)
+    L_exact[mi, li, ai] = b
+    L_nearest = np.where(found, L_grid[nearest], np.nan)
+
+    return L_exact, L_nearest
+
+def _log_partial_coverage(
+    l_levels: list[float],
+    lis: list[int],
+    distance: float,
     metric: str,
+    resolution: float,
+) -> None:
+    # accent sets are only defined on the grid, where all accents are within
+    # threshold. Coverage will be partial if, at a level, there is some
+    # monotone base that doesn't have all accents within threshold. This can
+    # happen at the edge, e.g., alpine@L15 has all accents w/in the distance,
+    # but the red accent was too far under tundra@L15. This particular case
+    # is fairly rare; it's more likely that *all* monotones are undefined.
+    # Either way, both such cases lead to partial scheme coverage.
+    swatch_features = compute_swatch_features(metric, resolution)
+    _, distance_func = metric_kernel_map[metric]
+
+    n_M = len(monotone_h_map)
+    n_L = swatch_features.shape[1]
+    count("distance evaluations", n_M * len(lis) * len(accent_h_map) * n_L)
+
+    with stage("coverage check"):
+        dists = distance_func(
+            swatch_features[:n_M, lis, None, None],
+            swatch_features[None, None, n_M:],
+        )
+        complete = (dists >= distance).any(axis=-1).all(axis=(0, 2))
+
+    for mL, level_complete in zip(l_levels, complete.tolist(), strict=True):
+        if not level_complete:
+            logger.debug(
+                "partial scheme coverage for l_base=%s@distance=%s",
+                mL,
+                distance,
+            )
+
+def solve_accent_levels(
+    biome: str,
+    l_levels: list[float],
     distance: float,
-    l_base: int,
-    l_step: int,
-    fg_gap: int,
-    grey_gap: int,
-    term_fg_gap: int,
-    full_color_map: dict[str, str],
-    term_color_map: dict[str, str],
-    vim_color_map: dict[str, str],
-) -> str:
-    l_sys = l_base
-    l_app = l_base + l_step
+    metric: str,
+    resolution: float = 1,
+) -> dict[int | float, dict[str, int | float]]:
+    """
+    Lightness of the nearest accent shade at or beyond `distance` from the
+    `biome` swatch at each of `l_levels`, for every accent.
+
+    Levels must lie on `lightness_grid(resolution)`. Only distances from the
+    `biome` swatches at the requested levels are computed, so the cost grows
+    linearly with the grid size rather than with its square, as for
+    `compute_distance_index()`. Among equidistant accent shades, the lowest
+    lightness is chosen.
+
+    With debug logging enabled, levels where some other monotone can't meet
+    `distance` (i.e., where coverage across biomes is partial) are also
+    reported; that check computes distances for every monotone.
+
+    Returns: map from monotone lightness to accent lightnesses
+
+        {
+            22: { "red": 58, "orange": 60, ... },
+            ...
+        }
+    """
+
+    if biome not in monotone_h_map:
+        raise ValueError(f"Unknown biome '{biome}'")
+
+    L_grid = lightness_grid(resolution)
+    swatch_features = compute_swatch_features(metric, resolution)
+    _, distance_func = metric_kernel_map[metric]
+
+    n_M = len(monotone_h_map)
+    mi = list(monotone_h_map).index(biome)
+    l_levels = list(dict.fromkeys(l_levels))
+    lis = [lightness_grid_index(mL, resolution) for mL in l_levels]
+    count("distance evaluations", len(lis) * len(accent_h_map) * len(L_grid))
+
+    with stage("distance search"):
+        dists = distance_func(
+            swatch_features[mi, lis, None, None],
+            swatch_features[None, n_M:],
+        )
+        beyond = dists >= distance
+        complete = beyond.any(axis=-1).all(axis=-1)
+        nearest = np.where(beyond, dists, np.inf).argmin(axis=-1)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        _log_partial_coverage(l_levels, lis, distance, metric, resolution)
+
+    accent_levels = {}
+    for j, mL in enumerate(l_levels):
+        if not complete[j]:
+            raise ValueError(
+                f"Biome {biome} unable to meet {metric} constraints "
+                f"({distance=}) at L{mL}"
+            )
+
+        accent_levels[mL] = {
+            a_name: L_grid[ai]
+            for a_name, ai in zip(
+                accent_h_map, nearest[j].tolist(), strict=True
+            )
+        }
+
+    return accent_levels
+
+@dataclass(frozen=True)
+class Swatch:
+    """
+    A palette swatch by hue name and lightness level.
+
+    `index` locates the swatch in the palette arrays: its hue row in `h_map`
+    and level in the scheme's `lightness_grid()`.
+    """
+
+    hue: str
+    lightness: int | float
+    index: tuple[int, int]
+
+    @property
+    def key(self) -> str:
+        """
+        Palette file key path, e.g., `tundra.l22`.
+        """
+
+        return f"{self.hue}.{lightness_key(self.lightness)}"
+
+@dataclass(frozen=True)
+class Scheme:
+    """
+    A solved scheme: its settings and the swatch assigned to each role.
+
+    Gaps and steps are recorded as applied, i.e., negated in light mode.
+    `sections` maps section names to role swatches, with the top-level
+    section keyed by `""`, followed by "term", "term.normal", "term.bright"
+    and "vim".
+    """
+
+    mode: str
+    biome: str
+    metric: str
+    distance: float
+    l_base: int | float
+    l_step: int | float
+    fg_gap: int | float
+    grey_gap: int | float
+    term_fg_gap: int | float
+    resolution: float
+    sections: dict[str, dict[str, Swatch]]
+
+    # frozen dataclasses get a field hash, which fails on `sections`; mark
+    # schemes unhashable outright (they still compare by value)
+    __hash__ = None
+
+    def settings(self) -> dict[str, str]:
+        """
+        Scheme settings as written to the top of scheme files.
+        """
+
+        return {
+            "version": VERSION,
+            "mode": self.mode,
+            "biome": self.biome,
+            "metric": self.metric,
+            "distance": str(self.distance),
+            "l_base": str(self.l_base),
+            "l_step": str(self.l_step),
+            "fg_gap": str(self.fg_gap),
+            "grey_gap": str(self.grey_gap),
+            "term_fg_gap": str(self.term_fg_gap),
+        }
+
+    def colors(self, notation: str = "hex") -> dict[str, Any]:
+        """
+        The concrete scheme, ready to fill templates with: settings and role
+        colors, with sections as nested tables. Matches a parsed scheme file
+        after its palette references are resolved (see
+        `build.fill_scheme()`):
+
+        {
+            "version": "1.5.5",
+            "mode": "dark",
+            ...
+            "bg0": "#181b20",
+            ...
+            "term": { "background": "#23272c", ..., "normal": { ... } },
+            "vim": { ... },
+        }
+
+        Colors are read from the palette by swatch index.
+        """
+
+        swatch_table = compute_swatch_table(notation, self.resolution)
+
+        concrete: dict[str, Any] = self.settings()
+        for section, swatches in self.sections.items():
+            table = concrete
+            for name in section.split(".") if section else []:
+                table = table.setdefault(name, {})
+
+            for role, swatch in swatches.items():
+                hi, li = swatch.index
+                table[role] = swatch_table[hi][li]
+
+        return concrete
+
+    def to_toml(self) -> str:
+        """
+        Format as a scheme file, with colors as palette references (e.g.,
+        `f{{tundra.l22}}`) to be resolved against a palette file.
+        """
+
+        scheme_lines = [
+            "# ++ monobiome scheme file ++",
+            f"# ++ generated CLI @ {VERSION} ++",
+        ]
+        scheme_lines += [
+            f"{lhs:<12} = \"{rhs}\"" for lhs, rhs in self.settings().items()
+        ]
+        for section, swatches in self.sections.items():
+            if section:
+                scheme_lines += ["", f"[{section}]"]
+            scheme_lines += [
+                f"{role:<12} = \"f{{{{{swatch.key}}}}}\""
+                for role, swatch in swatches.items()
+            ]
+
+        return "\n".join(scheme_lines)
+
+@stage("scheme assembly")
+def solve(
+    mode: str,
+    biome: str,
+    metric: str = "oklch",
+    distance: float = 0.40,
+    l_base: float = 20,
+    l_step: float = 5,
+    fg_gap: float = 50,
+    grey_gap: float = 30,
+    term_fg_gap: float = 65,
+    full_color_map: dict[str, str] = full_color_map,
+    term_color_map: dict[str, str] = term_color_map,
+    vim_color_map: dict[str, str] = vim_color_map,
+    resolution: float = 1,
+) -> Scheme:
+    """
+    Solve a scheme, resolving every role to a palette swatch in one pass.
+
+    The system section is laid out from `l_base`, and the app sections (term,
+    vim) from `l_base + l_step`, with the bright terminal accents a further
+    10 steps out. Accent sets for those (at most three) lightnesses are
+    solved together for `biome` alone.
+
+    Parameters:
+        mode: one of ["dark", "light"]
+        biome: biome setting
+        metric: name of a registered metric kernel, e.g., one of
+            ["wcag", "oklch", "lightness"]
+        resolution: lightness grid step (see `lightness_grid()`); lightness
+            parameters may be fractional when finer than 1
+
+    Raises: `ValueError` if `biome` can't meet the distance constraints, or
+        if any role lightness is not on `lightness_grid(resolution)`
+    """
+
+    l_sys = lightness_value(l_base)
+    l_app = lightness_value(l_base + l_step)
 
     term_bright_offset = 10
 
@@ -202,59 +721,102 @@ def generate_scheme(
         term_fg_gap *= -1
         term_bright_offset *= -1
 
-    meta, _, mt, ac = generate_scheme_groups(
-        mode, biome, metric, distance,
-        l_sys, l_step,
-        fg_gap, grey_gap, term_fg_gap,
-        full_color_map
+    l_bright = lightness_value(l_app + term_bright_offset)
+    accent_levels = solve_accent_levels(
+        biome, [l_sys, l_app, l_bright], distance, metric, resolution
     )
 
-    _, term, _, term_norm_ac = generate_scheme_groups(
-        mode, biome, metric, distance,
-        l_app, l_step,
-        fg_gap, grey_gap, term_fg_gap,
-        term_color_map
-    )
-    _, _, _, term_bright_ac = generate_scheme_groups(
-        mode, biome, metric, distance,
-        l_app + term_bright_offset, l_step,
-        fg_gap, grey_gap, term_fg_gap,
-        term_color_map
-    )
+    h_index = {h_str: hi for hi, h_str in enumerate(h_map)}
 
-    _, _, vim_mt, vim_ac = generate_scheme_groups(
-        mode, biome, metric, distance,
-        l_app, l_step,
-        fg_gap, grey_gap, term_fg_gap,
-        vim_color_map
-    )
+    def swatch(h_str: str, _l: float) -> Swatch:
+        _l = lightness_value(_l)
+        li = lightness_grid_index(_l, resolution)
 
-    def pair_strings(pair_list: list[tuple[str, str]]) -> list[str]:
-        return [
-            f"{lhs:<12} = \"{rhs}\""
-            for lhs, rhs in pair_list
-        ]
+        return Swatch(h_str, _l, (h_index[h_str], li))
 
-    mb_version = version("monobiome")
-    scheme_pairs = [
-        "# ++ monobiome scheme file ++",
-        f"# ++ generated CLI @ {mb_version} ++",
-    ]
-    scheme_pairs += pair_strings(meta)
-    scheme_pairs += pair_strings(mt)
-    scheme_pairs += pair_strings(ac)
+    def monotone_roles(mL: float) -> dict[str, Swatch]:
+        return {
+            **{f"bg{i}": swatch(biome, mL+i*l_step) for i in range(4)},
+            **{
+                f"fg{3-i}": swatch(biome, fg_gap+mL+i*l_step)
+                for i in range(4)
+            },
+        }
 
-    scheme_pairs += ["", "[term]"]
-    scheme_pairs += pair_strings(term)
+    def accent_roles(
+        mL: float,
+        accent_color_map: dict[str, str],
+    ) -> dict[str, Swatch]:
+        return {
+            "black": swatch(biome, mL),
+            "grey": swatch(biome, mL+grey_gap),
+            "white": swatch(biome, mL+term_fg_gap-2*l_step),
+            **{
+                color_name: swatch(mb_accent, accent_levels[mL][mb_accent])
+                for color_name, mb_accent in accent_color_map.items()
+            },
+        }
 
-    scheme_pairs += ["", "[term.normal]"]
-    scheme_pairs += pair_strings(term_norm_ac)
+    # note how selection_bg steps up by `l_step`, selection_fg steps down by
+    # `l_step` (from their respective bases)
+    term_roles = {
+        "background": swatch(biome, l_app),
+        "selection_bg": swatch(biome, l_app+l_step),
+        "selection_fg": swatch(biome, l_app+term_fg_gap-l_step),
+        "foreground": swatch(biome, l_app+term_fg_gap),
+        "cursor": swatch(biome, l_app+term_fg_gap-l_step),
+        "cursor_text": swatch(biome, l_app+l_step),
+    }
 
-    scheme_pairs += ["", "[term.bright]"]
-    scheme_pairs += pair_strings(term_bright_ac)
+    return Scheme(
+        mode=mode,
+        biome=biome,
+        metric=metric,
+        distance=distance,
+        l_base=l_sys,
+        l_step=l_step,
+        fg_gap=fg_gap,
+        grey_gap=grey_gap,
+        term_fg_gap=term_fg_gap,
+        resolution=resolution,
+        sections={
+            "": {
+                **monotone_roles(l_sys),
+                **accent_roles(l_sys, full_color_map),
+            },
+            "term": term_roles,
+            "term.normal": accent_roles(l_app, term_color_map),
+            "term.bright": accent_roles(l_bright, term_color_map),
+            "vim": {
+                **monotone_roles(l_app),
+                **accent_roles(l_app, vim_color_map),
+            },
+        },
+    )
 
-    scheme_pairs += ["", "[vim]"]
-    scheme_pairs += pair_strings(vim_mt)
-    scheme_pairs += pair_strings(vim_ac)
+def generate_scheme(
+    mode: str,
+    biome: str,
+    metric: str,
+    distance: float,
+    l_base: float,
+    l_step: float,
+    fg_gap: float,
+    grey_gap: float,
+    term_fg_gap: float,
+    full_color_map: dict[str, str],
+    term_color_map: dict[str, str],
+    vim_color_map: dict[str, str],
+    resolution: float = 1,
+) -> str:
+    """
+    Solve a scheme (see `solve()`) and format it as a scheme file.
+    """
 
-    return "\n".join(scheme_pairs)
+    return solve(
+        mode, biome, metric, distance,
+        l_base, l_step,
+        fg_gap, grey_gap, term_fg_gap,
+        full_color_map, term_color_map, vim_color_map,
+        resolution,
+    ).to_toml()
@@ -0,0 +1,413 @@
+import json
+import math
+import asyncio
+import logging
+from http import HTTPStatus
+from typing import Any
+from pathlib import Path
+from functools import lru_cache
+from contextlib import suppress
+from urllib.parse import unquote, urlsplit, parse_qsl
+from collections.abc import Callable
+from importlib.metadata import version
+
+from monobiome.metric import metric_kernel_map
+from monobiome.scheme import solve, Scheme, compute_swatch_features
+from monobiome.palette import (
+    compute_hlc_map,
+    generate_palette,
+    compute_swatch_table,
+)
+from monobiome.template import (
+    Segment,
+    fill_template,
+    load_template,
+    parse_template,
+    has_expressions,
+)
+from monobiome.constants import (
+    monotone_h_map,
+    lightness_value,
+    lightness_resolution,
+)
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# largest accepted request body, i.e., an ad hoc template to fill
+MAX_BODY_SIZE = 1 << 20
+
+# finest lightness grid served; finer grids grow solve time and the palette
+# caches (in memory and on disk) without bound
+MIN_RESOLUTION = 0.1
+
+
+def finite_float(value: str) -> float:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"must be finite, got {value}")
+
+    return value
+
+def served_resolution(value: str) -> int | float:
+    resolution = lightness_resolution(value)
+    if resolution < MIN_RESOLUTION:
+        raise ValueError(
+            f"must be at least {MIN_RESOLUTION}, got {resolution}"
+        )
+
+    return resolution
+
+# optional scheme query fields, with their parsers and defaults (as for the
+# `scheme` subcommand)
+SCHEME_FIELDS: dict[str, tuple[Callable[[str], Any], Any]] = {
+    "metric": (str, "oklch"),
+    "distance": (finite_float, 0.40),
+    "l_base": (lightness_value, 20),
+    "l_step": (lightness_value, 5),
+    "fg_gap": (lightness_value, 50),
+    "grey_gap": (lightness_value, 30),
+    "term_fg_gap": (lightness_value, 65),
+    "resolution": (served_resolution, 1),
+}
+
+# (status, content type, body)
+Response = tuple[HTTPStatus, str, str]
+
+# templates resident for the life of the service, by path relative to the
+# template directory (e.g., "kitty/active.theme")
+resident_templates: dict[str, list[Segment]] = {}
+
+# responses being computed, by request, shared by concurrent identical ones
+_in_flight: dict[tuple[str, str, str], asyncio.Future] = {}
+
+
+class RequestError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+def load_templates(template_dir: Path) -> None:
+    """
+    Compile every template under `template_dir` and make it resident.
+    """
+
+    resident_templates.clear()
+    resident_templates.update({
+        path.relative_to(template_dir).as_posix(): load_template(path)
+        for path in sorted(template_dir.rglob("*"))
+        if path.is_file()
+    })
+    _render_template.cache_clear()
+
+def warm(resolution: float = 1) -> None:
+    """
+    Compute the palettes and swatch features requests are served from, so
+    the first requests at `resolution` don't pay for them.
+    """
+
+    for notation in ["hex", "oklch"]:
+        compute_hlc_map(notation, resolution)
+    compute_swatch_table("hex", resolution)
+
+    for metric in metric_kernel_map:
+        compute_swatch_features(metric, resolution)
+
+@lru_cache(maxsize=64)
+def _palette_text(notation: str, file_format: str, resolution: float) -> str:
+    return generate_palette(notation, file_format, resolution)
+
+@lru_cache(maxsize=1024)
+def _solve(params: tuple) -> Scheme:
+    *settings, resolution = params
+
+    return solve(*settings, resolution=resolution)
+
+@lru_cache(maxsize=1024)
+def _scheme_text(params: tuple) -> str:
+    return _solve(params).to_toml()
+
+@lru_cache(maxsize=1024)
+def _concrete_scheme(params: tuple) -> dict[str, Any]:
+    return _solve(params).colors("hex")
+
+@lru_cache(maxsize=4096)
+def _render_template(name: str, params: tuple) -> str:
+    return fill_template(resident_templates[name], _concrete_scheme(params))
+
+def _choice(query: dict[str, str], name: str, choices: list[str]) -> str:
+    value = query.get(name)
+    if value not in choices:
+        raise RequestError(
+            HTTPStatus.BAD_REQUEST,
+            f"'{name}' must be one of {choices}, got {value!r}",
+        )
+
+    return value
+
+def _parse_field(
+    query: dict[str, str],
+    name: str,
+    parser: Callable[[str], Any],
+    default: float | str,
+) -> float | str:
+    if name not in query:
+        return default
+
+    try:
+        return parser(query[name])
+    except ValueError as e:
+        raise RequestError(
+            HTTPStatus.BAD_REQUEST,
+            f"invalid '{name}': {e}",
+        ) from e
+
+def scheme_params(query: dict[str, str]) -> tuple:
+    """
+    Read scheme settings from query fields, in `solve()` argument order
+    (without the color maps). `mode` and `biome` are required.
+
+    Values are normalized by their parsers, so equivalent queries (e.g.,
+    `distance=0.4` and `distance=0.40`) share cached results.
+    """
+
+    mode = _choice(query, "mode", ["dark", "light"])
+    biome = _choice(query, "biome", list(monotone_h_map))
+
+    fields = {
+        name: _parse_field(query, name, parser, default)
+        for name, (parser, default) in SCHEME_FIELDS.items()
+    }
+    _choice(fields, "metric", list(metric_kernel_map))
+
+    return (mode, biome, *fields.values())
+
+def _json(obj: dict[str, Any]) -> Response:
+    return HTTPStatus.OK, "application/json", json.dumps(obj)
+
+def _error(status: HTTPStatus, message: str) -> Response:
+    return status, "application/json", json.dumps({"error": message})
+
+def route(
+    method: str,
+    path: str,
+    query: dict[str, str],
+    body: str,
+) -> Response:
+    """
+    Serve a single request.
+
+    - `GET /health`: service version and resident templates
+    - `GET /palette`: palette file; fields `notation` (hex or oklch),
+      `format` (json or toml) and `resolution`
+    - `GET /scheme`: scheme file (`format=toml`, default) or the concrete
+      scheme with palette references resolved (`format=json`); fields `mode`
+      and `biome` (required), and any of `SCHEME_FIELDS`
+    - `GET /fill/<template>`: resident template filled with a scheme, from
+      the same fields as `/scheme`
+    - `POST /fill`: template given as the request body filled with a scheme;
+      only `f{{...}}` keys are substituted, and bodies with `x{{...}}`
+      expressions (evaluated as Python) are rejected
+
+    Raises: `RequestError` for malformed or unknown requests
+    """
+
+    if method not in ("GET", "POST"):
+        raise RequestError(
+            HTTPStatus.METHOD_NOT_ALLOWED,
+            f"unsupported method {method}",
+        )
+
+    if method == "GET" and path == "/health":
+        return _json({
+            "status": "ok",
+            "version": version("monobiome"),
+            "templates": list(resident_templates),
+        })
+
+    if method == "GET" and path == "/palette":
+        query = {"notation": "hex", "format": "json", **query}
+        notation = _choice(query, "notation", ["hex", "oklch"])
+        file_format = _choice(query, "format", ["json", "toml"])
+        resolution = _parse_field(
+            query, "resolution", served_resolution, 1
+        )
+
+        content_type = (
+            "application/json" if file_format == "json"
+            else "application/toml"
+        )
+        return (
+            HTTPStatus.OK,
+            content_type,
+            _palette_text(notation, file_format, resolution),
+        )
+
+    if method == "GET" and path == "/scheme":
+        params = scheme_params(query)
+        if query.get("format", "toml") == "json":
+            return _json(_concrete_scheme(params))
+
+        return HTTPStatus.OK, "application/toml", _scheme_text(params)
+
+    if method == "GET" and path.startswith("/fill/"):
+        name = path.removeprefix("/fill/")
+        if name not in resident_templates:
+            raise RequestError(
+                HTTPStatus.NOT_FOUND,
+                f"no resident template '{name}'",
+            )
+
+        params = scheme_params(query)
+        return HTTPStatus.OK, "text/plain", _render_template(name, params)
+
+    if method == "POST" and path == "/fill":
+        # parsed without the template memo, which would otherwise hold on
+        # to client bodies
+        segments = parse_template(body)
+        if has_expressions(segments):
+            raise RequestError(
+                HTTPStatus.BAD_REQUEST,
+                "x{{...}} expressions are only allowed in resident templates",
+            )
+
+        params = scheme_params(query)
+        filled = fill_template(segments, _concrete_scheme(params))
+        return HTTPStatus.OK, "text/plain", filled
+
+    raise RequestError(HTTPStatus.NOT_FOUND, f"no route for {method} {path}")
+
+def respond(method: str, target: str, body: str) -> Response:
+    """
+    Serve a request for `target` (path and query string), reporting errors
+    as JSON responses.
+    """
+
+    url = urlsplit(target)
+    query = dict(parse_qsl(url.query))
+
+    try:
+        return route(method, unquote(url.path), query, body)
+    except RequestError as e:
+        return _error(e.status, str(e))
+    except ValueError as e:
+        # e.g., a scheme unable to meet its distance constraints
+        return _error(HTTPStatus.UNPROCESSABLE_ENTITY, str(e))
+    except Exception as e:
+        logger.exception(f"Failed to serve {method} {target}")
+        return _error(HTTPStatus.INTERNAL_SERVER_ERROR, repr(e))
+
+async def respond_async(method: str, target: str, body: str) -> Response:
+    """
+    Serve a request (see `respond()`) on the default executor, so requests
+    needing new computation don't block the event loop. Concurrent identical
+    requests share a single computation.
+    """
+
+    key = (method, target, body)
+    future = _in_flight.get(key)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, respond, method, target, body)
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+
+    # shielded, so a dropped connection doesn't cancel it for the others
+    return await asyncio.shield(future)
+
+async def _write_response(
+    writer: asyncio.StreamWriter,
+    response: Response,
+    keep_alive: bool,
+) -> None:
+    status, content_type, body = response
+    payload = body.encode()
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    writer.write(head.encode("latin-1") + payload)
+    await writer.drain()
+
+async def handle_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """
+    Serve HTTP/1.1 requests on a connection until the client closes it (or
+    asks to with `Connection: close`).
+    """
+
+    try:
+        while request_line := await reader.readline():
+            try:
+                method, target, http_version = (
+                    request_line.decode("latin-1").split()
+                )
+            except ValueError:
+                response = _error(HTTPStatus.BAD_REQUEST, "bad request line")
+                await _write_response(writer, response, False)
+                break
+
+            headers = {}
+            while (line := await reader.readline()).strip():
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip().lower()
+
+            connection = headers.get("connection", "")
+            if http_version == "HTTP/1.0":
+                keep_alive = connection == "keep-alive"
+            else:
+                keep_alive = connection != "close"
+
+            length = int(headers.get("content-length", 0) or 0)
+            if length > MAX_BODY_SIZE:
+                response = _error(
+                    HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                    f"request body exceeds {MAX_BODY_SIZE} bytes",
+                )
+                await _write_response(writer, response, False)
+                break
+
+            body = (await reader.readexactly(length)).decode()
+            response = await respond_async(method, target, body)
+            logger.debug(f"{method} {target} -> {response[0].value}")
+
+            await _write_response(writer, response, keep_alive)
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+        with suppress(ConnectionError):
+            await writer.wait_closed()
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    socket_path: Path | None = None,
+) -> None:
+    """
+    Serve requests until cancelled, over TCP at `host:port` or, if given, a
+    Unix socket at `socket_path`.
+
+    Requests are answered on the default executor's threads (see
+    `respond_async()`), so a request needing new computation (e.g., an
+    unseen scheme) doesn't hold up others. Palettes, swatch features, solved
+    schemes, and filled resident templates are memoized across requests, so
+    repeated requests are served from memory, and concurrent identical
+    requests never compute twice.
+    """
+
+    if socket_path is not None:
+        server = await asyncio.start_unix_server(
+            handle_connection, path=socket_path
+        )
+    else:
+        server = await asyncio.start_server(handle_connection, host, port)
+
+    async with server:
+        await server.serve_forever()
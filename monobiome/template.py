@@ -0,0 +1,169 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import Any
+from pathlib import Path
+from functools import lru_cache
+from importlib.metadata import version
+
+from monobiome.cache import cache_root
+from monobiome.profiling import stage
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+# same placeholder syntax as `symconf.template.Template`
+KEY_PATTERN = re.compile(r"f{{(\S+?)}}")
+EXE_PATTERN = re.compile(r"x{{((?:(?!x{{).)*)}}")
+
+# a compiled template is a flat list of segments:
+#
+# - `str`: literal text, emitted as-is
+# - `["key", [k1, k2, ...]]`: dotted key `k1.k2...` looked up in the fill dict
+# - `["exe", [...]]`: a Python expression, itself a list of literal and key
+#   segments; key values are substituted as quoted strings before evaluation
+#
+# lists (rather than tuples) keep compiled templates JSON-serializable for the
+# on-disk cache
+Segment = str | list
+
+# bump when the compiled segment layout (or how it's compiled) changes; part
+# of the on-disk cache key, with the monobiome version
+TEMPLATE_FORMAT = 1
+
+
+def _compile_keys(text: str) -> list[Segment]:
+    segments = []
+    pos = 0
+    for match in KEY_PATTERN.finditer(text):
+        if match.start() > pos:
+            segments.append(text[pos:match.start()])
+        segments.append(["key", match.group(1).split(".")])
+        pos = match.end()
+
+    if pos < len(text):
+        segments.append(text[pos:])
+
+    return segments
+
+@stage("template parse")
+def parse_template(template_str: str) -> list[Segment]:
+    """
+    Split a template into literal segments and placeholder slots.
+
+    Matches `symconf`'s fill semantics: `x{{...}}` expressions are located
+    first, then `f{{...}}` keys in the remaining text (and within each
+    expression). Unlike `symconf`, expression results are not rescanned for
+    keys.
+
+    Not memoized; use for one-off templates (e.g., those given by clients)
+    that shouldn't be held in memory.
+    """
+
+    segments = []
+    pos = 0
+    for match in EXE_PATTERN.finditer(template_str):
+        segments += _compile_keys(template_str[pos:match.start()])
+        segments.append(["exe", _compile_keys(match.group(1))])
+        pos = match.end()
+    segments += _compile_keys(template_str[pos:])
+
+    return segments
+
+@lru_cache(maxsize=256)
+def compile_template(template_str: str) -> list[Segment]:
+    """
+    Memoized `parse_template()`, for templates filled repeatedly.
+    """
+
+    return parse_template(template_str)
+
+@stage("template load")
+def load_template(path: Path) -> list[Segment]:
+    """
+    Read and compile a template file.
+
+    Compiled segments are also kept on disk, keyed by a hash of the file
+    content, the monobiome version and `TEMPLATE_FORMAT`, so unchanged
+    templates skip the regex scan across processes.
+    """
+
+    template_str = path.read_text()
+    h = hashlib.sha256()
+    h.update(template_str.encode())
+    h.update(f"monobiome={version('monobiome')}".encode())
+    h.update(f"format={TEMPLATE_FORMAT}".encode())
+    cache_file = cache_root() / "templates" / f"{h.hexdigest()}.json"
+
+    try:
+        return json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        pass
+
+    segments = compile_template(template_str)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        stage_file = cache_file.with_name(
+            f".{cache_file.name}-{os.getpid()}"
+        )
+        stage_file.write_text(json.dumps(segments))
+        stage_file.replace(cache_file)
+    except OSError as e:
+        logger.warning(f"Unable to cache compiled template {path}: {e}")
+
+    return segments
+
+def _lookup(template_dict: dict[str, Any], keys: list[str]) -> str:
+    value = template_dict
+    for key in keys:
+        if not isinstance(value, dict):
+            value = None
+            break
+        value = value.get(key)
+
+    return str(value)
+
+@lru_cache(maxsize=4096)
+def _eval_exe(code: str) -> str:
+    return str(eval(code))
+
+@stage("template fill")
+def fill_template(
+    segments: list[Segment],
+    template_dict: dict[str, Any],
+) -> str:
+    """
+    Fill a compiled template from a (nested) dictionary of values.
+
+    Missing keys render as "None", as with `symconf`. Expression results are
+    memoized on their resolved source, so an expression over the same colors
+    is evaluated once across fills.
+    """
+
+    filled = []
+    for segment in segments:
+        if isinstance(segment, str):
+            filled.append(segment)
+        elif segment[0] == "key":
+            filled.append(_lookup(template_dict, segment[1]))
+        else:
+            code = "".join(
+                part if isinstance(part, str)
+                else f'"{_lookup(template_dict, part[1])}"'
+                for part in segment[1]
+            )
+            filled.append(_eval_exe(code))
+
+    return "".join(filled)
+
+def has_expressions(segments: list[Segment]) -> bool:
+    """
+    Whether a compiled template contains `x{{...}}` expressions, which are
+    evaluated as Python when filled.
+    """
+
+    return any(
+        not isinstance(segment, str) and segment[0] == "exe"
+        for segment in segments
+    )
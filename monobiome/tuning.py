@@ -0,0 +1,118 @@
+import numpy as np
+
+from monobiome.metric import metric_kernel_map
+from monobiome.constants import (
+    L_max,
+    L_min,
+    h_array,
+    accent_h_map,
+    lightness_grid,
+    monotone_h_map,
+    lightness_index,
+    accent_parameters,
+    solve_accent_curves,
+)
+
+# accent parameter tables, in `solve_accent_curves()` argument order
+PARAMETER_NAMES = ["h_weights", "h_L_offsets", "h_C_offsets"]
+
+
+def parameter_batch(
+    candidates: list[dict[str, dict[str, float]]],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Stack candidate parameter sets into `(K, A)` arrays for
+    `solve_accent_curves()`.
+
+    Each candidate maps any of `PARAMETER_NAMES` to per-accent values, as in
+    `parameters.toml`; e.g., `{"h_C_offsets": {"magenta": -0.09}}`. Unset
+    values fall back to the loaded parameters.
+    """
+
+    accent_index = {h_str: ai for ai, h_str in enumerate(accent_h_map)}
+    batch = tuple(
+        np.tile(base, (len(candidates), 1)) for base in accent_parameters()
+    )
+
+    for k, candidate in enumerate(candidates):
+        for name, values in zip(PARAMETER_NAMES, batch, strict=True):
+            for h_str, value in candidate.get(name, {}).items():
+                values[k, accent_index[h_str]] = value
+
+    return batch
+
+def solve_candidates(
+    candidates: list[dict[str, dict[str, float]]],
+    resolution: float = 1,
+) -> np.ndarray:
+    """
+    Gamut-bounded, non-intersecting chroma curves for each candidate
+    parameter set (see `parameter_batch()`), shape `(K, H, |grid|)`.
+    """
+
+    return solve_accent_curves(
+        *parameter_batch(candidates), resolution
+    )["Lpoints_Cstar"]
+
+def band_separation(
+    Lpoints_Cstar: np.ndarray,
+    L_range: tuple[float, float] = (L_min, L_max),
+    resolution: float = 1,
+) -> np.ndarray:
+    """
+    Smallest chroma gap between accent curves, averaged over the lightness
+    levels in `L_range`: how well separated the nested accent bands are.
+    Higher is better.
+
+    Takes curves of shape `(..., H, |grid|)` (see `solve_accent_curves()`),
+    giving scores of shape `(...)`.
+    """
+
+    n_M = len(monotone_h_map)
+    L_grid = np.asarray(lightness_grid(resolution))
+    in_range = (L_grid >= L_range[0]) & (L_grid <= L_range[1])
+
+    accent_C = np.sort(Lpoints_Cstar[..., n_M:, in_range], axis=-2)
+
+    return np.diff(accent_C, axis=-2).min(axis=-2).mean(axis=-1)
+
+def contrast_uniformity(
+    Lpoints_Cstar: np.ndarray,
+    l_bg: float = 20,
+    l_fg: float = 65,
+    biome: str = "alpine",
+    metric: str = "wcag",
+    resolution: float = 1,
+) -> np.ndarray:
+    """
+    Spread (standard deviation) across accents of the `metric` distance
+    between each accent at `l_fg` and the `biome` swatch at `l_bg`: how
+    evenly accents of a common lightness stand out against a background.
+    Lower is more uniform.
+
+    Takes curves of shape `(..., H, |grid|)` (see `solve_accent_curves()`),
+    giving scores of shape `(...)`.
+    """
+
+    features, distance = metric_kernel_map[metric]
+    n_M = len(monotone_h_map)
+    mi = list(monotone_h_map).index(biome)
+
+    li_bg = lightness_index(l_bg, resolution)
+    li_fg = lightness_index(l_fg, resolution)
+    if li_bg < 0 or li_fg < 0:
+        raise ValueError(f"Levels L{l_bg}, L{l_fg} must lie on the grid")
+
+    fg_C = Lpoints_Cstar[..., n_M:, li_fg]
+    bg_C = Lpoints_Cstar[..., mi, li_bg, None]
+
+    fg_lch = np.stack(
+        np.broadcast_arrays(l_fg / 100, fg_C, h_array[n_M:]),
+        axis=-1,
+    )
+    bg_lch = np.stack(
+        np.broadcast_arrays(l_bg / 100, bg_C, h_array[mi]),
+        axis=-1,
+    )
+
+    return distance(features(fg_lch), features(bg_lch)).std(axis=-1)
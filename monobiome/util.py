@@ -4,6 +4,15 @@ from argparse import ArgumentParser, _SubParsersAction
 
 import numpy as np
 from coloraide import Color
+from coloraide.spaces.oklab import (
+    LMS3_TO_OKLAB,
+    LMS_TO_XYZD65,
+    OKLAB_TO_LMS3,
+    XYZD65_TO_LMS,
+)
+from coloraide.spaces.srgb_linear import RGB_TO_XYZ, XYZ_TO_RGB
+
+from monobiome.profiling import count
 
 _SubParsersAction.__class_getitem__ = classmethod(GenericAlias)
 _SubparserType = _SubParsersAction[ArgumentParser]
@@ -14,11 +23,12 @@ def oklch_distance(xc: Color, yc: Color) -> float:
 
     Note: `xc` and `yc` are presumed to be OKLCH colors already, such that
     `.coords()` yields an `(l, c, h)` triple directly rather than first
-    requiring conversion. When we can make this assumption, we save roughly an
-    order of magnitude in runtime.
+    requiring conversion. When we can make this assumption, we save roughly
+    a factor of 6 in runtime.
 
-    1. `xc.distance(yc, space="oklch")`: 500k evals takes ~2s
-    2. This method: 500k evals takes ~0.2s
+    1. `xc.distance(yc, space="oklch")`: 500k evals takes ~8s
+    2. This method: 500k evals takes ~1.2s (`util.oklch_distance[500k]` in
+       `benchmarks/1.5.5.json`, recorded by `scripts/benchmark.py`)
     """
 
     l1, c1, h1 = xc.coords()
@@ -35,6 +45,20 @@ def oklch_distance(xc: Color, yc: Color) -> float:
     
     return (dx**2 + dy**2 + dz**2)**0.5
 
+def wcag_contrast(xc: Color, yc: Color) -> float:
+    """
+    WCAG 2.1 contrast ratio between two colors.
+    """
+
+    return yc.contrast(xc, method="wcag21")
+
+def lightness_distance(xc: Color, yc: Color) -> float:
+    """
+    Absolute difference in (percent) lightness between two OKLCH colors.
+    """
+
+    return abs(xc.coords()[0] - yc.coords()[0]) * 100
+
 def srgb8_from_color(c: str | Color) -> np.ndarray:
     c = Color(c).convert("srgb").fit(method="oklch-chroma")
     rgb = np.array([c["r"], c["g"], c["b"]], dtype=float)
@@ -42,5 +66,165 @@ def srgb8_from_color(c: str | Color) -> np.ndarray:
 
     return rgb8
 
+def oklab_from_oklch(lch: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of OKLCH coordinates to OKLab.
+
+    Lightness is expected on coloraide's `[0, 1]` scale and hue in degrees.
+    """
+
+    lch = np.asarray(lch, dtype=float)
+    _l, _c, _h = lch[..., 0], lch[..., 1], np.radians(lch[..., 2])
+
+    return np.stack([_l, _c * np.cos(_h), _c * np.sin(_h)], axis=-1)
+
+def xyz_from_oklab(lab: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of OKLab coordinates to XYZ (D65).
+
+    Follows coloraide's conversion chain (OKLab -> LMS -> XYZ D65) with the
+    same matrices, so results agree with `Color.convert()` to floating point
+    precision.
+    """
+
+    lms = (np.asarray(lab, dtype=float) @ np.array(OKLAB_TO_LMS3).T) ** 3
+
+    return lms @ np.array(LMS_TO_XYZD65).T
+
+def linear_srgb_from_oklab(lab: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of OKLab coordinates to linear sRGB, via XYZ
+    D65.
+    """
+
+    return xyz_from_oklab(lab) @ np.array(XYZ_TO_RGB).T
+
+def srgb_from_linear(rgb: np.ndarray) -> np.ndarray:
+    """
+    Apply the (signed) sRGB transfer function to linear sRGB values.
+    """
+
+    rgb = np.asarray(rgb, dtype=float)
+    abs_rgb = np.abs(rgb)
+    # guard the power against the small values handled by the linear segment
+    curve = 1.055 * np.maximum(abs_rgb, 0.0031308) ** (1 / 2.4) - 0.055
+
+    return np.where(
+        abs_rgb > 0.0031308,
+        np.copysign(curve, rgb),
+        12.92 * rgb,
+    )
+
+def linear_from_srgb(rgb: np.ndarray) -> np.ndarray:
+    """
+    Invert the (signed) sRGB transfer function, giving linear sRGB values.
+    """
+
+    rgb = np.asarray(rgb, dtype=float)
+    abs_rgb = np.abs(rgb)
+    curve = ((abs_rgb + 0.055) / 1.055) ** 2.4
+
+    return np.where(abs_rgb > 0.04045, np.copysign(curve, rgb), rgb / 12.92)
+
+def oklab_from_xyz(xyz: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of XYZ (D65) coordinates to OKLab.
+
+    Inverse of `xyz_from_oklab()`, with coloraide's matrices.
+    """
+
+    lms = np.asarray(xyz, dtype=float) @ np.array(XYZD65_TO_LMS).T
+
+    return np.cbrt(lms) @ np.array(LMS3_TO_OKLAB).T
+
+def oklab_from_linear_srgb(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of linear sRGB values to OKLab, via XYZ D65.
+    """
+
+    xyz = np.asarray(rgb, dtype=float) @ np.array(RGB_TO_XYZ).T
+
+    return oklab_from_xyz(xyz)
+
+def srgb_from_hsl(hsl: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of HSL coordinates (hue in degrees,
+    saturation and lightness on `[0, 1]`) to sRGB, as coloraide does.
+    """
+
+    hsl = np.asarray(hsl, dtype=float)
+    _h, _s, _l = hsl[..., 0] % 360 / 30, hsl[..., 1], hsl[..., 2]
+    a = _s * np.minimum(_l, 1 - _l)
+
+    channels = []
+    for n in (0, 8, 4):
+        k = (n + _h) % 12
+        channels.append(_l - a * np.clip(np.minimum(k - 3, 9 - k), -1, 1))
+
+    return np.stack(channels, axis=-1)
+
+def srgb_from_oklch(lch: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of OKLCH coordinates to sRGB on `[0, 1]`,
+    fit to the gamut as by `Color.fit(method="oklch-chroma")`.
+
+    Colors already in the sRGB gamut pass through coloraide's fit unchanged,
+    so they only need the conversion; any out of gamut (at most the odd
+    swatch at the gamut boundary) are fit individually via coloraide.
+    """
+
+    lch = np.asarray(lch, dtype=float)
+    rgb = srgb_from_linear(linear_srgb_from_oklab(oklab_from_oklch(lch)))
+
+    out_of_gamut = np.any((rgb < 0) | (rgb > 1), axis=-1)
+    for idx in zip(*np.nonzero(out_of_gamut), strict=True):
+        count("Color objects")
+        c = Color("oklch", lch[idx].tolist()).convert("srgb")
+        c.fit(method="oklch-chroma")
+        rgb[idx] = [c["r"], c["g"], c["b"]]
+
+    return rgb
+
+def srgb8_from_oklch(lch: np.ndarray) -> np.ndarray:
+    """
+    Convert an `(..., 3)` array of OKLCH coordinates to 8-bit sRGB.
+
+    Array counterpart to `srgb8_from_color()`, with identical output.
+    """
+
+    rgb = srgb_from_oklch(lch)
+
+    return np.clip(np.round(rgb * 255), 0, 255).astype(np.uint8)
+
+def srgb8_from_strings(colors: list[str]) -> np.ndarray:
+    """
+    Convert color strings to an `(N, 3)` array of 8-bit sRGB, as
+    `srgb8_from_color()` would each.
+
+    Palette notations are converted in bulk: hex strings are decoded
+    directly, and `oklch(L% C h)` strings through `srgb8_from_oklch()`. Any
+    other notation falls back to `srgb8_from_color()`.
+    """
+
+    rgb8 = np.zeros((len(colors), 3), dtype=np.uint8)
+
+    oklch_idx, oklch_rows = [], []
+    for i, c_str in enumerate(colors):
+        if c_str.startswith("#") and len(c_str) == 7:
+            rgb8[i] = tuple(bytes.fromhex(c_str[1:]))
+        elif c_str.startswith("oklch(") and "%" in c_str:
+            _l, _c, _h = c_str.removeprefix("oklch(").removesuffix(")").split()
+            oklch_idx.append(i)
+            oklch_rows.append(
+                (float(_l.removesuffix("%")) * 0.01, float(_c), float(_h))
+            )
+        else:
+            rgb8[i] = srgb8_from_color(c_str)
+
+    if oklch_rows:
+        rgb8[oklch_idx] = srgb8_from_oklch(np.array(oklch_rows))
+
+    return rgb8
+
 def hex_from_rgb8(rgb8: np.ndarray) -> str:
     return f"#{int(rgb8[0]):02x}{int(rgb8[1]):02x}{int(rgb8[2]):02x}"
@@ -0,0 +1,199 @@
+import time
+import hashlib
+import importlib
+from typing import Any
+from pathlib import Path
+
+from monobiome import build, scheme, palette, constants
+from monobiome.template import Segment, fill_template, load_template
+
+# modules holding values derived from the parameters file, in import order.
+# They're reloaded in place when the file changes, which resets their
+# memoized results and rebinds the names they import from one another
+PARAMETER_MODULES = [constants, palette, scheme, build]
+
+# the watched dependency graph:
+#
+#   parameters -> palette -> scheme[stem] -> output[stem, template]
+#                            template[subpath] -> output[*, subpath]
+#
+# A parameters change re-solves every scheme, but only re-renders outputs
+# for schemes whose concrete colors actually changed. A template change
+# re-renders that template's outputs from the resident schemes, without
+# touching the palette.
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def template_sources(template_dir: Path) -> dict[Path, Path]:
+    """
+    Map template subpaths (relative to `template_dir`) to their files.
+    """
+
+    return {
+        path.relative_to(template_dir): path
+        for path in sorted(template_dir.rglob("*"))
+        if path.is_file()
+    }
+
+def reload_parameters() -> None:
+    """
+    Re-read the parameters file, rebinding everything derived from it.
+    """
+
+    for module in PARAMETER_MODULES:
+        importlib.reload(module)
+
+def render(
+    output_dir: Path,
+    variants: list[dict[str, Any]],
+    schemes: dict[str, dict[str, Any]],
+    templates: dict[Path, list[Segment]],
+) -> list[Path]:
+    """
+    Fill each of `templates` with the resident scheme of each variant,
+    writing only outputs whose bytes changed.
+
+    The build manifest isn't updated; the next `build()` finds these outputs
+    stale, re-renders them, and records them without rewriting.
+
+    Returns: list of written files
+    """
+
+    written = []
+    for variant in variants:
+        stem = variant["stem"]
+        for subpath, template in templates.items():
+            target = build.output_target(output_dir, subpath, stem)
+            if target is None:
+                continue
+
+            data = build.output_bytes(
+                target,
+                fill_template(template, schemes[stem]),
+            )
+            if build.write_if_changed(target, data):
+                written.append(target)
+
+    return written
+
+def watch(
+    template_dir: Path,
+    output_dir: Path,
+    biomes: list[str],
+    modes: list[str],
+    mode_l_bases: dict[str, list[float]],
+    distances: list[float],
+    metric: str = "oklch",
+    l_step: int = 5,
+    fg_gap: int = 50,
+    grey_gap: int = 30,
+    term_fg_gap: int = 65,
+    resolution: float = 1,
+    interval: float = 0.5,
+) -> None:
+    """
+    Watch the parameters file and `template_dir`, re-rendering only the
+    outputs affected by each change (see the graph above). Runs until
+    interrupted; assumes `output_dir` already holds a full build for the
+    same matrix.
+
+    Files are polled every `interval` seconds, and treated as changed only
+    when their content is.
+    """
+
+    variants = build.scheme_matrix(biomes, modes, mode_l_bases, distances)
+    scheme_args = {
+        "metric": metric,
+        "l_step": l_step,
+        "fg_gap": fg_gap,
+        "grey_gap": grey_gap,
+        "term_fg_gap": term_fg_gap,
+        "resolution": resolution,
+    }
+
+    def solve_schemes() -> dict[str, dict[str, Any]]:
+        return {
+            variant["stem"]: build.variant_scheme(variant, scheme_args)
+            for variant in variants
+        }
+
+    parameters_path = Path(str(constants.parameters_file))
+    sources = template_sources(template_dir)
+    templates = {
+        subpath: load_template(path) for subpath, path in sources.items()
+    }
+    schemes = solve_schemes()
+
+    # (mtime, size) to skip unchanged files cheaply, and content digests
+    stats = {}
+    digests = {}
+    for path in [parameters_path, *sources.values()]:
+        stat = path.stat()
+        stats[path] = (stat.st_mtime_ns, stat.st_size)
+        digests[path] = file_digest(path)
+
+    def changed(path: Path) -> bool:
+        stat = path.stat()
+        if stats.get(path) == (stat.st_mtime_ns, stat.st_size):
+            return False
+
+        stats[path] = (stat.st_mtime_ns, stat.st_size)
+        digest = file_digest(path)
+        if digests.get(path) == digest:
+            return False
+
+        digests[path] = digest
+        return True
+
+    print(f"Watching {parameters_path} and {template_dir}/")
+    while True:
+        time.sleep(interval)
+
+        try:
+            if changed(parameters_path):
+                reload_parameters()
+                new_schemes = solve_schemes()
+                stale = [
+                    variant for variant in variants
+                    if new_schemes[variant["stem"]] != schemes[variant["stem"]]
+                ]
+                schemes = new_schemes
+
+                written = render(output_dir, stale, schemes, templates)
+                print(
+                    f"{parameters_path.name} changed: {len(stale)} of "
+                    f"{len(variants)} schemes changed, wrote "
+                    f"{len(written)} files"
+                )
+
+            new_sources = template_sources(template_dir)
+            for subpath in sources.keys() - new_sources.keys():
+                del templates[subpath]
+                stats.pop(sources[subpath], None)
+                digests.pop(sources[subpath], None)
+                for variant in variants:
+                    target = build.output_target(
+                        output_dir, subpath, variant["stem"]
+                    )
+                    if target is not None:
+                        target.unlink(missing_ok=True)
+                print(f"{subpath} removed")
+
+            for subpath, path in new_sources.items():
+                if not changed(path):
+                    continue
+
+                templates[subpath] = load_template(path)
+                written = render(
+                    output_dir,
+                    variants,
+                    schemes,
+                    {subpath: templates[subpath]},
+                )
+                print(f"{subpath} changed: wrote {len(written)} files")
+            sources = new_sources
+        except (OSError, ValueError, KeyError) as e:
+            # e.g., a half-saved file; keep watching and retry on next save
+            print(f"Rebuild failed: {e}")
@@ -0,0 +1,286 @@
+"""
+Benchmark each stage of the palette -> scheme -> fill pipeline.
+
+Every benchmark runs in two cache states:
+
+- cold: an empty on-disk cache and no memoized results, as for the very first
+  CLI invocation
+- warm: a populated on-disk cache but no memoized results, as for any later
+  CLI invocation
+
+Results are written as JSON; pass a stored baseline (e.g.
+`benchmarks/<version>.json`) with `--compare` to report per-benchmark
+speedups against it.
+
+    python scripts/benchmark.py -o benchmarks/1.5.5.json
+    python scripts/benchmark.py --compare benchmarks/1.5.5.json
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import platform
+import tempfile
+import statistics
+from time import perf_counter
+from typing import Any
+from pathlib import Path
+from datetime import UTC, datetime
+from collections.abc import Callable
+from importlib.metadata import version
+
+import numpy as np
+from coloraide import Color
+
+from monobiome import (
+    curve,
+    scheme,
+    palette,
+    template,
+    constants,
+)
+from monobiome.util import oklch_distance
+from monobiome.build import fill_scheme
+from monobiome.curve import l_maxC_h, bezier_y_at_x
+from monobiome.scheme import (
+    vim_color_map,
+    full_color_map,
+    term_color_map,
+    compute_dma_map,
+    generate_scheme,
+    solve_accent_intersections,
+)
+from monobiome.palette import compute_hlc_map, compute_palette_dict
+from monobiome.template import fill_template, load_template
+from monobiome.constants import h_map, L_points, compute_cstar_map
+
+CACHE_STATES = ("cold", "warm")
+TEMPLATE_DIR = Path(__file__).parent.parent / "templates"
+
+# default distance thresholds per metric, as used by the shipped themes
+metric_distances = {
+    "oklch": 0.40,
+    "wcag": 4.5,
+    "lightness": 40,
+}
+
+
+def clear_memos() -> None:
+    """
+    Clear every in-process memoized result across the pipeline modules.
+    """
+
+    for module in (constants, curve, palette, scheme, template):
+        for attr in vars(module).values():
+            if callable(getattr(attr, "cache_clear", None)):
+                attr.cache_clear()
+
+def dark_scheme() -> str:
+    return generate_scheme(
+        "dark", "tundra", "oklch", 0.40,
+        22, 5, 50, 30, 65,
+        full_color_map, term_color_map, vim_color_map,
+    )
+
+def bench_oklch_distance() -> Callable[[], None]:
+    # 500k evaluations, as quoted in `oklch_distance()`'s docstring
+    rng = random.Random(0)
+
+    def random_color() -> Color:
+        return Color(
+            "oklch",
+            [rng.random(), 0.3 * rng.random(), 360 * rng.random()],
+        )
+
+    pairs = [(random_color(), random_color()) for _ in range(1000)]
+
+    def run() -> None:
+        for _ in range(500):
+            for xc, yc in pairs:
+                oklch_distance(xc, yc)
+
+    return run
+
+def bench_l_maxC_h() -> Callable[[], None]:
+    def run() -> None:
+        for _h in h_map.values():
+            for _l in L_points:
+                l_maxC_h(_l, _h)
+
+    return run
+
+def bench_bezier_y_at_x() -> Callable[[], None]:
+    P0, P1, P2 = np.array([0, 0]), np.array([55, 0.2]), np.array([100, 0])
+
+    return lambda: bezier_y_at_x(P0, P1, P2, 1.5, L_points)
+
+def dark_scheme_colors() -> dict[str, Any]:
+    return scheme.solve("dark", "tundra", "oklch", 0.40, 22).colors("hex")
+
+def bench_scheme_round_trip() -> None:
+    # the TOML text route to a concrete scheme, as taken by `fill`
+    fill_scheme(dark_scheme(), compute_palette_dict("hex"))
+
+def bench_fill(template_path: Path) -> Callable[[], None]:
+    concrete_scheme = dark_scheme_colors()
+
+    return lambda: fill_template(load_template(template_path), concrete_scheme)
+
+def collect_benchmarks() -> dict[str, Callable[[], Callable[[], None]]]:
+    """
+    Map benchmark names to factories. A factory prepares any inputs (outside
+    of the timed region) and returns the callable to time.
+    """
+
+    benchmarks = {
+        "util.oklch_distance[500k]": bench_oklch_distance,
+        "curve.l_maxC_h": bench_l_maxC_h,
+        "curve.bezier_y_at_x": bench_bezier_y_at_x,
+        "constants.compute_cstar_map": lambda: compute_cstar_map,
+    }
+    for notation in ("hex", "oklch"):
+        benchmarks[f"palette.compute_hlc_map[{notation}]"] = (
+            lambda n=notation: lambda: compute_hlc_map(n)
+        )
+    for metric, distance in metric_distances.items():
+        benchmarks[f"scheme.compute_dma_map[{metric}]"] = (
+            lambda m=metric, d=distance: lambda: compute_dma_map(d, m)
+        )
+        benchmarks[f"scheme.solve_accent_intersections[{metric}]"] = (
+            lambda m=metric, d=distance: (
+                lambda: solve_accent_intersections(d, m)
+            )
+        )
+    benchmarks["scheme.generate_scheme"] = lambda: dark_scheme
+    benchmarks["scheme.solve[colors]"] = lambda: dark_scheme_colors
+    benchmarks["scheme.fill_scheme[colors]"] = lambda: bench_scheme_round_trip
+    for path in sorted(TEMPLATE_DIR.rglob("*")):
+        if path.is_file():
+            name = path.relative_to(TEMPLATE_DIR).as_posix()
+            benchmarks[f"fill[{name}]"] = lambda p=path: bench_fill(p)
+
+    return benchmarks
+
+def time_benchmark(
+    factory: Callable[[], Callable[[], None]],
+    state: str,
+    repeat: int,
+) -> dict[str, float]:
+    """
+    Time `repeat` runs of a benchmark in the given cache state, each in its
+    own cache directory.
+
+    Returns: min, median, and mean run time in seconds
+    """
+
+    times = []
+    for _ in range(repeat):
+        with (
+            tempfile.TemporaryDirectory() as warm_dir,
+            tempfile.TemporaryDirectory() as cold_dir,
+        ):
+            # prepare inputs and populate a cache directory with one run
+            os.environ["XDG_CACHE_HOME"] = warm_dir
+            clear_memos()
+            func = factory()
+            func()
+
+            if state == "cold":
+                os.environ["XDG_CACHE_HOME"] = cold_dir
+            clear_memos()
+
+            start = perf_counter()
+            func()
+            times.append(perf_counter() - start)
+
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.mean(times),
+    }
+
+def run(pattern: str | None, repeat: int) -> dict:
+    results = {}
+    for name, factory in collect_benchmarks().items():
+        if pattern and pattern not in name:
+            continue
+
+        results[name] = {
+            state: time_benchmark(factory, state, repeat)
+            for state in CACHE_STATES
+        }
+        summary = "  ".join(
+            f"{state} {results[name][state]['median']*1e3:9.3f}ms"
+            for state in CACHE_STATES
+        )
+        print(f"{name:<40} {summary}", file=sys.stderr)
+
+    return {
+        "monobiome": version("monobiome"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "coloraide": version("coloraide"),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "repeat": repeat,
+        "results": results,
+    }
+
+def compare(report: dict, baseline: dict) -> None:
+    print(
+        f"baseline {baseline['monobiome']} ({baseline['timestamp']}) -> "
+        f"current {report['monobiome']}"
+    )
+    for name, states in report["results"].items():
+        base_states = baseline["results"].get(name)
+        if base_states is None:
+            print(f"{name:<40} (new)")
+            continue
+
+        speedups = []
+        for state in CACHE_STATES:
+            base_median = base_states[state]["median"]
+            speedup = base_median / states[state]["median"]
+            speedups.append(f"{state} {speedup:7.2f}x")
+        print(f"{name:<40} {'  '.join(speedups)}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="file to write JSON results (defaults to stdout)",
+    )
+    parser.add_argument(
+        "-c",
+        "--compare",
+        type=Path,
+        help="baseline JSON results to report speedups against",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        type=str,
+        help="only run benchmarks with names containing this string",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=5,
+        help="timed runs per benchmark and cache state",
+    )
+    args = parser.parse_args()
+
+    report = run(args.filter, args.repeat)
+
+    if args.output is None and args.compare is None:
+        print(json.dumps(report, indent=4))
+    if args.output is not None:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=4) + "\n")
+    if args.compare is not None:
+        compare(report, json.loads(args.compare.read_text()))
@@ -20,5 +20,5 @@ hlc_map = compute_hlc_map("hex") # ("oklch")
 fig, ax = plotting.show_palette(hlc_map, cell_size=25)
 fig.savefig(Path(figure_dir, "palette.png"), pad_inches=0)
 
-fig, ax = plotting.show_palette(hlc_map, show_labels=False)
-fig.savefig(Path(figure_dir, "palette-bare.png"), pad_inches=0)
+# unlabeled palette written directly, pixel for pixel
+plotting.save_palette_image(hlc_map, Path(figure_dir, "palette-bare.png"))
@@ -0,0 +1,131 @@
+"""
+Measure `monobiome serve` latency and throughput with a local client.
+
+Each of `--concurrency` keep-alive connections issues requests back to back,
+cycling through the given request targets, until `--requests` have been
+served in total. Reports throughput and latency percentiles.
+
+    monobiome serve -t templates &
+    python scripts/serve_benchmark.py -n 20000 -c 16
+    python scripts/serve_benchmark.py \\
+        "/fill/kitty/active.theme?mode=dark&biome=tundra&l_base=22"
+"""
+
+import asyncio
+import argparse
+import statistics
+from time import perf_counter
+
+DEFAULT_TARGETS = [
+    "/scheme?mode=dark&biome=tundra&l_base=22",
+    "/scheme?mode=light&biome=reef&l_base=92&format=json",
+    "/palette?notation=hex&format=json",
+    "/fill/kitty/active.theme?mode=dark&biome=alpine&l_base=22",
+]
+
+
+async def open_connection(
+    host: str,
+    port: int,
+    socket_path: str | None,
+) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    if socket_path is not None:
+        return await asyncio.open_unix_connection(socket_path)
+
+    return await asyncio.open_connection(host, port)
+
+async def request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    target: str,
+) -> int:
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()).strip():
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+
+    return status
+
+async def client(
+    args: argparse.Namespace,
+    targets: list[str],
+    n_requests: int,
+    offset: int,
+    latencies: list[float],
+    failures: list[tuple[str, int]],
+) -> None:
+    reader, writer = await open_connection(args.host, args.port, args.socket)
+
+    for i in range(n_requests):
+        target = targets[(offset + i) % len(targets)]
+        start = perf_counter()
+        status = await request(reader, writer, target)
+        latencies.append(perf_counter() - start)
+        if status != 200:
+            failures.append((target, status))
+
+    writer.close()
+    await writer.wait_closed()
+
+async def run(args: argparse.Namespace) -> None:
+    targets = args.targets or DEFAULT_TARGETS
+
+    # warm every target once, so results reflect the resident service
+    reader, writer = await open_connection(args.host, args.port, args.socket)
+    for target in targets:
+        await request(reader, writer, target)
+    writer.close()
+
+    latencies: list[float] = []
+    failures: list[tuple[str, int]] = []
+    per_client = [
+        args.requests // args.concurrency
+        + (i < args.requests % args.concurrency)
+        for i in range(args.concurrency)
+    ]
+
+    start = perf_counter()
+    await asyncio.gather(*[
+        client(args, targets, n, i, latencies, failures)
+        for i, n in enumerate(per_client)
+    ])
+    elapsed = perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"requests    {len(latencies):>10}")
+    print(f"concurrency {args.concurrency:>10}")
+    print(f"failures    {len(failures):>10}")
+    print(f"throughput  {len(latencies)/elapsed:>10.0f} req/s")
+    print(f"p50         {quantiles[49]*1e3:>10.3f} ms")
+    print(f"p90         {quantiles[89]*1e3:>10.3f} ms")
+    print(f"p99         {quantiles[98]*1e3:>10.3f} ms")
+    print(f"max         {max(latencies)*1e3:>10.3f} ms")
+
+    for target, status in sorted(set(failures)):
+        print(f"  {status} {target}")
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "targets",
+        nargs="*",
+        help="request targets to cycle through (default: a mix of routes)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("-s", "--socket", help="Unix socket path")
+    parser.add_argument("-n", "--requests", type=int, default=10000)
+    parser.add_argument("-c", "--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+from collections.abc import Iterator
+
+import pytest
+
+
+def clear_memos() -> None:
+    """
+    Clear the `functools` memos of every loaded monobiome module.
+    """
+
+    for name, module in list(sys.modules.items()):
+        if name != "monobiome" and not name.startswith("monobiome."):
+            continue
+
+        for obj in vars(module).values():
+            if callable(getattr(obj, "cache_clear", None)):
+                obj.cache_clear()
+
+@pytest.fixture(autouse=True)
+def isolated_cache(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[Path]:
+    """
+    Point the on-disk cache at an empty directory, and start from cleared
+    memos, so tests recompute rather than read results of earlier runs.
+    """
+
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_dir))
+    clear_memos()
+
+    yield cache_dir / "monobiome"
+
+    clear_memos()
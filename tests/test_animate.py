@@ -0,0 +1,35 @@
+import math
+
+import numpy as np
+
+from monobiome.util import linear_srgb_from_oklab
+from monobiome.animate import sphere_mesh, orbit_camera
+
+
+def test_sphere_mesh_clipped_to_gamut() -> None:
+    center = np.array([0.5, 0.0, 0.0])
+    vertices, faces, colors, edges = sphere_mesh(center, 0.2, resolution=16)
+
+    assert len(colors) == len(vertices)
+
+    # vertices are plotted as (a, b, L)
+    lab = vertices[:, [2, 0, 1]]
+    np.testing.assert_allclose(np.linalg.norm(lab - center, axis=1), 0.2)
+
+    rgb = linear_srgb_from_oklab(lab)
+    inside = np.all((rgb >= -1e-6) & (rgb <= 1 + 1e-6), axis=-1)
+    assert inside[faces].all()
+    assert len(edges) > 0
+    assert np.all(inside[edges[:, 0]] != inside[edges[:, 1]])
+
+def test_orbit_camera_turns_about_lightness_axis() -> None:
+    start = orbit_camera(0)["eye"]
+    quarter = orbit_camera(0.25)["eye"]
+
+    assert math.isclose(start["y"], 0, abs_tol=1e-12)
+    assert math.isclose(quarter["x"], 0, abs_tol=1e-12)
+    assert math.isclose(start["z"], quarter["z"])
+    assert math.isclose(
+        math.hypot(start["x"], start["y"]),
+        math.hypot(quarter["x"], quarter["y"]),
+    )
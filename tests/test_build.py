@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import pytest
+
+from monobiome.build import build, load_manifest
+from monobiome.scheme import solve
+
+MODE_L_BASES = {"dark": [22], "light": [92]}
+
+
+def make_templates(template_dir: Path) -> None:
+    for subpath, text in [
+        ("kitty/active.theme", "background f{{bg0}}\n"),
+        ("fzf/active.theme", "--color=fg:f{{fg0}}\n"),
+    ]:
+        path = template_dir / subpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+def build_tree(tmp_path: Path, **kwargs: object) -> list[Path]:
+    return build(
+        tmp_path / "templates",
+        tmp_path / "out",
+        ["alpine", "tundra"],
+        ["dark", "light"],
+        MODE_L_BASES,
+        [0.40],
+        **kwargs,
+    )
+
+def test_build_renders_matrix(tmp_path: Path) -> None:
+    make_templates(tmp_path / "templates")
+
+    written = build_tree(tmp_path)
+
+    assert len(written) == 2 * 2 * 2
+    kitty = tmp_path / "out/kitty/tundra-monobiome-light.active.theme"
+    bg0 = solve("light", "tundra", l_base=92).colors("hex")["bg0"]
+    assert kitty.read_text() == f"background {bg0}\n"
+    assert load_manifest(tmp_path / "out").keys() == {
+        path.relative_to(tmp_path / "out").as_posix() for path in written
+    }
+
+def test_build_is_incremental(tmp_path: Path) -> None:
+    make_templates(tmp_path / "templates")
+    build_tree(tmp_path)
+
+    assert build_tree(tmp_path) == []
+
+    (tmp_path / "templates/fzf/active.theme").write_text("--color=bg:f{{bg0}}")
+    written = build_tree(tmp_path)
+    assert {path.parent.name for path in written} == {"fzf"}
+    assert len(written) == 4
+
+    # outputs edited by hand are restored
+    edited = tmp_path / "out/kitty/alpine-monobiome-dark.active.theme"
+    edited.write_text("background #000000\n")
+    assert build_tree(tmp_path) == [edited]
+
+def test_build_prunes_stale_outputs(tmp_path: Path) -> None:
+    make_templates(tmp_path / "templates")
+    build_tree(tmp_path)
+    (tmp_path / "out/notes.txt").write_text("not a build output")
+
+    (tmp_path / "templates/fzf/active.theme").unlink()
+    build_tree(tmp_path)
+    assert len(list((tmp_path / "out/fzf").iterdir())) == 4
+
+    build_tree(tmp_path, prune=True)
+    assert not (tmp_path / "out/fzf").exists()
+    assert (tmp_path / "out/notes.txt").exists()
+    assert all(
+        name.startswith("kitty/")
+        for name in load_manifest(tmp_path / "out")
+    )
+
+def test_build_rejects_off_grid_base(tmp_path: Path) -> None:
+    make_templates(tmp_path / "templates")
+
+    with pytest.raises(ValueError, match="not on the lightness grid"):
+        build(
+            tmp_path / "templates",
+            tmp_path / "out",
+            ["alpine"],
+            ["dark"],
+            {"dark": [22.5]},
+            [0.40],
+        )
+
+    assert not (tmp_path / "out").exists()
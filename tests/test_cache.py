@@ -0,0 +1,39 @@
+from pathlib import Path
+
+import numpy as np
+
+from monobiome.cache import cache_key, load_arrays, cached_arrays
+
+
+def test_cached_arrays_build_once(isolated_cache: Path) -> None:
+    calls = []
+
+    def build() -> dict[str, np.ndarray]:
+        calls.append(1)
+        return {"a": np.arange(6.0).reshape(2, 3), "b": np.array([1, 2])}
+
+    first = cached_arrays("k" * 64, "entry", build)
+    second = cached_arrays("k" * 64, "entry", build)
+
+    assert len(calls) == 1
+    for name in ["a", "b"]:
+        np.testing.assert_array_equal(first[name], second[name])
+    assert list(isolated_cache.iterdir()) == [isolated_cache / ("k" * 32)]
+
+def test_corrupt_entry_is_rebuilt(isolated_cache: Path) -> None:
+    def build() -> dict[str, np.ndarray]:
+        return {"a": np.arange(4.0)}
+
+    cached_arrays("k" * 64, "entry", build)
+    entry_dir = isolated_cache / ("k" * 32) / "entry"
+    np.save(entry_dir / "a.npy", np.zeros(4))
+
+    assert load_arrays(entry_dir) is None
+    np.testing.assert_array_equal(
+        cached_arrays("k" * 64, "entry", build)["a"], np.arange(4.0)
+    )
+    assert load_arrays(entry_dir) is not None
+
+def test_cache_key_tracks_parameters() -> None:
+    assert cache_key(b"a = 1") == cache_key(b"a = 1")
+    assert cache_key(b"a = 1") != cache_key(b"a = 2")
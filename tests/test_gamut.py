@@ -0,0 +1,30 @@
+import numpy as np
+
+from monobiome.util import srgb_from_linear, linear_srgb_from_oklab
+from monobiome.gamut import gamut_mesh, grid_faces
+
+
+def test_grid_faces_cover_cells() -> None:
+    faces = grid_faces(3, 4)
+    assert faces.shape == (2 * 2 * 3, 3)
+    assert faces.max() == 3 * 4 - 1
+
+    wrapped = grid_faces(3, 4, wrap=True)
+    assert wrapped.shape == (2 * 3 * 3, 3)
+    assert wrapped.max() == 3 * 4 - 1
+
+def test_gamut_mesh_lies_on_srgb_boundary() -> None:
+    vertices, faces, vertex_colors, face_colors = gamut_mesh(12)
+
+    assert faces.max() < len(vertices)
+    assert len(vertex_colors) == len(vertices)
+    assert len(face_colors) == len(faces)
+
+    # vertices are plotted as (a, b, L)
+    rgb = srgb_from_linear(linear_srgb_from_oklab(vertices[:, [2, 0, 1]]))
+    assert np.all((rgb > -1e-6) & (rgb < 1 + 1e-6))
+    on_face = np.isclose(rgb.min(axis=1), 0, atol=1e-6)
+    on_face |= np.isclose(rgb.max(axis=1), 1, atol=1e-6)
+    assert on_face.all()
+
+    np.testing.assert_allclose(vertex_colors, rgb * 255, atol=1)
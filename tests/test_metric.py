@@ -0,0 +1,46 @@
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+from coloraide import Color
+
+from monobiome.util import wcag_contrast, oklch_distance, lightness_distance
+from monobiome.metric import pairwise_kernel, metric_kernel_map
+
+
+@pytest.mark.parametrize(
+    ("metric", "pair_metric"),
+    [
+        ("oklch", oklch_distance),
+        ("wcag", wcag_contrast),
+        ("lightness", lightness_distance),
+    ],
+)
+def test_kernels_match_pair_metrics(
+    metric: str,
+    pair_metric: Callable[[Color, Color], float],
+) -> None:
+    rng = np.random.default_rng(0)
+    lch = np.column_stack([
+        rng.uniform(0.1, 0.95, 200),
+        rng.uniform(0, 0.2, 200),
+        rng.uniform(0, 360, 200),
+    ])
+    x, y = lch[:100], lch[100:]
+
+    features, distance = metric_kernel_map[metric]
+    expected = [
+        pair_metric(Color("oklch", xi), Color("oklch", yi))
+        for xi, yi in zip(x.tolist(), y.tolist(), strict=True)
+    ]
+
+    np.testing.assert_allclose(
+        distance(features(x), features(y)), expected, rtol=1e-9
+    )
+
+def test_pairwise_kernel_broadcasts() -> None:
+    features, distance = pairwise_kernel(lightness_distance)
+    x = features(np.array([[0.2, 0.1, 30], [0.5, 0.1, 30]]))
+    y = features(np.array([[0.8, 0.0, 0]]))
+
+    np.testing.assert_allclose(distance(x[:, None], y[None]), [[60], [30]])
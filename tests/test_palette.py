@@ -0,0 +1,49 @@
+import tomllib
+from pathlib import Path
+
+import numpy as np
+import pytest
+from coloraide import Color
+
+from monobiome.util import srgb8_from_color, srgb8_from_oklch
+from monobiome.palette import compute_palette_dict
+
+COLORS_DIR = Path(__file__).parent.parent / "colors"
+
+
+def test_hex_palette_matches_committed_file(isolated_cache: Path) -> None:
+    with (COLORS_DIR / "hex-palette.toml").open("rb") as f:
+        committed = tomllib.load(f)
+
+    palette = compute_palette_dict("hex")
+
+    # computed afresh, not read from an earlier run's cache
+    assert list(isolated_cache.glob("*/hlc-hex"))
+
+    assert palette.keys() == committed.keys()
+    for h_str, lc_map in committed.items():
+        assert palette[h_str] == lc_map, h_str
+
+@pytest.mark.parametrize(
+    ("chroma_range", "in_gamut"),
+    [((0, 0.02), True), ((0.3, 0.5), False)],
+    ids=["in-gamut", "out-of-gamut"],
+)
+def test_srgb8_from_oklch_matches_color(
+    chroma_range: tuple[float, float],
+    in_gamut: bool,
+) -> None:
+    rng = np.random.default_rng(0)
+    n = 500
+    lch = np.column_stack([
+        rng.uniform(0.2, 0.9, n),
+        rng.uniform(*chroma_range, n),
+        rng.uniform(0, 360, n),
+    ])
+
+    colors = [Color("oklch", row) for row in lch.tolist()]
+    assert all(c.in_gamut("srgb") == in_gamut for c in colors)
+
+    expected = np.array([srgb8_from_color(c) for c in colors])
+
+    np.testing.assert_array_equal(srgb8_from_oklch(lch), expected)
@@ -0,0 +1,26 @@
+from monobiome import profiling
+from monobiome.profiling import count, reset, stage, stage_report
+
+
+def test_stages_and_counters_accumulate() -> None:
+    reset()
+
+    @stage("decorated")
+    def work() -> None:
+        count("events", 2)
+
+    with stage("outer"):
+        work()
+        work()
+    count("events")
+
+    assert profiling.stage_calls == {"outer": 1, "decorated": 2}
+    assert profiling.stage_times["outer"] >= profiling.stage_times["decorated"]
+    assert profiling.counters["events"] == 5
+
+    report = stage_report()
+    assert "decorated" in report
+    assert "events" in report
+
+    reset()
+    assert not profiling.stage_times
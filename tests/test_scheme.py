@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from monobiome.metric import metric_kernel_map
+from monobiome.scheme import (
+    solve,
+    query_accent_levels,
+    solve_accent_levels,
+    compute_swatch_features,
+    solve_accent_intersections,
+)
+from monobiome.constants import (
+    h_array,
+    cstar_at,
+    L_points,
+    accent_h_map,
+    lightness_grid,
+    monotone_h_map,
+    lightness_grid_index,
+)
+
+
+@pytest.mark.parametrize(
+    ("l_base", "resolution"),
+    [(22.5, 1), (22.3, 0.5), (99, 1)],
+    ids=["between-levels", "between-fine-levels", "beyond-grid"],
+)
+def test_solve_rejects_off_grid_lightness(
+    l_base: float,
+    resolution: float,
+) -> None:
+    with pytest.raises(ValueError, match="not on the lightness grid"):
+        solve("dark", "alpine", l_base=l_base, resolution=resolution)
+
+def test_solve_fine_grid_swatches() -> None:
+    scheme = solve("dark", "alpine", l_base=22.5, resolution=0.5)
+    L_grid = lightness_grid(0.5)
+
+    for swatches in scheme.sections.values():
+        for swatch in swatches.values():
+            assert L_grid[swatch.index[1]] == swatch.lightness
+
+    assert scheme.sections[""]["bg0"].key == "alpine.l22_5"
+
+def test_lightness_grid_index_matches_grid() -> None:
+    for resolution in (1, 0.5, 0.25, 0.1):
+        for li, L in enumerate(lightness_grid(resolution)):
+            assert lightness_grid_index(L, resolution) == li
+
+@pytest.mark.parametrize(
+    ("metric", "distance"),
+    [("oklch", 0.40), ("oklch", 0.55), ("wcag", 7), ("lightness", 60)],
+)
+def test_distance_index_agrees_with_level_solver(
+    metric: str,
+    distance: float,
+) -> None:
+    for biome in ["alpine", "tundra"]:
+        for mL in L_points[::4]:
+            indexed = query_accent_levels(biome, mL, distance, metric)
+
+            if len(indexed) < len(accent_h_map):
+                with pytest.raises(ValueError, match="unable to meet"):
+                    solve_accent_levels(biome, [mL], distance, metric)
+            else:
+                solved = solve_accent_levels(biome, [mL], distance, metric)
+                assert solved[mL] == indexed
+
+def test_accent_intersections_lie_on_sphere() -> None:
+    dT = 0.40
+    l_levels = [20, 22.5, 85]
+    L_exact, L_nearest = solve_accent_intersections(
+        dT, resolution=0.5, l_levels=l_levels
+    )
+
+    n_M, n_A = len(monotone_h_map), len(accent_h_map)
+    assert L_exact.shape == L_nearest.shape == (n_M, len(l_levels), n_A)
+
+    features, distance = metric_kernel_map["oklch"]
+    swatch_features = compute_swatch_features("oklch", 0.5)
+    lis = [lightness_grid_index(mL, 0.5) for mL in l_levels]
+
+    mi, li, ai = np.nonzero(~np.isnan(L_exact))
+    assert len(mi) > 0
+
+    L = L_exact[mi, li, ai]
+    rows = n_M + ai
+    lch = np.stack([L / 100, cstar_at(L, rows, 0.5), h_array[rows]], axis=-1)
+    dists = distance(
+        features(lch), swatch_features[mi, np.asarray(lis)[li]]
+    )
+
+    np.testing.assert_allclose(dists, dT, atol=1e-6)
+
+    # and the nearest swatch matches the level solver's
+    levels = solve_accent_levels("alpine", [20], dT, "oklch", 0.5)
+    np.testing.assert_array_equal(
+        L_nearest[0, 0], [levels[20][a] for a in accent_h_map]
+    )
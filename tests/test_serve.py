@@ -0,0 +1,102 @@
+import json
+import asyncio
+from http import HTTPStatus
+from pathlib import Path
+from collections.abc import Iterator
+
+import pytest
+
+from monobiome.serve import (
+    respond,
+    respond_async,
+    load_templates,
+    resident_templates,
+)
+from monobiome.scheme import solve
+
+SCHEME_QUERY = "mode=dark&biome=reef&l_base=22"
+UNPROCESSABLE = HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+@pytest.fixture
+def template_dir(tmp_path: Path) -> Iterator[Path]:
+    path = tmp_path / "templates/kitty/active.theme"
+    path.parent.mkdir(parents=True)
+    path.write_text("background f{{bg0}} x{{f{{bg0}}.upper()}}")
+    load_templates(tmp_path / "templates")
+
+    yield tmp_path / "templates"
+
+    resident_templates.clear()
+
+def test_health() -> None:
+    status, content_type, body = respond("GET", "/health", "")
+
+    assert status == HTTPStatus.OK
+    assert content_type == "application/json"
+    assert json.loads(body)["status"] == "ok"
+
+def test_scheme_matches_solve() -> None:
+    scheme = solve("dark", "reef", l_base=22)
+
+    status, _, body = respond("GET", f"/scheme?{SCHEME_QUERY}", "")
+    assert status == HTTPStatus.OK
+    assert body == scheme.to_toml()
+
+    status, _, body = respond(
+        "GET", f"/scheme?{SCHEME_QUERY}&format=json", ""
+    )
+    assert json.loads(body) == scheme.colors("hex")
+
+def test_fill_resident_template(template_dir: Path) -> None:
+    bg0 = solve("dark", "reef", l_base=22).colors("hex")["bg0"]
+
+    status, _, body = respond(
+        "GET", f"/fill/kitty/active.theme?{SCHEME_QUERY}", ""
+    )
+
+    assert status == HTTPStatus.OK
+    assert body == f"background {bg0} {bg0.upper()}"
+
+def test_fill_posted_template() -> None:
+    bg0 = solve("dark", "reef", l_base=22).colors("hex")["bg0"]
+
+    status, _, body = respond("POST", f"/fill?{SCHEME_QUERY}", "f{{bg0}}")
+    assert (status, body) == (HTTPStatus.OK, bg0)
+
+    status, _, _ = respond(
+        "POST", f"/fill?{SCHEME_QUERY}", "x{{__import__('os').getpid()}}"
+    )
+    assert status == HTTPStatus.BAD_REQUEST
+
+@pytest.mark.parametrize(
+    ("target", "expected"),
+    [
+        ("/scheme?biome=reef", HTTPStatus.BAD_REQUEST),
+        (f"/scheme?{SCHEME_QUERY}&distance=inf", HTTPStatus.BAD_REQUEST),
+        ("/palette?resolution=0.001", HTTPStatus.BAD_REQUEST),
+        ("/scheme?mode=dark&biome=reef&l_base=22.5", UNPROCESSABLE),
+        (f"/scheme?{SCHEME_QUERY}&distance=0.9", UNPROCESSABLE),
+        ("/fill/missing.conf?mode=dark&biome=reef", HTTPStatus.NOT_FOUND),
+        ("/nowhere", HTTPStatus.NOT_FOUND),
+    ],
+)
+def test_request_errors(target: str, expected: HTTPStatus) -> None:
+    status, content_type, body = respond("GET", target, "")
+
+    assert status == expected
+    assert content_type == "application/json"
+    assert "error" in json.loads(body)
+
+def test_concurrent_requests_share_a_response() -> None:
+    async def fetch_twice() -> list:
+        target = f"/scheme?{SCHEME_QUERY}&format=json"
+        return await asyncio.gather(
+            respond_async("GET", target, ""),
+            respond_async("GET", target, ""),
+        )
+
+    first, second = asyncio.run(fetch_twice())
+
+    assert first[0] == HTTPStatus.OK
+    assert first is second
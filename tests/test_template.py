@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from monobiome.template import (
+    fill_template,
+    load_template,
+    parse_template,
+    has_expressions,
+    compile_template,
+)
+
+TEMPLATE = (
+    "bg = f{{bg0}}\n"
+    "red = f{{term.normal.red}}\n"
+    "alpha = x{{f{{bg0}}.upper() + 'cc'}}\n"
+)
+SCHEME = {
+    "bg0": "#181b20",
+    "term": {"normal": {"red": "#e05b4c"}},
+}
+
+
+def test_fill_keys_and_expressions() -> None:
+    filled = fill_template(compile_template(TEMPLATE), SCHEME)
+
+    assert filled == (
+        "bg = #181b20\n"
+        "red = #e05b4c\n"
+        "alpha = #181B20cc\n"
+    )
+
+def test_missing_keys_fill_as_none() -> None:
+    segments = compile_template("f{{fg0}} f{{term.bright.red}} f{{bg0.x}}")
+
+    assert fill_template(segments, SCHEME) == "None None None"
+
+def test_has_expressions() -> None:
+    assert has_expressions(parse_template(TEMPLATE))
+    assert not has_expressions(parse_template("bg = f{{bg0}}"))
+
+def test_parse_template_is_not_memoized() -> None:
+    parse_template(TEMPLATE)
+
+    assert compile_template.cache_info().currsize == 0
+
+def test_load_template_caches_compiled_segments(
+    tmp_path: Path,
+    isolated_cache: Path,
+) -> None:
+    path = tmp_path / "kitty.conf"
+    path.write_text(TEMPLATE)
+
+    segments = load_template(path)
+    assert segments == compile_template(TEMPLATE)
+
+    cache_files = list((isolated_cache / "templates").glob("*.json"))
+    assert len(cache_files) == 1
+
+    # unchanged templates are read back from the cache
+    cache_files[0].write_text('["cached"]')
+    assert load_template(path) == ["cached"]
+
+    # a different template gets its own entry, with nothing left staged
+    path.write_text("bg = f{{bg0}}")
+    assert load_template(path) == ["bg = ", ["key", ["bg0"]]]
+    assert len(list((isolated_cache / "templates").iterdir())) == 2
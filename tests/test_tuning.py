@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from monobiome.tuning import (
+    band_separation,
+    parameter_batch,
+    solve_candidates,
+    contrast_uniformity,
+)
+from monobiome.constants import accent_h_map, compute_curves, accent_parameters
+
+
+def test_parameter_batch_overrides_loaded_values() -> None:
+    weights, L_offsets, C_offsets = parameter_batch([
+        {},
+        {"h_C_offsets": {"red": -0.05}},
+    ])
+
+    for batch, base in zip(
+        (weights, L_offsets, C_offsets), accent_parameters(), strict=True
+    ):
+        np.testing.assert_array_equal(batch[0], base)
+
+    red = list(accent_h_map).index("red")
+    assert C_offsets[1, red] == -0.05
+    np.testing.assert_array_equal(
+        np.delete(C_offsets[1], red), np.delete(C_offsets[0], red)
+    )
+
+def test_candidate_scores() -> None:
+    curves = solve_candidates([{}, {"h_C_offsets": {"red": -0.05}}])
+
+    # the loaded parameters reproduce the palette's curves
+    np.testing.assert_allclose(
+        curves[0], compute_curves()["Lpoints_Cstar"], atol=1e-12
+    )
+
+    separation = band_separation(curves)
+    uniformity = contrast_uniformity(curves)
+    assert separation.shape == uniformity.shape == (2,)
+    assert np.all(separation >= 0)
+
+    with pytest.raises(ValueError, match="must lie on the grid"):
+        contrast_uniformity(curves, l_bg=5)
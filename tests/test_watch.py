@@ -0,0 +1,44 @@
+from pathlib import Path
+
+from monobiome.build import scheme_matrix, variant_scheme
+from monobiome.watch import render, template_sources
+from monobiome.template import compile_template
+
+
+def test_render_writes_only_changed_outputs(tmp_path: Path) -> None:
+    variants = scheme_matrix(
+        ["alpine"], ["dark", "light"], {"dark": [22], "light": [92]}, [0.40]
+    )
+    scheme_args = {
+        "metric": "oklch",
+        "l_step": 5,
+        "fg_gap": 50,
+        "grey_gap": 30,
+        "term_fg_gap": 65,
+        "resolution": 1,
+    }
+    schemes = {
+        variant["stem"]: variant_scheme(variant, scheme_args)
+        for variant in variants
+    }
+    templates = {Path("kitty/active.theme"): compile_template("f{{bg0}}")}
+
+    written = render(tmp_path, variants, schemes, templates)
+    assert sorted(path.name for path in written) == [
+        "alpine-monobiome-dark.active.theme",
+        "alpine-monobiome-light.active.theme",
+    ]
+    assert render(tmp_path, variants, schemes, templates) == []
+
+    schemes["alpine-monobiome-dark"] = {"bg0": "#000000"}
+    assert render(tmp_path, variants, schemes, templates) == [
+        tmp_path / "kitty/alpine-monobiome-dark.active.theme"
+    ]
+
+def test_template_sources(tmp_path: Path) -> None:
+    (tmp_path / "kitty").mkdir()
+    (tmp_path / "kitty/active.theme").write_text("")
+
+    assert template_sources(tmp_path) == {
+        Path("kitty/active.theme"): tmp_path / "kitty/active.theme"
+    }